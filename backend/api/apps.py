@@ -1,6 +1,16 @@
+import pandas as pd
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from api.services.title_metadata import register_metadata_resolver
+
+        # Recap frames share their columns until one is written, so stages
+        # add derived columns without copying the frame they were given
+        pd.set_option("mode.copy_on_write", True)
+
+        register_metadata_resolver()
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from utils.workflows import TITLE_CATALOG
+
+
+PROFILE_NAMES = ["Alex", "Sam", "Jordan", "Kids", "Guest"]
+DEVICE_TYPES = [
+    "Samsung 2019 UHD TV",
+    "Apple iPhone 13",
+    "Chrome PC (Cadmium)",
+    "Sony PS5",
+]
+SUPPLEMENTAL_TYPES = ["TRAILER", "HOOK", "TEASER_TRAILER", "RECAP"]
+
+
+def synthetic_viewing_history(rows, profiles=4, years=10, seed=7):
+    """Build a Netflix ViewingActivity-shaped frame for benchmarks."""
+    rng = np.random.default_rng(seed)
+    catalog = TITLE_CATALOG.frame.dropna(subset=["title"])
+    movies = catalog[catalog["type"] == "Movie"]["title"].sample(400, random_state=seed).tolist()
+    shows = catalog[catalog["type"] == "TV Show"]["title"].sample(120, random_state=seed).tolist()
+
+    episode_titles = [
+        f"{show}: Season {season}: Chapter {episode} (Episode {episode})"
+        for show in shows
+        for season in range(1, 4)
+        for episode in range(1, 11)
+    ]
+    titles = np.array(movies + episode_titles, dtype=object)
+    title_index = rng.zipf(1.3, rows) % len(titles)
+
+    end = pd.Timestamp("2025-12-31 23:00:00")
+    offsets = rng.integers(0, years * 365 * 24 * 3600, rows)
+    start_times = (end - pd.to_timedelta(offsets, unit="s")).strftime("%Y-%m-%d %H:%M:%S")
+
+    seconds = rng.integers(30, 3 * 3600, rows)
+    durations = [
+        f"{value // 3600:02d}:{(value % 3600) // 60:02d}:{value % 60:02d}"
+        for value in seconds
+    ]
+
+    supplemental = rng.random(rows) < 0.05
+    supplemental_types = np.where(
+        supplemental,
+        rng.choice(SUPPLEMENTAL_TYPES, rows),
+        None,
+    )
+
+    return pd.DataFrame(
+        {
+            "Profile Name": rng.choice(PROFILE_NAMES[:profiles], rows),
+            "Start Time": start_times,
+            "Duration": durations,
+            "Attributes": "",
+            "Title": titles[title_index],
+            "Supplemental Video Type": supplemental_types,
+            "Device Type": rng.choice(DEVICE_TYPES, rows),
+            "Bookmark": "",
+            "Latest Bookmark": "",
+            "Country": "US (United States)",
+        }
+    )
+
+
+def synthetic_distinct_titles(count, seed=7):
+    """Distinct Netflix-style titles mixing catalog movies and episode shapes."""
+    rng = np.random.default_rng(seed)
+    catalog = TITLE_CATALOG.frame.dropna(subset=["title"])
+    movies = catalog[catalog["type"] == "Movie"]["title"].unique().tolist()
+    shows = catalog[catalog["type"] == "TV Show"]["title"].unique().tolist()
+
+    titles = list(movies)
+    season = 1
+    while len(titles) < count:
+        for show in shows:
+            episode = int(rng.integers(1, 24))
+            titles.append(f"{show}: Season {season}: Chapter {episode} (Episode {episode})")
+        season += 1
+    return titles[:count]
+
+
+SUPPLEMENTAL_DESCRIPTORS = [
+    "Trailer",
+    "Teaser",
+    "Clip",
+    "Character Intro",
+    "Hook",
+    "Recap",
+    "Season 2 Trailer",
+    "Moment of High Emotion",
+]
+
+
+def synthetic_promo_titles(count, seed=7):
+    """Promo, clip and episode title shapes built around catalog titles."""
+    rng = np.random.default_rng(seed)
+    catalog = TITLE_CATALOG.frame.dropna(subset=["title"])["title"].tolist()
+    shapes = [
+        "{title}: {descriptor}",
+        "{descriptor}: {title}",
+        "{title}: {descriptor}: {other}",
+        "{descriptor}: {title}: Season 1",
+        "{title}: Season {season}: {other} (Episode {episode})",
+        "Unknown Promo: {descriptor}: {other}: {descriptor}",
+    ]
+
+    titles = []
+    for _ in range(count):
+        title, other = rng.choice(catalog, 2)
+        titles.append(
+            shapes[int(rng.integers(len(shapes)))].format(
+                title=title,
+                other=other,
+                descriptor=rng.choice(SUPPLEMENTAL_DESCRIPTORS),
+                season=int(rng.integers(1, 6)),
+                episode=int(rng.integers(1, 11)),
+            )
+        )
+    return titles
@@ -0,0 +1,68 @@
+import uuid
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.services.viewing_event_loader import LOADER_AUTO, LOADER_COPY, LOADERS, copy_supported
+from api.services.viewing_ingestion import ingest_viewing_dataframe
+
+from ._synthetic_history import synthetic_viewing_history
+
+
+class Command(BaseCommand):
+    help = "Benchmark viewing history ingestion on a synthetic export. Writes are rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=20000,
+            help="Number of synthetic viewing rows to ingest.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Number of timed runs.",
+        )
+        parser.add_argument(
+            "--loader",
+            choices=LOADERS,
+            default=LOADER_AUTO,
+            help="Viewing event loader. COPY requires a PostgreSQL database.",
+        )
+
+    def handle(self, *args, **options):
+        if options["loader"] == LOADER_COPY and not copy_supported():
+            raise CommandError(f"The COPY loader needs PostgreSQL, not {connection.vendor}.")
+
+        dataframe = synthetic_viewing_history(options["rows"])
+        self.stdout.write(f"Synthetic export: {len(dataframe)} rows on {connection.vendor}")
+
+        for run in range(1, options["repeat"] + 1):
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(
+                    email=f"benchmark-{uuid.uuid4()}@example.com",
+                    password=None,
+                    firstName="Benchmark",
+                    lastName="User",
+                )
+                start = perf_counter()
+                upload = ingest_viewing_dataframe(
+                    user,
+                    dataframe,
+                    source_filename="benchmark.csv",
+                    loader=options["loader"],
+                )
+                elapsed = perf_counter() - start
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Run {run}: {elapsed:.2f}s, {len(dataframe) / elapsed:,.0f} rows/sec "
+                    f"({upload.event_loader}: {upload.events_inserted} inserted, "
+                    f"{upload.events_skipped} skipped)"
+                )
+            )
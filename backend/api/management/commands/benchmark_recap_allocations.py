@@ -0,0 +1,67 @@
+import tracemalloc
+
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from api.services.recap_data import filter_profile_year, household_comparisons_from_dataframe
+from utils.data_analysis import RecapContext, _transformedRecapFrame
+from utils.workflows import parseUploadFrame
+
+from ._synthetic_history import PROFILE_NAMES, synthetic_viewing_history
+
+
+def traced_peak(func, *args):
+    """Result of ``func`` and the peak bytes it allocated on top of what was live."""
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    return result, peak - current
+
+
+class Command(BaseCommand):
+    help = "Report the peak allocation of each recap pipeline stage on a synthetic household upload."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=200000,
+            help="Number of synthetic viewing rows across the household.",
+        )
+        parser.add_argument(
+            "--profiles",
+            type=int,
+            default=5,
+            choices=range(1, len(PROFILE_NAMES) + 1),
+            help="Number of profiles in the household.",
+        )
+
+    def handle(self, *args, **options):
+        history = synthetic_viewing_history(options["rows"], profiles=options["profiles"], years=1)
+        history = history.assign(year=pd.to_datetime(history["Start Time"]).dt.year)
+        profile_name = PROFILE_NAMES[0]
+        year = int(history["year"].max())
+        self.stdout.write(f"Rows: {len(history)}, profile-year: {profile_name} {year}")
+
+        tracemalloc.start()
+        try:
+            upload, upload_peak = traced_peak(parseUploadFrame, history)
+            profile_year, filter_peak = traced_peak(filter_profile_year, upload, profile_name, year)
+            (recap_frame, _), transform_peak = traced_peak(_transformedRecapFrame, profile_year, {})
+            context = RecapContext(recap_frame)
+            _, enrich_peak = traced_peak(lambda: context.enriched)
+            _, cube_peak = traced_peak(lambda: context.cube)
+            _, household_peak = traced_peak(household_comparisons_from_dataframe, upload, year)
+        finally:
+            tracemalloc.stop()
+
+        for stage, peak in [
+            ("parse upload", upload_peak),
+            ("filter profile-year", filter_peak),
+            ("setup and transforms", transform_peak),
+            ("metadata enrichment", enrich_peak),
+            ("recap cube", cube_peak),
+            ("household comparison", household_peak),
+        ]:
+            self.stdout.write(self.style.SUCCESS(f"{stage}: peak {peak / 2**20:.1f} MiB"))
@@ -0,0 +1,75 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from utils.data_analysis import RECAP_SECTION_BUILDERS, RecapContext
+from utils.recap_payload import RECAP_SECTION_DEPENDENCIES, section_order
+from utils.workflows import (
+    compactRecapFrame,
+    dataframeSetUp,
+    frameBytesPerRow,
+    generateMediaType,
+    generateRatings,
+    generateShowTitles,
+)
+
+from ._synthetic_history import synthetic_viewing_history
+
+
+class Command(BaseCommand):
+    help = "Benchmark each recap section builder on a single synthetic profile-year."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=50000,
+            help="Number of synthetic viewing rows in the profile-year.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed runs per section.",
+        )
+        parser.add_argument(
+            "--section",
+            action="append",
+            choices=sorted(RECAP_SECTION_BUILDERS),
+            help="Section to benchmark; repeat for several. Defaults to every section.",
+        )
+
+    def handle(self, *args, **options):
+        history = synthetic_viewing_history(options["rows"], profiles=1, years=1)
+        df = generateRatings(generateMediaType(generateShowTitles(dataframeSetUp(history))))
+        object_bytes = frameBytesPerRow(df)
+        df = compactRecapFrame(df)
+        self.stdout.write(f"Rows: {len(df)}")
+        self.stdout.write(f"Bytes per row: {object_bytes} with string columns, {frameBytesPerRow(df)} compact")
+
+        # Warm the shared enrichment and derived columns so each section is timed on its own work
+        recap = RecapContext(df)
+        results = {}
+        for section_name in section_order(RECAP_SECTION_DEPENDENCIES):
+            upstream = {
+                dependency: results[dependency]
+                for dependency in RECAP_SECTION_DEPENDENCIES[section_name]
+            }
+            results[section_name] = RECAP_SECTION_BUILDERS[section_name](recap, **upstream)
+
+        for section_name in options["section"] or section_order(RECAP_SECTION_DEPENDENCIES):
+            upstream = {
+                dependency: results[dependency]
+                for dependency in RECAP_SECTION_DEPENDENCIES[section_name]
+            }
+            timings = []
+            for _ in range(max(options["repeat"], 1)):
+                start = perf_counter()
+                RECAP_SECTION_BUILDERS[section_name](recap, **upstream)
+                timings.append(perf_counter() - start)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{section_name}: best {min(timings) * 1000:.1f}ms over {len(timings)} run(s)"
+                )
+            )
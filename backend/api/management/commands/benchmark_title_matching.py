@@ -0,0 +1,43 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from utils.workflows import (
+    TITLE_CATALOG,
+    _extractSupplementalContentTitle,
+    _parseNetflixTitleParts,
+)
+
+from ._synthetic_history import synthetic_promo_titles
+
+
+class Command(BaseCommand):
+    help = "Benchmark catalog title matching on promo and episode title shapes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--titles",
+            type=int,
+            default=20000,
+            help="Number of synthetic promo and episode titles.",
+        )
+
+    def handle(self, *args, **options):
+        titles = synthetic_promo_titles(options["titles"])
+        TITLE_CATALOG.load()
+        self.stdout.write(f"Titles: {len(titles)}")
+
+        # The uncached parsers are timed so every title does the full match
+        for label, parse in (
+            ("supplemental title extraction", _extractSupplementalContentTitle),
+            ("title part parsing", _parseNetflixTitleParts),
+        ):
+            start = perf_counter()
+            for title in titles:
+                parse(title)
+            elapsed = perf_counter() - start
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label}: {elapsed:.2f}s, {len(titles) / elapsed:,.0f} titles/sec"
+                )
+            )
@@ -0,0 +1,54 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from utils.data_analysis import enrichWithTitleMetadata
+from utils.workflows import (
+    TITLE_CATALOG,
+    dataframeSetUp,
+    generateMediaType,
+    generateRatings,
+    generateShowTitles,
+)
+
+from ._synthetic_history import synthetic_viewing_history
+
+
+class Command(BaseCommand):
+    help = "Benchmark title metadata enrichment on a single synthetic profile-year."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=50000,
+            help="Number of synthetic viewing rows in the profile-year.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed enrichment runs.",
+        )
+
+    def handle(self, *args, **options):
+        history = synthetic_viewing_history(options["rows"], profiles=1, years=1)
+        df = generateRatings(generateMediaType(generateShowTitles(dataframeSetUp(history))))
+        TITLE_CATALOG.load()
+        self.stdout.write(
+            f"Rows: {len(df)}, distinct titles: {df['New Title'].nunique()}"
+        )
+
+        timings = []
+        for _ in range(max(options["repeat"], 1)):
+            start = perf_counter()
+            enrichWithTitleMetadata(df)
+            timings.append(perf_counter() - start)
+
+        best = min(timings)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"enrichWithTitleMetadata: best {best:.3f}s, "
+                f"{len(df) / best:,.0f} rows/sec over {len(timings)} run(s)"
+            )
+        )
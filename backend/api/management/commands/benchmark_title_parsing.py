@@ -0,0 +1,44 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from api.services.viewing_ingestion import parse_distinct_titles
+from utils.workflows import TITLE_PARSE_CACHE
+
+from ._synthetic_history import synthetic_distinct_titles
+
+
+class Command(BaseCommand):
+    help = "Benchmark distinct title parsing across process pool sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--titles",
+            type=int,
+            default=20000,
+            help="Number of distinct synthetic titles to parse.",
+        )
+        parser.add_argument(
+            "--workers",
+            default="1,2,4",
+            help="Comma-separated worker counts to time.",
+        )
+
+    def handle(self, *args, **options):
+        titles = synthetic_distinct_titles(options["titles"])
+        worker_counts = [int(value) for value in options["workers"].split(",") if value.strip()]
+        self.stdout.write(f"Distinct titles: {len(titles)}")
+
+        baseline = None
+        for workers in worker_counts:
+            TITLE_PARSE_CACHE.clear()
+            start = perf_counter()
+            parse_distinct_titles(titles, workers=workers)
+            elapsed = perf_counter() - start
+            baseline = baseline or elapsed
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{workers} worker(s): {elapsed:.2f}s, "
+                    f"{len(titles) / elapsed:,.0f} titles/sec, {baseline / elapsed:.2f}x"
+                )
+            )
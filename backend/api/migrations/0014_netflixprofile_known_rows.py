@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_recommendationfeedback'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='netflixprofile',
+            name='latest_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='netflixprofile',
+            name='row_hash_filter',
+            field=models.BinaryField(blank=True, default=bytes),
+        ),
+        migrations.AddField(
+            model_name='netflixprofile',
+            name='row_hash_filter_capacity',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='netflixprofile',
+            name='row_hash_filter_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
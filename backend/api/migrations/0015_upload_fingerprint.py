@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_netflixprofile_known_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='upload',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='upload',
+            index=models.Index(fields=['user', 'fingerprint'], name='api_upload_user_id_a0514c_idx'),
+        ),
+    ]
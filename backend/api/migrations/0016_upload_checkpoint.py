@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_upload_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='upload',
+            name='job_id',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='upload',
+            name='rows_committed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='upload',
+            name='rows_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='upload',
+            index=models.Index(fields=['user', 'job_id'], name='api_upload_user_id_7a1c22_idx'),
+        ),
+    ]
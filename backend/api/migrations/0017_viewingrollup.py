@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:50
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_upload_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewingRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('hour', models.PositiveSmallIntegerField()),
+                ('title_raw', models.CharField(max_length=1000)),
+                ('series_title', models.CharField(blank=True, max_length=1000)),
+                ('season_label', models.CharField(blank=True, max_length=255)),
+                ('episode_title', models.CharField(blank=True, max_length=1000)),
+                ('episode_number', models.PositiveIntegerField(blank=True, null=True)),
+                ('is_episode', models.BooleanField(default=False)),
+                ('parsed_media_type', models.CharField(blank=True, max_length=50)),
+                ('classification_confidence', models.FloatField(default=0)),
+                ('classification_source', models.CharField(blank=True, max_length=100)),
+                ('watch_seconds', models.PositiveBigIntegerField(default=0)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('short_count', models.PositiveIntegerField(default=0)),
+                ('finished_count', models.PositiveIntegerField(default=0)),
+                ('longest_seconds', models.PositiveIntegerField(default=0)),
+                ('first_started_at', models.DateTimeField()),
+                ('last_started_at', models.DateTimeField()),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='viewing_rollups', to='api.netflixprofile')),
+                ('title', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='viewing_rollups', to='api.title')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['profile', 'date'], name='api_viewing_profile_bb22ca_idx')],
+            },
+        ),
+    ]
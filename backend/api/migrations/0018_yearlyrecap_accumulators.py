@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_viewingrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='yearlyrecap',
+            name='accumulators',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_yearlyrecap_accumulators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='upload',
+            name='event_loader',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='upload',
+            name='events_inserted',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='upload',
+            name='events_skipped',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='upload',
+            name='known_rows_skipped',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
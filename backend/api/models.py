@@ -54,6 +54,10 @@ class NetflixProfile(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="netflix_profiles")
     name = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
+    latest_started_at = models.DateTimeField(null=True, blank=True)
+    row_hash_filter = models.BinaryField(default=bytes, blank=True)
+    row_hash_filter_capacity = models.PositiveIntegerField(default=0)
+    row_hash_filter_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         constraints = [
@@ -77,9 +81,17 @@ class Upload(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="uploads", null=True, blank=True)
     source_filename = models.CharField(max_length=255, blank=True)
+    fingerprint = models.CharField(max_length=64, blank=True)
+    job_id = models.CharField(max_length=64, blank=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     is_anonymous = models.BooleanField(default=False)
     error_message = models.TextField(blank=True)
+    rows_total = models.PositiveIntegerField(default=0)
+    rows_committed = models.PositiveIntegerField(default=0)
+    events_inserted = models.PositiveIntegerField(default=0)
+    events_skipped = models.PositiveIntegerField(default=0)
+    known_rows_skipped = models.PositiveIntegerField(default=0)
+    event_loader = models.CharField(max_length=20, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     expires_at = models.DateTimeField(null=True, blank=True)
@@ -87,6 +99,8 @@ class Upload(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["user", "uploaded_at"]),
+            models.Index(fields=["user", "fingerprint"]),
+            models.Index(fields=["user", "job_id"]),
             models.Index(fields=["status"]),
             models.Index(fields=["expires_at"]),
         ]
@@ -186,12 +200,47 @@ class ViewingEvent(models.Model):
         return f"{self.profile.name} - {self.title_raw} - {self.started_at}"
 
 
+class ViewingRollup(models.Model):
+    """Watchable viewing events of one profile, summed per date, hour and raw title."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    profile = models.ForeignKey(NetflixProfile, on_delete=models.CASCADE, related_name="viewing_rollups")
+    title = models.ForeignKey(Title, on_delete=models.SET_NULL, related_name="viewing_rollups", null=True, blank=True)
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+    title_raw = models.CharField(max_length=1000)
+    series_title = models.CharField(max_length=1000, blank=True)
+    season_label = models.CharField(max_length=255, blank=True)
+    episode_title = models.CharField(max_length=1000, blank=True)
+    episode_number = models.PositiveIntegerField(null=True, blank=True)
+    is_episode = models.BooleanField(default=False)
+    parsed_media_type = models.CharField(max_length=50, blank=True)
+    classification_confidence = models.FloatField(default=0)
+    classification_source = models.CharField(max_length=100, blank=True)
+    watch_seconds = models.PositiveBigIntegerField(default=0)
+    event_count = models.PositiveIntegerField(default=0)
+    short_count = models.PositiveIntegerField(default=0)
+    finished_count = models.PositiveIntegerField(default=0)
+    longest_seconds = models.PositiveIntegerField(default=0)
+    first_started_at = models.DateTimeField()
+    last_started_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["profile", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.profile.name} - {self.title_raw} - {self.date} {self.hour:02d}h"
+
+
 class YearlyRecap(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="yearly_recaps")
     profile = models.ForeignKey(NetflixProfile, on_delete=models.CASCADE, related_name="yearly_recaps")
     year = models.CharField(max_length=16)
     data = models.JSONField(default=dict)
+    accumulators = models.JSONField(default=dict, blank=True)
     event_count = models.PositiveIntegerField(default=0)
     latest_event_at = models.DateTimeField(null=True, blank=True)
     generated_at = models.DateTimeField(auto_now=True)
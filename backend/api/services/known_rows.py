@@ -0,0 +1,153 @@
+import numpy as np
+
+from api.models import ViewingEvent
+
+
+BLOOM_BITS_PER_ROW = 10
+BLOOM_HASHES = 7
+BLOOM_MIN_CAPACITY = 10_000
+KNOWN_ROW_LOOKUP_BATCH = 5_000
+
+
+class RowHashBloomFilter:
+    """
+    Bloom filter over ViewingEvent row hashes.
+
+    Row hashes are already SHA-256 hex digests, so bit positions come from
+    double hashing two 64-bit slices of the digest instead of rehashing.
+    """
+
+    def __init__(self, capacity, bits=b"", count=0):
+        self.capacity = max(int(capacity), BLOOM_MIN_CAPACITY)
+        self.size = self.capacity * BLOOM_BITS_PER_ROW
+        byte_count = (self.size + 7) // 8
+        self.bits = np.zeros(byte_count, dtype=np.uint8)
+        self.count = 0
+        if bits and len(bits) == byte_count:
+            self.bits[:] = np.frombuffer(bytes(bits), dtype=np.uint8)
+            self.count = int(count)
+
+    @classmethod
+    def for_profile(cls, profile):
+        return cls(
+            profile.row_hash_filter_capacity,
+            bits=profile.row_hash_filter,
+            count=profile.row_hash_filter_count,
+        )
+
+    def positions(self, row_hashes):
+        first = np.array([int(row_hash[:16], 16) for row_hash in row_hashes], dtype=np.uint64)
+        second = np.array([int(row_hash[16:32], 16) | 1 for row_hash in row_hashes], dtype=np.uint64)
+        steps = np.arange(BLOOM_HASHES, dtype=np.uint64)
+        return (first[:, None] + steps[None, :] * second[:, None]) % np.uint64(self.size)
+
+    def add(self, row_hashes):
+        if not len(row_hashes):
+            return
+        positions = self.positions(row_hashes).ravel()
+        np.bitwise_or.at(
+            self.bits,
+            (positions >> np.uint64(3)).astype(np.intp),
+            (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)),
+        )
+        self.count += len(row_hashes)
+
+    def contains(self, row_hashes):
+        if not len(row_hashes):
+            return np.zeros(0, dtype=bool)
+        positions = self.positions(row_hashes)
+        bytes_at = self.bits[(positions >> np.uint64(3)).astype(np.intp)]
+        bit_set = (bytes_at >> (positions & np.uint64(7)).astype(np.uint8)) & np.uint8(1)
+        return bit_set.all(axis=1)
+
+    def has_room_for(self, row_count):
+        return self.count + row_count <= self.capacity
+
+    def to_bytes(self):
+        return self.bits.tobytes()
+
+
+def existing_row_hashes(row_hashes):
+    found = set()
+    for start in range(0, len(row_hashes), KNOWN_ROW_LOOKUP_BATCH):
+        found.update(
+            ViewingEvent.objects.filter(
+                row_hash__in=row_hashes[start:start + KNOWN_ROW_LOOKUP_BATCH]
+            ).values_list("row_hash", flat=True)
+        )
+    return found
+
+
+def known_row_mask(profiles_by_name, profile_names, started_at, row_hashes):
+    """
+    Flag rows that are already stored, before any title parsing happens.
+
+    Rows newer than a profile's high-water mark are new by definition. Older
+    rows are checked against the profile's Bloom filter, and only the filter's
+    positives are confirmed against the database, so a false positive can
+    never drop a row.
+    """
+    profile_names = np.asarray(profile_names, dtype=object)
+    row_hashes = np.asarray(row_hashes, dtype=object)
+    started_at = np.asarray(started_at, dtype=object)
+    candidates = np.zeros(len(row_hashes), dtype=bool)
+
+    for name, profile in profiles_by_name.items():
+        if profile.latest_started_at is None or not profile.row_hash_filter_count:
+            continue
+        rows = np.flatnonzero(profile_names == name)
+        if not len(rows):
+            continue
+        rows = rows[started_at[rows] <= profile.latest_started_at]
+        if not len(rows):
+            continue
+        bloom = RowHashBloomFilter.for_profile(profile)
+        candidates[rows[bloom.contains(row_hashes[rows].tolist())]] = True
+
+    if not candidates.any():
+        return candidates
+    found = existing_row_hashes(row_hashes[candidates].tolist())
+    known = np.zeros(len(row_hashes), dtype=bool)
+    known[candidates] = [row_hash in found for row_hash in row_hashes[candidates]]
+    return known
+
+
+def rebuild_row_hash_filter(profile, extra_rows=0):
+    stored = ViewingEvent.objects.filter(profile=profile).count()
+    bloom = RowHashBloomFilter(2 * (stored + extra_rows))
+    bloom.add(list(ViewingEvent.objects.filter(profile=profile).values_list("row_hash", flat=True)))
+    return bloom
+
+
+def record_ingested_rows(profiles_by_name, profile_names, started_at, row_hashes):
+    """Fold freshly loaded rows into each profile's high-water mark and filter."""
+    profile_names = np.asarray(profile_names, dtype=object)
+    row_hashes = np.asarray(row_hashes, dtype=object)
+    started_at = np.asarray(started_at, dtype=object)
+
+    for name, profile in profiles_by_name.items():
+        rows = np.flatnonzero(profile_names == name)
+        if not len(rows):
+            continue
+        latest = max(started_at[rows])
+        if profile.latest_started_at is None or latest > profile.latest_started_at:
+            profile.latest_started_at = latest
+
+        bloom = RowHashBloomFilter.for_profile(profile)
+        if profile.row_hash_filter_count and bloom.has_room_for(len(rows)):
+            bloom.add(row_hashes[rows].tolist())
+        else:
+            # Stored events already include these rows, so a rebuild covers them.
+            bloom = rebuild_row_hash_filter(profile, extra_rows=len(rows))
+
+        profile.row_hash_filter = bloom.to_bytes()
+        profile.row_hash_filter_capacity = bloom.capacity
+        profile.row_hash_filter_count = bloom.count
+        profile.save(
+            update_fields=[
+                "latest_started_at",
+                "row_hash_filter",
+                "row_hash_filter_capacity",
+                "row_hash_filter_count",
+            ]
+        )
@@ -8,6 +8,8 @@ import pandas as pd
 from django.core.cache import cache
 from django.utils import timezone
 
+from utils.workflows import TITLE_PART_COLUMNS, parseUploadFrame
+
 
 ANONYMOUS_CACHE_TTL_SECONDS = 60 * 60 * 24
 ANONYMOUS_CSV_TTL_SECONDS = 60 * 60 * 24
@@ -32,6 +34,18 @@ def result_cache_key(owner, profile_name, year):
     return f"processed_data_{owner}_{profile_hash}_{year_key}"
 
 
+def household_cache_key(owner, year, job_id=None):
+    # Uploads are scoped to their job; stored history only to its owner
+    scope = f"{owner}_{job_id}" if job_id else owner
+    year_key = "all" if str(year).lower() == "all" else str(int(year))
+    return f"household_comparison_{scope}_{year_key}"
+
+
+def upload_fingerprint_key(fingerprint, session_key):
+    # Anonymous uploads are only reused within the session that made them
+    return f"upload_fingerprint_session:{session_key}_{fingerprint}"
+
+
 def processing_state_key(job_id):
     return f"processing_state_{job_id}"
 
@@ -137,6 +151,7 @@ def update_processing_state(
     selected_profile=None,
     worker_started_at=None,
     worker_finished_at=None,
+    ingestion=None,
 ):
     lock_factory = getattr(cache, "lock", None)
     lock = (
@@ -158,6 +173,8 @@ def update_processing_state(
             state["worker_started_at"] = worker_started_at
         if worker_finished_at is not None:
             state["worker_finished_at"] = worker_finished_at
+        if ingestion is not None:
+            state["ingestion"] = ingestion
         if profile_name is not None and year is not None and year_status:
             profile_state = state.setdefault("profiles", {}).setdefault(
                 profile_name,
@@ -184,6 +201,15 @@ def update_processing_state(
         return state
 
 
+def ingestion_progress(rows_committed, rows_total, status_value="running"):
+    return {
+        "status": status_value,
+        "rows_committed": rows_committed,
+        "rows_total": rows_total,
+        "percent": round((rows_committed / rows_total) * 100) if rows_total else 100,
+    }
+
+
 def ready_profile_years(state):
     ready = {}
     for profile_name, years in (state or {}).get("profiles", {}).items():
@@ -220,6 +246,7 @@ def processing_status_payload(
         "expires_at": state.get("expires_at"),
         "worker_started_at": state.get("worker_started_at"),
         "worker_finished_at": state.get("worker_finished_at"),
+        "ingestion": state.get("ingestion"),
     }
     if message:
         payload["message"] = message
@@ -236,14 +263,83 @@ def store_upload(owner, job_id, upload_data):
     )
 
 
-def load_upload(owner, job_id):
+def remember_upload_fingerprint(fingerprint, job_id, merge_stats, session_key=None):
+    if not session_key:
+        return
+    cache.set(
+        upload_fingerprint_key(fingerprint, session_key),
+        {"job_id": job_id, "merge_stats": merge_stats},
+        timeout=ANONYMOUS_CSV_TTL_SECONDS,
+    )
+
+
+def reusable_upload_job(fingerprint, session_key=None):
+    """
+    Return the job, processing state and merge stats of an earlier identical
+    anonymous upload from the same session whose cached data is still live,
+    or ``(None, None, None)``. Saved uploads are matched in the database
+    instead, so wiping saved data is never undone by a stale cache entry.
+    """
+    remembered = (
+        cache.get(upload_fingerprint_key(fingerprint, session_key))
+        if session_key
+        else None
+    )
+    if not isinstance(remembered, dict):
+        return None, None, None
+
+    job_id = remembered["job_id"]
+    state = get_processing_state(job_id)
+    if not state or state.get("status") == "error":
+        return None, None, None
+    if not cache.get(upload_cache_key(owner_key(None, job_id), job_id)):
+        return None, None, None
+    return job_id, state, remembered["merge_stats"]
+
+
+def load_upload_data(owner, job_id):
     cached_upload = cache.get(upload_cache_key(owner, job_id))
-    if not cached_upload:
+    return json.loads(cached_upload) if cached_upload else None
+
+
+def load_upload(owner, job_id):
+    upload_data = load_upload_data(owner, job_id)
+    if upload_data is None:
         return None, None
 
-    upload_data = json.loads(cached_upload)
+    # Start times come back parsed, as stored, so workers never reparse them
     dataframe = pd.read_json(
         io.StringIO(upload_data["dataframe_json"]),
         orient="records",
+        convert_dates=["parsed_start_time"],
+        keep_default_dates=False,
     )
     return upload_data, dataframe
+
+
+def parsed_upload(owner, job_id, upload_data, dataframe):
+    """
+    Parse a loaded upload. The first parse stores the title part columns
+    back into the cached upload, so titles are parsed once per job and the
+    cache holds a single copy of the upload.
+    """
+    # Imported here because ingestion imports this module via title metadata
+    from api.services.viewing_ingestion import title_parts_frame
+
+    titles_parsed = all(column in dataframe.columns for column in TITLE_PART_COLUMNS)
+    dataframe = parseUploadFrame(dataframe, title_parts_frame)
+    if not titles_parsed:
+        store_upload(
+            owner,
+            job_id,
+            {**upload_data, "dataframe_json": dataframe.to_json(orient="records")},
+        )
+    return dataframe
+
+
+def load_parsed_upload(owner, job_id):
+    """``load_upload`` with the dataframe parsed, see ``parsed_upload``."""
+    upload_data, dataframe = load_upload(owner, job_id)
+    if dataframe is None:
+        return None, None
+    return upload_data, parsed_upload(owner, job_id, upload_data, dataframe)
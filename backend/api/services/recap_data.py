@@ -1,21 +1,34 @@
-import io
-import json
+import functools
 
 import pandas as pd
 from django.core.cache import cache
 from django.db.models import Count, Max
 
-from api.models import NetflixProfile, ViewingEvent, YearlyRecap
+from api.models import NetflixProfile, ViewingEvent, ViewingRollup, YearlyRecap
 from api.services.recap_cache import (
     ANONYMOUS_CACHE_TTL_SECONDS,
+    household_cache_key,
+    load_parsed_upload,
+    owner_key,
     result_cache_key,
-    upload_cache_key,
 )
+from api.services.viewing_rollups import ensure_viewing_rollups
 from utils.data_analysis import (
+    FINISHED_EVENTS,
     GRAPH_SCHEMA_VERSION,
+    LAST_START_TIME,
+    LONGEST_SECONDS,
+    SHORT_EVENTS,
+    getAccumulatedGraphData,
+    getHouseholdComparisonData,
     getJsonGraphData,
-    getProfileComparisonData,
+    getRecapAccumulator,
+    projectProfileComparison,
 )
+from utils.metadata_resolver import METADATA_RESOLVER
+from utils.recap_accumulator import RecapAccumulator
+from utils.recap_cube import EVENTS
+from utils.workflows import parseStartTimes
 
 
 def is_all_years(year):
@@ -48,7 +61,7 @@ def filter_profile_year(dataframe, profile_name, year):
     mask = dataframe["Profile Name"] == profile_name
     if not is_all_years(year):
         mask &= dataframe["year"] == int(year)
-    return dataframe[mask].copy()
+    return dataframe[mask]
 
 
 def seconds_to_duration(seconds):
@@ -59,64 +72,170 @@ def seconds_to_duration(seconds):
     return f"{hours:02d}:{minutes:02d}:{remaining_seconds:02d}"
 
 
+EVENT_ROW_FIELDS = [
+    "profile__name",
+    "started_at",
+    "duration_seconds",
+    "title_id",
+    "title_raw",
+    "series_title",
+    "season_label",
+    "episode_title",
+    "episode_number",
+    "is_episode",
+    "parsed_media_type",
+    "classification_confidence",
+    "classification_source",
+    "supplemental_video_type",
+    "device_type",
+    "country",
+]
+
+
+def viewing_row(event, title):
+    return {
+        "Profile Name": event["profile__name"],
+        "Start Time": event["started_at"],
+        "Duration": seconds_to_duration(event["duration_seconds"]),
+        "Attributes": "",
+        "Title": event["title_raw"],
+        "Raw Title": event["title_raw"],
+        "Series Title": event["series_title"],
+        "Season Label": event["season_label"],
+        "Episode Title": event["episode_title"],
+        "Episode Number": event["episode_number"],
+        "Is Episode": event["is_episode"],
+        "Parsed Media Type": event["parsed_media_type"],
+        "Classification Confidence": event["classification_confidence"],
+        "Classification Source": event["classification_source"],
+        "Cached Media Type": title["media_type"] if title else "",
+        "Metadata Genres": title["genres"] if title else [],
+        "Metadata Origin Countries": (
+            title["origin_countries"] if title else []
+        ),
+        "Metadata Original Language": (
+            title["original_language"] if title else ""
+        ),
+        "Metadata Rating": title["rating"] if title else "",
+        "Metadata Release Year": title["release_year"] if title else None,
+        "Metadata Runtime Minutes": (
+            title["runtime_minutes"] if title else None
+        ),
+        "Metadata Poster URL": title["poster_url"] if title else "",
+        "Metadata Popularity": title["popularity"] if title else 0,
+        "Metadata Source": title["metadata_source"] if title else "",
+        "Metadata Confidence": (
+            title["metadata_confidence"] if title else 0
+        ),
+        "Supplemental Video Type": (
+            event.get("supplemental_video_type") or None
+        ),
+        "Device Type": event.get("device_type", ""),
+        "Bookmark": "",
+        "Latest Bookmark": "",
+        "Country": event.get("country", ""),
+    }
+
+
+def stored_titles(rows):
+    return METADATA_RESOLVER.stored_many(
+        {row["title_id"] for row in rows if row["title_id"]}
+    )
+
+
 def event_rows(events):
-    rows = []
-    queryset = events.select_related("profile", "title").order_by("started_at")
-    for event in queryset:
-        title = event.title
-        rows.append(
-            {
-                "Profile Name": event.profile.name,
-                "Start Time": event.started_at,
-                "Duration": seconds_to_duration(event.duration_seconds),
-                "Attributes": "",
-                "Title": event.title_raw,
-                "Raw Title": event.title_raw,
-                "Series Title": event.series_title,
-                "Season Label": event.season_label,
-                "Episode Title": event.episode_title,
-                "Episode Number": event.episode_number,
-                "Is Episode": event.is_episode,
-                "Parsed Media Type": event.parsed_media_type,
-                "Classification Confidence": event.classification_confidence,
-                "Classification Source": event.classification_source,
-                "Cached Media Type": title.media_type if title else "",
-                "Metadata Genres": title.genres if title else [],
-                "Metadata Origin Countries": (
-                    title.origin_countries if title else []
-                ),
-                "Metadata Original Language": (
-                    title.original_language if title else ""
-                ),
-                "Metadata Rating": title.rating if title else "",
-                "Metadata Release Year": title.release_year if title else None,
-                "Metadata Runtime Minutes": (
-                    title.runtime_minutes if title else None
-                ),
-                "Metadata Poster URL": title.poster_url if title else "",
-                "Metadata Popularity": title.popularity if title else 0,
-                "Metadata Source": title.metadata_source if title else "",
-                "Metadata Confidence": (
-                    title.metadata_confidence if title else 0
-                ),
-                "Supplemental Video Type": (
-                    event.supplemental_video_type or None
-                ),
-                "Device Type": event.device_type,
-                "Bookmark": "",
-                "Latest Bookmark": "",
-                "Country": event.country,
-            }
+    events = list(events.order_by("started_at").values(*EVENT_ROW_FIELDS))
+    titles = stored_titles(events)
+    return [
+        viewing_row(
+            event,
+            titles.get(event["title_id"]) if event["title_id"] else None,
         )
-    return rows
+        for event in events
+    ]
 
 
-def graph_data_from_events(events, profile_name, year):
-    return getJsonGraphData(
-        pd.DataFrame(event_rows(events)),
-        profile_name,
-        display_year(year),
+ROLLUP_ROW_FIELDS = [
+    "profile__name",
+    "title_id",
+    "title_raw",
+    "series_title",
+    "season_label",
+    "episode_title",
+    "episode_number",
+    "is_episode",
+    "parsed_media_type",
+    "classification_confidence",
+    "classification_source",
+    "watch_seconds",
+    "event_count",
+    "short_count",
+    "finished_count",
+    "longest_seconds",
+    "first_started_at",
+    "last_started_at",
+]
+
+
+def rollup_rows(rollups):
+    """
+    One recap row per rollup, standing for all of its events: the summed
+    duration starts at the first event, with the event-level facts recaps
+    need carried alongside.
+    """
+    rollups = list(
+        rollups.order_by("first_started_at", "title_raw").values(*ROLLUP_ROW_FIELDS)
     )
+    titles = stored_titles(rollups)
+    return [
+        {
+            **viewing_row(
+                {
+                    **rollup,
+                    "started_at": rollup["first_started_at"],
+                    "duration_seconds": rollup["watch_seconds"],
+                },
+                titles.get(rollup["title_id"]) if rollup["title_id"] else None,
+            ),
+            EVENTS: rollup["event_count"],
+            SHORT_EVENTS: rollup["short_count"],
+            FINISHED_EVENTS: rollup["finished_count"],
+            LONGEST_SECONDS: rollup["longest_seconds"],
+            LAST_START_TIME: rollup["last_started_at"],
+        }
+        for rollup in rollups
+    ]
+
+
+def period_rollups(rollups, year):
+    if not is_all_years(year):
+        rollups = rollups.filter(date__year=int(year))
+    return rollups
+
+
+def accumulator_from_rollups(profile, events, year):
+    rollups = period_rollups(ViewingRollup.objects.filter(profile=profile), year)
+    ensure_viewing_rollups(events, rollups)
+    rows = rollup_rows(rollups)
+    return getRecapAccumulator(pd.DataFrame(rows)) if rows else None
+
+
+def appended_accumulator(recap, events):
+    """
+    The saved recap's accumulators with the events that started after it
+    folded in, or None unless the new events only append to its history.
+    """
+    if not recap.accumulators or recap.latest_event_at is None:
+        return None
+    if events.filter(started_at__lte=recap.latest_event_at).count() != recap.event_count:
+        return None
+    appended = events.filter(started_at__gt=recap.latest_event_at)
+    if not appended.exists():
+        return None
+
+    accumulator = RecapAccumulator.from_json(recap.accumulators)
+    delta = getRecapAccumulator(pd.DataFrame(event_rows(appended)))
+    return accumulator.merge(delta) if delta else accumulator
 
 
 def event_signature(events):
@@ -130,79 +249,167 @@ def event_signature(events):
     }
 
 
-def profile_comparisons_from_dataframe(dataframe, profile_name, year):
-    comparison_df = dataframe.copy()
+def household_comparisons_from_dataframe(dataframe, year):
     if not is_all_years(year):
-        if "year" in comparison_df.columns:
-            comparison_df = comparison_df[
-                comparison_df["year"] == int(year)
-            ]
+        if "year" in dataframe.columns:
+            years = dataframe["year"]
         else:
-            comparison_df["parsed_start_time"] = pd.to_datetime(
-                comparison_df["Start Time"],
-                errors="coerce",
-            )
-            comparison_df = comparison_df[
-                comparison_df["parsed_start_time"].dt.year == int(year)
-            ]
-    if comparison_df.empty:
+            years = parseStartTimes(dataframe["Start Time"]).dt.year
+        dataframe = dataframe[years == int(year)]
+    if dataframe.empty:
         return {}
-    return getProfileComparisonData(
-        comparison_df,
-        profile_name,
-        display_year(year),
-    )
-
-
-def profile_comparisons(user, profile_name, year):
+    return getHouseholdComparisonData(dataframe, display_year(year))
+
+
+def profile_comparisons_from_dataframe(dataframe, profile_name, year, owner=None, job_id=None):
+    """
+    ``profile_name``'s household comparison in an upload. With ``owner`` and
+    ``job_id`` the household part is cached once for all of the job's profiles.
+    """
+    if not owner or not job_id:
+        household = household_comparisons_from_dataframe(dataframe, year)
+        return projectProfileComparison(household, profile_name)
+
+    cache_key = household_cache_key(owner, year, job_id)
+    household = cache.get(cache_key)
+    if household is None:
+        household = household_comparisons_from_dataframe(dataframe, year)
+        cache.set(cache_key, household, timeout=ANONYMOUS_CACHE_TTL_SECONDS)
+    return projectProfileComparison(household, profile_name)
+
+
+def household_comparisons(user, year):
+    """
+    Household comparison of the user's stored history in ``year``, cached
+    until the household's events change.
+    """
     events = ViewingEvent.objects.filter(profile__user=user)
     if not is_all_years(year):
         events = events.filter(started_at__year=int(year))
-    if not events.exists():
+    signature = event_signature(events)
+    if not signature["event_count"]:
         return {}
-    return getProfileComparisonData(
-        pd.DataFrame(event_rows(events)),
-        profile_name,
+
+    cache_key = household_cache_key(owner_key(user, None), year)
+    cached = cache.get(cache_key)
+    if cached and cached["signature"] == signature:
+        return cached["household"]
+
+    rollups = period_rollups(ViewingRollup.objects.filter(profile__user=user), year)
+    ensure_viewing_rollups(events, rollups)
+    household = getHouseholdComparisonData(
+        pd.DataFrame(rollup_rows(rollups)),
         display_year(year),
     )
+    cache.set(
+        cache_key,
+        {"signature": signature, "household": household},
+        timeout=ANONYMOUS_CACHE_TTL_SECONDS,
+    )
+    return household
 
 
-def saved_or_generated_recap(user, profile, events, profile_name, year):
+def profile_comparisons(user, profile_name, year):
+    return projectProfileComparison(household_comparisons(user, year), profile_name)
+
+
+def composed_accumulator(recaps):
+    """Accumulator of all the events behind ``recaps``, given oldest first."""
+    missing = [recap.year for recap in recaps if not recap.accumulators]
+    if missing:
+        raise ValueError(f"Year recaps without accumulators: {', '.join(missing)}")
+    accumulators = [RecapAccumulator.from_json(recap.accumulators) for recap in recaps]
+    return functools.reduce(RecapAccumulator.merge, accumulators) if accumulators else None
+
+
+def saved_recap(user, profile, events, profile_name, year, with_accumulators=False):
+    """
+    The profile's saved recap of ``year``, refreshed if its events changed.
+
+    Household comparisons depend on other profiles' events too, so they are
+    not saved with it; ``saved_or_generated_recap`` projects them per read.
+    With ``with_accumulators``, a year recap saved without accumulators,
+    e.g. before they existed, is refreshed too.
+    """
     year_key = recap_year_key(year)
     signature = event_signature(events)
-    recap = YearlyRecap.objects.filter(
-        user=user,
-        profile=profile,
-        year=year_key,
-    ).first()
+    recaps = YearlyRecap.objects.filter(user=user, profile=profile, year=year_key)
+    if not with_accumulators:
+        # Accumulators are only read when the recap has to be refreshed
+        recaps = recaps.defer("accumulators")
+    recap = recaps.first()
 
-    if (
+    current = (
         recap
-        and recap.event_count == signature["event_count"]
-        and recap.latest_event_at == signature["latest_event_at"]
         and "title_level_insights" in recap.data
         and "wrapped_cards" in recap.data
         and recap.data.get("schema_version") == GRAPH_SCHEMA_VERSION
+        and (not with_accumulators or is_all_years(year) or bool(recap.accumulators))
+    )
+    if (
+        current
+        and recap.event_count == signature["event_count"]
+        and recap.latest_event_at == signature["latest_event_at"]
     ):
-        return recap.data
+        return recap
 
-    graph_data = graph_data_from_events(events, profile_name, year)
-    graph_data["profile_comparisons"] = profile_comparisons(
-        user,
-        profile_name,
-        year,
+    if is_all_years(year):
+        # Composed from the year recaps, so only stale years see their events
+        accumulator = composed_accumulator(
+            year_recaps(user, profile, profile_years(events), with_accumulators=True)
+        )
+    else:
+        accumulator = appended_accumulator(recap, events) if current else None
+        if accumulator is None:
+            accumulator = accumulator_from_rollups(profile, events, year)
+    graph_data = (
+        getAccumulatedGraphData(accumulator, profile_name, display_year(year))
+        if accumulator
+        else {"error": "No data found after processing"}
     )
-    YearlyRecap.objects.update_or_create(
+    recap, _ = YearlyRecap.objects.update_or_create(
         user=user,
         profile=profile,
         year=year_key,
         defaults={
             "data": graph_data,
+            # The all-years recap is always recomposed from its years
+            "accumulators": (
+                accumulator.to_json()
+                if accumulator and not is_all_years(year)
+                else {}
+            ),
             "event_count": signature["event_count"],
             "latest_event_at": signature["latest_event_at"],
         },
     )
-    return graph_data
+    return recap
+
+
+def saved_or_generated_recap(user, profile, events, profile_name, year):
+    return {
+        **saved_recap(user, profile, events, profile_name, year).data,
+        "profile_comparisons": profile_comparisons(user, profile_name, year),
+    }
+
+
+def profile_years(events):
+    return [day.year for day in events.dates("started_at", "year")]
+
+
+def year_recaps(user, profile, years, with_accumulators=False):
+    """The profile's saved recap of each of ``years``, refreshed where stale."""
+    return [
+        saved_recap(
+            user,
+            profile,
+            ViewingEvent.objects.filter(profile=profile, started_at__year=int(year)),
+            profile.name,
+            year,
+            with_accumulators=with_accumulators,
+        )
+        for year in years
+    ]
 
 
 def repair_cached_graph_data(
@@ -223,15 +430,10 @@ def repair_cached_graph_data(
     if not job_id or required_sections.issubset(cached_result):
         return cached_result
 
-    cached_upload = cache.get(upload_cache_key(owner, job_id))
-    if not cached_upload:
+    _, dataframe = load_parsed_upload(owner, job_id)
+    if dataframe is None:
         return cached_result
 
-    upload_data = json.loads(cached_upload)
-    dataframe = pd.read_json(
-        io.StringIO(upload_data["dataframe_json"]),
-        orient="records",
-    )
     profile_year_df = filter_profile_year(
         dataframe,
         profile_name,
@@ -245,6 +447,8 @@ def repair_cached_graph_data(
         dataframe,
         profile_name,
         year,
+        owner,
+        job_id,
     )
     cache.set(
         result_cache_key(owner, profile_name, year),
@@ -254,6 +458,16 @@ def repair_cached_graph_data(
     return repaired
 
 
+COMPARISON_METRICS = [
+    "total_watchtime_hours",
+    "total_viewing_events",
+    "unique_titles",
+    "unique_movies",
+    "unique_shows",
+    "longest_watch_streak_days",
+]
+
+
 def comparison_summary(graph_data):
     core = graph_data.get("core_stats", {})
     genres = graph_data.get("genre_content_insights", {}).get(
@@ -279,21 +493,13 @@ def comparison_summary(graph_data):
 def year_comparison_payload(year_a, graph_a, year_b, graph_b):
     summary_a = comparison_summary(graph_a)
     summary_b = comparison_summary(graph_b)
-    metrics = [
-        "total_watchtime_hours",
-        "total_viewing_events",
-        "unique_titles",
-        "unique_movies",
-        "unique_shows",
-        "longest_watch_streak_days",
-    ]
     deltas = {
         metric: round(
             float(summary_b.get(metric, 0))
             - float(summary_a.get(metric, 0)),
             2,
         )
-        for metric in metrics
+        for metric in COMPARISON_METRICS
     }
     return {
         "year_a": int(year_a),
@@ -306,3 +512,15 @@ def year_comparison_payload(year_a, graph_a, year_b, graph_b):
             "year_b": graph_b.get("monthly_watchtime", []),
         },
     }
+
+
+def recap_trends(recaps):
+    """Series of the core comparison metrics over year ``recaps``, oldest first."""
+    summaries = [comparison_summary(recap.data) for recap in recaps]
+    return {
+        "years": [int(recap.year) for recap in recaps],
+        "series": {
+            metric: [summary[metric] for summary in summaries]
+            for metric in COMPARISON_METRICS
+        },
+    }
@@ -2,13 +2,18 @@ import logging
 from django.utils import timezone
 
 import django_rq
+from django.conf import settings
 from django.core.cache import cache
+from rq import Retry
 
 from api.services.recap_cache import (
     ANONYMOUS_CACHE_TTL_SECONDS,
     get_processing_state,
+    ingestion_progress,
     job_status_key,
+    load_parsed_upload,
     load_upload,
+    parsed_upload,
     result_cache_key,
     update_processing_state,
 )
@@ -17,23 +22,16 @@ from api.services.recap_data import (
     profile_comparisons_from_dataframe,
 )
 from api.services.recommendations import RecommendationError, generate_recommendations
-from api.services.viewing_ingestion import ingest_viewing_dataframe
+from api.services.viewing_ingestion import ingest_viewing_dataframe_chunked
 from utils.data_analysis import getJsonGraphData
-from utils.recap_payload import HEAVY_RECAP_SECTIONS
+from utils.recap_payload import HEAVY_RECAP_SECTIONS, INITIAL_RECAP_SECTIONS
 
 
 logger = logging.getLogger(__name__)
 QUEUE_NAME = "recaps"
 RECAP_JOB_TIMEOUT_SECONDS = 60 * 30
-INITIAL_RECAP_SECTIONS = [
-    "total_title_watchtime",
-    "total_type_watchtime",
-    "monthly_watchtime",
-    "ratings_watchtime",
-    "core_stats",
-    "title_level_insights",
-    "wrapped_cards",
-]
+# Authenticated jobs resume ingestion from the last committed chunk on retry.
+RECAP_JOB_RETRY = Retry(max=2, interval=[10, 60])
 
 
 def recap_job_id(job_id):
@@ -65,6 +63,7 @@ def enqueue_authenticated_recap(job_id, owner, user_id, profile_years, source_fi
         source_filename,
         job_id=recap_job_id(job_id),
         job_timeout=RECAP_JOB_TIMEOUT_SECONDS,
+        retry=RECAP_JOB_RETRY,
         result_ttl=ANONYMOUS_CACHE_TTL_SECONDS,
         failure_ttl=ANONYMOUS_CACHE_TTL_SECONDS,
     )
@@ -73,13 +72,38 @@ def enqueue_authenticated_recap(job_id, owner, user_id, profile_years, source_fi
 def process_authenticated_upload(job_id, owner, user_id, profile_years, source_filename):
     from django.contrib.auth import get_user_model
 
-    _, dataframe = load_upload(owner, job_id)
+    upload_data, dataframe = load_upload(owner, job_id)
     if dataframe is None:
         raise RuntimeError("Cached upload not found")
 
     user = get_user_model().objects.get(id=user_id)
-    ingest_viewing_dataframe(user, dataframe, source_filename=source_filename)
-    process_anonymous_upload(job_id, owner, profile_years)
+    # Ingestion drops rows that are already stored before parsing titles,
+    # so it takes the upload unparsed; recaps parse it afterwards.
+    upload = ingest_viewing_dataframe_chunked(
+        user,
+        dataframe,
+        source_filename=source_filename,
+        job_id=job_id,
+        fingerprint=upload_data.get("fingerprint", ""),
+        progress=lambda upload: update_processing_state(
+            job_id,
+            ingestion=ingestion_progress(upload.rows_committed, upload.rows_total),
+        ),
+    )
+    update_processing_state(
+        job_id,
+        ingestion=ingestion_progress(
+            upload.rows_committed,
+            upload.rows_total,
+            status_value="completed",
+        ),
+    )
+    process_anonymous_upload(
+        job_id,
+        owner,
+        profile_years,
+        dataframe=parsed_upload(owner, job_id, upload_data, dataframe),
+    )
     _warm_recommendations(user, profile_years)
 
 
@@ -101,14 +125,16 @@ def _warm_recommendations(user, profile_years):
             )
 
 
-def process_anonymous_upload(job_id, owner, profile_years):
+def process_anonymous_upload(job_id, owner, profile_years, dataframe=None):
     try:
         update_processing_state(
             job_id,
             worker_started_at=timezone.now().isoformat(),
         )
         logger.info("Starting queued recap processing for job %s", job_id)
-        _, dataframe = load_upload(owner, job_id)
+        # Authenticated jobs pass in the parsed upload they already loaded
+        if dataframe is None:
+            _, dataframe = load_parsed_upload(owner, job_id)
         if dataframe is None:
             raise RuntimeError("Cached upload not found")
 
@@ -194,6 +220,8 @@ def process_profile_year(
             profile_year_df,
             profile_name,
             year,
+            executor=settings.RECAP_SECTION_EXECUTOR,
+            workers=settings.RECAP_SECTION_WORKERS,
         )
         graph_data["_partial"] = False
         graph_data["_full_ready_at"] = timezone.now().isoformat()
@@ -202,6 +230,8 @@ def process_profile_year(
                 dataframe,
                 profile_name,
                 year,
+                owner,
+                job_id,
             )
         )
         cache.set(
@@ -250,6 +280,8 @@ def process_initial_profile_year(
             profile_name,
             year,
             sections=INITIAL_RECAP_SECTIONS,
+            executor=settings.RECAP_SECTION_EXECUTOR,
+            workers=settings.RECAP_SECTION_WORKERS,
         )
         graph_data["_partial"] = True
         graph_data["_sections_ready"] = INITIAL_RECAP_SECTIONS
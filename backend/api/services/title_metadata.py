@@ -1,13 +1,15 @@
-import json
-import os
-import string
 from datetime import timedelta
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_save
 from django.utils import timezone
 
-from api.models import RecommendationSet, Title, ViewingEvent
+from api.models import RecommendationSet, Title, ViewingEvent, YearlyRecap
+from api.services.recap_cache import household_cache_key
+from utils.metadata_resolver import METADATA_RESOLVER, metadata_key
 
 
 TMDB_API_URL = "https://api.themoviedb.org/3"
@@ -15,24 +17,59 @@ SUCCESS_TTL_DAYS = 90
 MISS_TTL_DAYS = 7
 DEFAULT_MAX_TITLES = 50
 DEFAULT_MAX_CALLS = 100
+TITLE_METADATA_VERSION_KEY = "title-metadata-version"
+STORED_TITLE_FIELDS = [
+    "id",
+    "media_type",
+    "genres",
+    "origin_countries",
+    "original_language",
+    "rating",
+    "release_year",
+    "runtime_minutes",
+    "poster_url",
+    "popularity",
+    "metadata_source",
+    "metadata_confidence",
+]
 
 
-def metadata_key(value):
-    text = str(value or "").strip().lower()
-    text = text.translate(str.maketrans({char: " " for char in string.punctuation}))
-    return " ".join(text.split())
+def load_manual_overrides():
+    return METADATA_RESOLVER.snapshot().overrides
 
 
-def _override_path():
-    return os.path.join(settings.BASE_DIR, "utils", "title_metadata_overrides.json")
+def title_metadata_version():
+    return cache.get(TITLE_METADATA_VERSION_KEY, 0)
 
 
-def load_manual_overrides():
+def stored_title_metadata(title_ids):
+    return {
+        row["id"]: row
+        for row in Title.objects.filter(id__in=title_ids).values(*STORED_TITLE_FIELDS)
+    }
+
+
+def invalidate_title_metadata(sender=None, instance=None, created=False, **kwargs):
+    # New titles are never memoized yet; only enrichment updates need a new version
+    if created:
+        return
     try:
-        with open(_override_path(), "r", encoding="utf-8") as handle:
-            return json.load(handle)
-    except FileNotFoundError:
-        return {}
+        cache.incr(TITLE_METADATA_VERSION_KEY)
+    except ValueError:
+        cache.set(TITLE_METADATA_VERSION_KEY, 1, timeout=None)
+    METADATA_RESOLVER.invalidate()
+
+
+def register_metadata_resolver():
+    METADATA_RESOLVER.register_title_loader(
+        stored_title_metadata,
+        version_source=title_metadata_version,
+    )
+    post_save.connect(
+        invalidate_title_metadata,
+        sender=Title,
+        dispatch_uid="title-metadata-invalidation",
+    )
 
 
 def display_media_type(value):
@@ -272,10 +309,10 @@ def enrich_title_from_tmdb(title, client=None, min_confidence=0.75, max_calls=10
 
 
 def apply_manual_overrides(titles):
-    overrides = load_manual_overrides()
+    snapshot = METADATA_RESOLVER.snapshot()
     applied = 0
     for title in titles:
-        override = overrides.get(metadata_key(title.normalized_name)) or overrides.get(metadata_key(title.name))
+        override = snapshot.override_for(title.normalized_name, title.name)
         if not override:
             continue
         apply_metadata(title, override)
@@ -310,6 +347,7 @@ def enrich_titles(titles, watchtime_by_title=None, max_titles=DEFAULT_MAX_TITLES
 
     if matched_titles:
         invalidate_recommendations_for_titles(matched_titles)
+        invalidate_recaps_for_titles(matched_titles)
 
     return {"matched": matched, "tmdb_calls": client.calls, "tmdb_enabled": True}
 
@@ -334,3 +372,32 @@ def invalidate_recommendations_for_titles(titles):
         profile_id__in=profile_ids,
     ).delete()
     return deleted_count
+
+
+def invalidate_recaps_for_titles(titles):
+    # Saved recaps absorb new viewing into accumulators that keep the metadata
+    # of their time, so drop the ones that already counted these titles
+    title_ids = [title.id for title in titles]
+    if not title_ids:
+        return 0
+    recap_ids = (
+        YearlyRecap.objects.filter(
+            profile__viewing_events__title_id__in=title_ids,
+            profile__viewing_events__started_at__lte=F("latest_event_at"),
+        )
+        .values_list("id", flat=True)
+        .distinct()
+    )
+    deleted_count, _ = YearlyRecap.objects.filter(id__in=list(recap_ids)).delete()
+
+    watched = (
+        ViewingEvent.objects.filter(title_id__in=title_ids)
+        .values_list("profile__user_id", "started_at__year")
+        .distinct()
+    )
+    cache.delete_many([
+        household_cache_key(f"user:{user_id}", year)
+        for user_id, watched_year in watched
+        for year in (watched_year, "all")
+    ])
+    return deleted_count
@@ -0,0 +1,156 @@
+import io
+
+from django.conf import settings
+from django.db import connection
+
+from api.models import ViewingEvent
+
+
+LOADER_AUTO = "auto"
+LOADER_COPY = "copy"
+LOADER_BULK_CREATE = "bulk_create"
+LOADERS = (LOADER_AUTO, LOADER_COPY, LOADER_BULK_CREATE)
+COPY_BATCH_ROWS = 50_000
+STAGING_TABLE = "viewing_event_staging"
+
+# Attribute names in the order ingestion emits event rows. They double as the
+# COPY column list once mapped to database columns.
+VIEWING_EVENT_FIELDS = [
+    "id",
+    "upload_id",
+    "profile_id",
+    "title_id",
+    "title_raw",
+    "series_title",
+    "season_label",
+    "episode_title",
+    "episode_number",
+    "is_episode",
+    "parsed_media_type",
+    "classification_confidence",
+    "classification_source",
+    "started_at",
+    "duration_seconds",
+    "device_type",
+    "country",
+    "supplemental_video_type",
+    "row_hash",
+    "created_at",
+]
+
+
+def copy_supported():
+    return connection.vendor == "postgresql"
+
+
+def choose_loader(row_count, loader=LOADER_AUTO):
+    if loader not in LOADERS:
+        raise ValueError(f"Unknown viewing event loader: {loader}")
+    if not copy_supported():
+        return LOADER_BULK_CREATE
+    if loader == LOADER_AUTO:
+        threshold = getattr(settings, "VIEWING_EVENT_COPY_THRESHOLD", 5000)
+        return LOADER_COPY if row_count >= threshold else LOADER_BULK_CREATE
+    return loader
+
+
+def copy_text_value(value):
+    """Format one value for PostgreSQL's text COPY format."""
+    if value is None:
+        return r"\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_text_batches(rows, batch_rows=COPY_BATCH_ROWS):
+    """Buffers of COPY text for ``rows``, each with the number of rows in it."""
+    buffer = io.StringIO()
+    buffered = 0
+    for row in rows:
+        buffer.write("\t".join(copy_text_value(value) for value in row))
+        buffer.write("\n")
+        buffered += 1
+        if buffered >= batch_rows:
+            buffer.seek(0)
+            yield buffer, buffered
+            buffer = io.StringIO()
+            buffered = 0
+    if buffered:
+        buffer.seek(0)
+        yield buffer, buffered
+
+
+def viewing_event_columns():
+    columns = {field.attname: field.column for field in ViewingEvent._meta.concrete_fields}
+    return [columns[name] for name in VIEWING_EVENT_FIELDS]
+
+
+def copy_viewing_events(rows):
+    """
+    Stream event rows into a temporary staging table with COPY, then merge
+    them into the events table, skipping rows whose row_hash already exists.
+
+    Must run inside a transaction; the staging table is dropped on commit.
+    """
+    table = connection.ops.quote_name(ViewingEvent._meta.db_table)
+    staging = connection.ops.quote_name(STAGING_TABLE)
+    columns = ", ".join(connection.ops.quote_name(column) for column in viewing_event_columns())
+    row_hash = connection.ops.quote_name(ViewingEvent._meta.get_field("row_hash").column)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        staged = 0
+        for batch, batch_rows in copy_text_batches(rows):
+            cursor.cursor.copy_expert(
+                f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT text)",
+                batch,
+            )
+            staged += batch_rows
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) "
+            f"SELECT {columns} FROM {staging} "
+            f"ON CONFLICT ({row_hash}) DO NOTHING"
+        )
+        inserted = cursor.rowcount
+        cursor.execute(f"DROP TABLE {staging}")
+
+    return {"inserted": inserted, "skipped": staged - inserted}
+
+
+def bulk_create_viewing_events(rows, upload):
+    before = ViewingEvent.objects.filter(upload=upload).count()
+    events = [ViewingEvent(**dict(zip(VIEWING_EVENT_FIELDS, row))) for row in rows]
+    ViewingEvent.objects.bulk_create(events, ignore_conflicts=True)
+    inserted = ViewingEvent.objects.filter(upload=upload).count() - before
+    return {"inserted": inserted, "skipped": len(events) - inserted}
+
+
+def load_viewing_events(rows, upload, loader=LOADER_AUTO):
+    """
+    Persist event rows ordered as VIEWING_EVENT_FIELDS.
+
+    Large uploads on PostgreSQL go through COPY; smaller uploads and other
+    database backends use bulk_create. Returns inserted/skipped counts and the
+    loader that ran.
+    """
+    rows = rows if isinstance(rows, list) else list(rows)
+    selected = choose_loader(len(rows), loader)
+    if selected == LOADER_COPY:
+        result = copy_viewing_events(rows)
+    else:
+        result = bulk_create_viewing_events(rows, upload)
+    return {**result, "loader": selected}
@@ -1,15 +1,36 @@
 import hashlib
+import logging
 import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import pandas as pd
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Sum
 from django.utils import timezone
 
-from api.models import NetflixProfile, Title, Upload, ViewingEvent, YearlyRecap
+from api.models import NetflixProfile, Title, Upload, ViewingEvent
+from api.services.known_rows import known_row_mask, record_ingested_rows
 from api.services.title_metadata import enrich_titles_safely
-from utils.workflows import extractSupplementalContentTitle, parseNetflixTitleParts, splitSecondOccurence
+from api.services.viewing_event_loader import LOADER_AUTO, load_viewing_events
+from api.services.viewing_rollups import refresh_ingested_rollups
+from utils.workflows import (
+    TITLE_PARSE_CACHE,
+    TITLE_PART_COLUMNS,
+    cachedTitleParse,
+    durationSecondsColumn,
+    extractSupplementalContentTitle,
+    parseNetflixTitleParts,
+    parseViewingTimes,
+    preserveTitleParts,
+    splitSecondOccurence,
+    titlePartsMissing,
+)
+
 
+logger = logging.getLogger(__name__)
 
 SUPPLEMENTAL_VIDEO_TYPES = {
     "BUMPER",
@@ -21,9 +42,21 @@ SUPPLEMENTAL_VIDEO_TYPES = {
     "TRAILER",
 }
 SUPPLEMENTAL_TITLE_MARKER_PATTERN = re.compile(
-    r"(_hook(?:_|$)|_trailer(?:_|$)|_teaser(?:_|$)|_clip(?:_|$)|cinemagraph)",
+    r"(?:_hook(?:_|$)|_trailer(?:_|$)|_teaser(?:_|$)|_clip(?:_|$)|cinemagraph)",
     re.IGNORECASE,
 )
+PARSED_TITLE_COLUMNS = [
+    "Series Title",
+    "Season Label",
+    "Episode Title",
+    "Episode Number",
+    "Is Episode",
+    "Parsed Media Type",
+    "Classification Confidence",
+    "Classification Source",
+]
+TITLE_PARSE_CHUNKS_PER_WORKER = 4
+LOAD_STAT_FIELDS = ["events_inserted", "events_skipped", "known_rows_skipped", "event_loader"]
 
 
 def normalize_title(title):
@@ -60,6 +93,15 @@ def is_supplemental_row(title_raw, supplemental_video_type=""):
 
 
 def title_for_parsing(title_raw, supplemental_video_type=""):
+    return cachedTitleParse(
+        "parseable",
+        title_raw,
+        clean_string(supplemental_video_type),
+        lambda: _title_for_parsing(title_raw, supplemental_video_type),
+    )
+
+
+def _title_for_parsing(title_raw, supplemental_video_type=""):
     if is_supplemental_row(title_raw, supplemental_video_type):
         return extractSupplementalContentTitle(title_raw)
     return str(title_raw)
@@ -79,14 +121,245 @@ def build_row_hash(user_id, profile_name, started_at, title_raw, duration):
 
 
 def clean_title(title_raw, supplemental_video_type=""):
+    return cachedTitleParse(
+        "clean",
+        title_raw,
+        clean_string(supplemental_video_type),
+        lambda: _clean_title(title_raw, supplemental_video_type),
+    )
+
+
+def _clean_title(title_raw, supplemental_video_type=""):
     parseable_title = title_for_parsing(title_raw, supplemental_video_type)
     parsed_title = parseNetflixTitleParts(parseable_title)
     if parsed_title.get("Is Episode") and parsed_title.get("Series Title"):
         return parsed_title["Series Title"]
     if is_supplemental_row(title_raw, supplemental_video_type):
         return parseable_title.strip()
-    cleaned_title = splitSecondOccurence(str(title_raw)).strip() or str(title_raw).strip()
-    return cleaned_title
+    return _cleaned_title_fallback(title_raw)
+
+
+def _cleaned_title_fallback(title_raw):
+    return splitSecondOccurence(str(title_raw)).strip() or str(title_raw).strip()
+
+
+def supplemental_row_mask(dataframe):
+    """Vectorized ``is_supplemental_row`` over a viewing dataframe."""
+    titles = dataframe["Title"].fillna("").astype(str)
+    mask = titles.str.contains(SUPPLEMENTAL_TITLE_MARKER_PATTERN, regex=True)
+    if "Supplemental Video Type" in dataframe.columns:
+        video_types = (
+            dataframe["Supplemental Video Type"]
+            .fillna("")
+            .astype(str)
+            .str.strip()
+            .str.upper()
+        )
+        mask |= video_types.isin(SUPPLEMENTAL_VIDEO_TYPES)
+    return mask.to_numpy(dtype=bool)
+
+
+def duration_seconds_column(durations):
+    """Vectorized ``duration_to_seconds``; malformed durations count as zero."""
+    return durationSecondsColumn(durations).to_numpy()
+
+
+def localize_start_times(started_at):
+    if started_at.dt.tz is not None:
+        return started_at
+    return started_at.dt.tz_localize(
+        timezone.get_current_timezone(),
+        ambiguous=True,
+        nonexistent="shift_forward",
+    )
+
+
+def string_column(dataframe, column):
+    """Vectorized ``clean_string`` for an optional dataframe column."""
+    if column not in dataframe.columns:
+        return np.full(len(dataframe), "", dtype=object)
+    values = dataframe[column]
+    return values.where(values.notna(), "").astype(str).to_numpy(dtype=object)
+
+
+def build_row_hashes(user_id, profile_names, started_at, titles_raw, durations):
+    """Batched ``build_row_hash`` over aligned column arrays."""
+    owner = str(user_id)
+    sha256 = hashlib.sha256
+    return [
+        sha256(
+            f"{owner}|{profile_name}|{started.isoformat()}|{title_raw}|{duration}".encode("utf-8")
+        ).hexdigest()
+        for profile_name, started, title_raw, duration in zip(
+            profile_names,
+            started_at,
+            titles_raw,
+            durations,
+        )
+    ]
+
+
+def parse_title_rows(titles):
+    parsed_rows = []
+    for title_raw in titles:
+        parsed_title = parseNetflixTitleParts(title_raw)
+        if parsed_title.get("Is Episode") and parsed_title.get("Series Title"):
+            cleaned_title = parsed_title["Series Title"]
+        else:
+            cleaned_title = _cleaned_title_fallback(title_raw)
+        parsed_rows.append({**parsed_title, "clean_title": cleaned_title})
+    return parsed_rows
+
+
+def parse_title_rows_parallel(titles, workers):
+    """Fan ``parse_title_rows`` out over a process pool, preserving order."""
+    chunk_size = max(1, -(-len(titles) // (workers * TITLE_PARSE_CHUNKS_PER_WORKER)))
+    chunks = [titles[start:start + chunk_size] for start in range(0, len(titles), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [
+            parsed_row
+            for parsed_rows in executor.map(parse_title_rows, chunks)
+            for parsed_row in parsed_rows
+        ]
+
+
+def distinct_title_parts(dataframe):
+    """
+    ``parse_distinct_titles`` for a parsed upload that already carries title
+    part columns, so titles are not parsed again.
+    """
+    codes, distinct_titles = pd.factorize(dataframe["Title"].astype(str).to_numpy(dtype=object))
+    _, first_rows = np.unique(codes, return_index=True)
+    parsed_titles = (
+        dataframe[PARSED_TITLE_COLUMNS]
+        .iloc[first_rows]
+        .reset_index(drop=True)
+    )
+    parsed_titles["clean_title"] = [
+        series_title if bool(is_episode) and series_title else _cleaned_title_fallback(title_raw)
+        for title_raw, is_episode, series_title in zip(
+            distinct_titles,
+            parsed_titles["Is Episode"],
+            parsed_titles["Series Title"],
+        )
+    ]
+    parsed_titles["normalized_title"] = parsed_titles["clean_title"].map(normalize_title)
+    return codes, parsed_titles
+
+
+def parse_distinct_titles(titles, workers=None):
+    """
+    Parse each distinct raw title once.
+
+    Returns factorized codes for ``titles`` plus a frame with one parsed row
+    per distinct title, so callers can gather columns with ``frame[col][codes]``.
+    With more than one worker, large batches are parsed in a process pool.
+    """
+    TITLE_PARSE_CACHE.refreshIfStale()
+    codes, distinct_titles = pd.factorize(np.asarray(titles, dtype=object))
+    distinct_titles = list(distinct_titles)
+    if workers is None:
+        workers = getattr(settings, "TITLE_PARSE_WORKERS", 1)
+    min_titles = getattr(settings, "TITLE_PARSE_PARALLEL_MIN_TITLES", 20000)
+    if workers > 1 and len(distinct_titles) >= min_titles:
+        parsed_rows = parse_title_rows_parallel(distinct_titles, workers)
+    else:
+        parsed_rows = parse_title_rows(distinct_titles)
+
+    parsed_titles = pd.DataFrame(parsed_rows, columns=["Raw Title", *PARSED_TITLE_COLUMNS, "clean_title"])
+    parsed_titles["normalized_title"] = parsed_titles["clean_title"].map(normalize_title)
+    return codes, parsed_titles
+
+
+def title_parts_frame(titles):
+    """
+    Title part columns for a Series of titles, in the shape
+    ``parseDistinctTitleParts`` returns, parsed by ``parse_distinct_titles``
+    so a large upload can use the process pool.
+    """
+    codes, parsed_titles = parse_distinct_titles(titles.astype(str).to_numpy(dtype=object))
+    title_parts = parsed_titles[TITLE_PART_COLUMNS].iloc[codes]
+    title_parts.index = titles.index
+    return title_parts
+
+
+def with_pending_title_parts(rows, existing_profiles, start=0):
+    """
+    ``rows`` with title part columns for every row from ``start`` on that is
+    not stored yet, parsing their distinct titles in one batch. Chunks
+    ingested afterwards then never parse titles inside their transaction.
+    """
+    dataframe = rows["dataframe"]
+    pending = np.zeros(len(dataframe), dtype=bool)
+    pending[start:] = ~known_row_mask(
+        existing_profiles,
+        rows["profile_names"][start:],
+        rows["started_at"][start:],
+        rows["row_hashes"][start:],
+    )
+    if not titlePartsMissing(dataframe[pending]).any():
+        return rows
+
+    present = [column for column in TITLE_PART_COLUMNS if column in dataframe.columns]
+    title_parts = preserveTitleParts(
+        dataframe[pending][["Title", *present]].reset_index(drop=True),
+        title_parts_frame,
+    )
+    columns = {}
+    for column in TITLE_PART_COLUMNS:
+        values = np.full(len(dataframe), None, dtype=object)
+        values[pending] = title_parts[column].to_numpy(dtype=object)
+        columns[column] = values
+    return {**rows, "dataframe": dataframe.assign(**columns)}
+
+
+def hashed_viewing_rows(owner_id, dataframe):
+    """
+    Drop unusable and supplemental rows and compute row hashes, without
+    parsing any titles. Columns come back as aligned object arrays.
+    """
+    parsed_df = parseViewingTimes(dataframe)
+    parsed_df = parsed_df.dropna(subset=["parsed_start_time", "Profile Name", "Title"])
+    parsed_df = parsed_df[~supplemental_row_mask(parsed_df)]
+
+    profile_names = parsed_df["Profile Name"].astype(str).to_numpy(dtype=object)
+    titles = parsed_df["Title"].astype(str).to_numpy(dtype=object)
+    started_at = np.empty(len(parsed_df), dtype=object)
+    started_at[:] = localize_start_times(parsed_df["parsed_start_time"]).tolist()
+    row_hashes = build_row_hashes(
+        owner_id,
+        profile_names,
+        started_at,
+        titles,
+        parsed_df["Duration"].astype(str).to_numpy(dtype=object),
+    )
+    return {
+        "dataframe": parsed_df,
+        "profile_names": profile_names,
+        "titles": titles,
+        "started_at": started_at,
+        "row_hashes": np.array(row_hashes, dtype=object),
+    }
+
+
+def count_known_rows(user, dataframe):
+    """Rows of an upload that are already stored for ``user``."""
+    rows = hashed_viewing_rows(user.id, dataframe)
+    profiles = {
+        profile.name: profile
+        for profile in NetflixProfile.objects.filter(
+            user=user,
+            name__in=set(rows["profile_names"]),
+        )
+    }
+    return int(
+        known_row_mask(
+            profiles,
+            rows["profile_names"],
+            rows["started_at"],
+            rows["row_hashes"],
+        ).sum()
+    )
 
 
 def get_or_create_title(title_raw, supplemental_video_type=""):
@@ -101,149 +374,363 @@ def get_or_create_title(title_raw, supplemental_video_type=""):
     return title
 
 
+def ensure_profiles(user, profile_names):
+    existing_profiles = {
+        profile.name: profile
+        for profile in NetflixProfile.objects.filter(user=user, name__in=list(profile_names))
+    }
+    missing_profiles = [
+        NetflixProfile(user=user, name=name)
+        for name in sorted(profile_names)
+        if name not in existing_profiles
+    ]
+    if missing_profiles:
+        NetflixProfile.objects.bulk_create(missing_profiles, ignore_conflicts=True)
+        existing_profiles = {
+            profile.name: profile
+            for profile in NetflixProfile.objects.filter(user=user, name__in=list(profile_names))
+        }
+    return existing_profiles
+
+
+def slice_viewing_rows(rows, start, stop):
+    return {
+        "dataframe": rows["dataframe"].iloc[start:stop],
+        **{
+            key: values[start:stop]
+            for key, values in rows.items()
+            if key != "dataframe"
+        },
+    }
+
+
+def ingest_viewing_rows(upload, rows, existing_profiles, loader=LOADER_AUTO):
+    """
+    Persist hashed viewing rows for ``upload``.
+
+    Rows already stored for their profile are dropped before title parsing,
+    and the rollups of every date the new rows touch are rebuilt. Returns a
+    summary with load counts, watchtime per title id and the titles touched,
+    so callers can merge results across chunks.
+    """
+    known = known_row_mask(
+        existing_profiles,
+        rows["profile_names"],
+        rows["started_at"],
+        rows["row_hashes"],
+    )
+    keep = ~known
+    parsed_df = rows["dataframe"][keep]
+    profile_codes, profile_names = pd.factorize(rows["profile_names"][keep])
+    started_at = rows["started_at"][keep].tolist()
+    row_hashes = rows["row_hashes"][keep].tolist()
+
+    # Rows left here are never supplemental, so the parseable title is the raw title.
+    if len(parsed_df) and not titlePartsMissing(parsed_df).any():
+        title_codes, parsed_titles = distinct_title_parts(parsed_df)
+    else:
+        title_codes, parsed_titles = parse_distinct_titles(rows["titles"][keep])
+
+    title_names = (
+        parsed_titles[["clean_title", "normalized_title"]]
+        .drop_duplicates("normalized_title")
+        .to_dict("records")
+    )
+    normalized_names = [row["normalized_title"] for row in title_names]
+    existing_titles = {
+        title.normalized_name: title
+        for title in Title.objects.filter(normalized_name__in=normalized_names)
+    }
+    missing_titles = [
+        Title(name=row["clean_title"], normalized_name=row["normalized_title"])
+        for row in title_names
+        if row["normalized_title"] not in existing_titles
+    ]
+    if missing_titles:
+        Title.objects.bulk_create(missing_titles, ignore_conflicts=True)
+        existing_titles = {
+            title.normalized_name: title
+            for title in Title.objects.filter(normalized_name__in=normalized_names)
+        }
+
+    profile_objects = np.array(
+        [existing_profiles[name] for name in profile_names],
+        dtype=object,
+    )[profile_codes]
+    title_objects = np.array(
+        [existing_titles[name] for name in parsed_titles["normalized_title"]],
+        dtype=object,
+    )[title_codes]
+
+    durations = parsed_df["Duration"]
+    if "Duration Seconds" in parsed_df.columns:
+        duration_seconds = parsed_df["Duration Seconds"].to_numpy(dtype=np.int64)
+    else:
+        duration_seconds = duration_seconds_column(durations)
+
+    watchtime_by_title = {}
+    for title, seconds in zip(title_objects, duration_seconds.tolist()):
+        title_id = str(title.id)
+        watchtime_by_title[title_id] = watchtime_by_title.get(title_id, 0) + seconds
+
+    parsed_columns = {
+        column: parsed_titles[column].to_numpy(dtype=object)[title_codes]
+        for column in PARSED_TITLE_COLUMNS
+    }
+    created_at = timezone.now()
+    event_rows = [
+        (
+            uuid.uuid4(),
+            upload.id,
+            profile.id,
+            title.id,
+            title_raw,
+            clean_string(series_title),
+            clean_string(season_label),
+            clean_string(episode_title),
+            None if pd.isna(episode_number) else int(episode_number),
+            bool(is_episode),
+            clean_string(parsed_media_type),
+            0 if pd.isna(confidence) else float(confidence),
+            clean_string(classification_source),
+            started,
+            seconds,
+            device_type,
+            country,
+            supplemental_video_type,
+            row_hash,
+            created_at,
+        )
+        for (
+            profile,
+            title,
+            title_raw,
+            series_title,
+            season_label,
+            episode_title,
+            episode_number,
+            is_episode,
+            parsed_media_type,
+            confidence,
+            classification_source,
+            started,
+            seconds,
+            device_type,
+            country,
+            supplemental_video_type,
+            row_hash,
+        ) in zip(
+            profile_objects,
+            title_objects,
+            string_column(parsed_df, "Title"),
+            parsed_columns["Series Title"],
+            parsed_columns["Season Label"],
+            parsed_columns["Episode Title"],
+            parsed_columns["Episode Number"],
+            parsed_columns["Is Episode"],
+            parsed_columns["Parsed Media Type"],
+            parsed_columns["Classification Confidence"],
+            parsed_columns["Classification Source"],
+            started_at,
+            duration_seconds.tolist(),
+            string_column(parsed_df, "Device Type"),
+            string_column(parsed_df, "Country"),
+            string_column(parsed_df, "Supplemental Video Type"),
+            row_hashes,
+        )
+    ]
+
+    event_load = load_viewing_events(event_rows, upload, loader=loader)
+    refresh_ingested_rollups(profile_objects, started_at)
+    record_ingested_rows(
+        existing_profiles,
+        profile_names[profile_codes],
+        started_at,
+        row_hashes,
+    )
+    return {
+        **event_load,
+        "known_rows_skipped": int(known.sum()),
+        "watchtime_by_title": watchtime_by_title,
+        "titles": existing_titles,
+    }
+
+
+def committed_titles(upload):
+    """
+    Titles and watchtime per title id of the events ``upload`` has already
+    committed, so a resumed ingestion enriches titles from every chunk.
+    """
+    watchtime_by_title = {
+        str(title_id): seconds
+        for title_id, seconds in (
+            ViewingEvent.objects.filter(upload=upload)
+            .order_by()
+            .values_list("title_id")
+            .annotate(Sum("duration_seconds"))
+        )
+    }
+    titles = {
+        title.normalized_name: title
+        for title in Title.objects.filter(id__in=list(watchtime_by_title))
+    }
+    return titles, watchtime_by_title
+
+
+def record_event_load(upload, result):
+    upload.events_inserted += result["inserted"]
+    upload.events_skipped += result["skipped"]
+    upload.known_rows_skipped += result["known_rows_skipped"]
+    upload.event_loader = result["loader"]
+
+
+def finish_ingestion(upload, titles_for_enrichment, watchtime_by_title):
+    transaction.on_commit(
+        lambda: enrich_titles_safely(
+            titles_for_enrichment,
+            watchtime_by_title=watchtime_by_title,
+            max_titles=getattr(settings, "TMDB_ENRICHMENT_MAX_TITLES", 50),
+            max_calls=getattr(settings, "TMDB_ENRICHMENT_MAX_CALLS", 100),
+        )
+    )
+    upload.status = Upload.Status.COMPLETED
+    upload.completed_at = timezone.now()
+    upload.save(update_fields=["status", "completed_at", "rows_total", "rows_committed", *LOAD_STAT_FIELDS])
+
+
+def log_event_load(upload):
+    logger.info(
+        "Loaded viewing events for upload %s with %s: %s inserted, %s skipped, %s already known",
+        upload.id,
+        upload.event_loader,
+        upload.events_inserted,
+        upload.events_skipped,
+        upload.known_rows_skipped,
+    )
+
+
+def mark_upload_failed(upload, exc):
+    upload.status = Upload.Status.FAILED
+    upload.error_message = str(exc)
+    upload.save(update_fields=["status", "error_message"])
+
+
 @transaction.atomic
-def ingest_viewing_dataframe(user, dataframe, source_filename=""):
+def ingest_viewing_dataframe(user, dataframe, source_filename="", loader=LOADER_AUTO, fingerprint=""):
     if user is None:
         raise ValueError("Normalized viewing ingestion requires an authenticated user")
 
     upload = Upload.objects.create(
         user=user,
         source_filename=source_filename or "",
+        fingerprint=fingerprint or "",
         status=Upload.Status.PROCESSING,
         is_anonymous=user is None,
     )
 
     try:
-        events_to_create = []
-        parsed_df = dataframe.copy()
-        parsed_df["parsed_start_time"] = pd.to_datetime(parsed_df["Start Time"], errors="coerce")
-        parsed_df = parsed_df.dropna(subset=["parsed_start_time", "Profile Name", "Title"])
-        if "Supplemental Video Type" in parsed_df.columns:
-            parsed_df = parsed_df[
-                ~parsed_df.apply(
-                    lambda row: is_supplemental_row(row["Title"], row.get("Supplemental Video Type")),
-                    axis=1,
-                )
-            ]
-        else:
-            parsed_df = parsed_df[
-                ~parsed_df["Title"].apply(has_supplemental_title_marker)
-            ]
-        parsed_df["clean_profile_name"] = parsed_df["Profile Name"].apply(clean_string)
-        parsed_df["title_for_parsing"] = parsed_df.apply(
-            lambda row: title_for_parsing(row["Title"], row.get("Supplemental Video Type")),
-            axis=1,
+        rows = hashed_viewing_rows(user.id, dataframe)
+        existing_profiles = ensure_profiles(user, pd.unique(rows["profile_names"]))
+        result = ingest_viewing_rows(upload, rows, existing_profiles, loader=loader)
+
+        record_event_load(upload, result)
+        upload.rows_total = upload.rows_committed = len(rows["row_hashes"])
+        log_event_load(upload)
+        finish_ingestion(
+            upload,
+            list(result["titles"].values()),
+            result["watchtime_by_title"],
         )
-        title_parts = parsed_df["title_for_parsing"].apply(parseNetflixTitleParts).apply(pd.Series)
-        for column in title_parts.columns:
-            parsed_df[column] = title_parts[column]
-        parsed_df["clean_title"] = parsed_df.apply(
-            lambda row: clean_title(row["Title"], row.get("Supplemental Video Type")),
-            axis=1,
-        )
-        parsed_df["normalized_title"] = parsed_df["clean_title"].apply(normalize_title)
+        return upload
+    except Exception as exc:
+        mark_upload_failed(upload, exc)
+        raise
 
-        profile_names = sorted(parsed_df["clean_profile_name"].unique())
-        existing_profiles = {
-            profile.name: profile
-            for profile in NetflixProfile.objects.filter(user=user, name__in=profile_names)
-        }
-        missing_profiles = [
-            NetflixProfile(user=user, name=name)
-            for name in profile_names
-            if name not in existing_profiles
-        ]
-        if missing_profiles:
-            NetflixProfile.objects.bulk_create(missing_profiles, ignore_conflicts=True)
-            existing_profiles = {
-                profile.name: profile
-                for profile in NetflixProfile.objects.filter(user=user, name__in=profile_names)
-            }
-
-        title_names = (
-            parsed_df[["clean_title", "normalized_title"]]
-            .drop_duplicates("normalized_title")
-            .to_dict("records")
+
+def ingest_viewing_dataframe_chunked(
+    user,
+    dataframe,
+    source_filename="",
+    job_id="",
+    fingerprint="",
+    chunk_rows=None,
+    loader=LOADER_AUTO,
+    progress=None,
+):
+    """
+    Ingest in bounded transactions, one per chunk of rows.
+
+    Each chunk commits its events together with the ``Upload.rows_committed``
+    checkpoint and load counts, so a retried job with the same ``job_id``
+    resumes after the last committed chunk. ``progress`` is called with the
+    upload after every commit.
+    """
+    if user is None:
+        raise ValueError("Normalized viewing ingestion requires an authenticated user")
+    chunk_rows = chunk_rows or getattr(settings, "VIEWING_INGEST_CHUNK_ROWS", 10_000)
+
+    upload = None
+    if job_id:
+        upload = Upload.objects.filter(user=user, job_id=job_id).order_by("-uploaded_at").first()
+        if upload and upload.status == Upload.Status.COMPLETED:
+            return upload
+    if upload is None:
+        upload = Upload.objects.create(
+            user=user,
+            source_filename=source_filename or "",
+            fingerprint=fingerprint or "",
+            job_id=job_id or "",
+            status=Upload.Status.PROCESSING,
+            is_anonymous=user is None,
+        )
+    elif upload.rows_committed:
+        logger.info(
+            "Resuming ingestion for upload %s at row %s of %s",
+            upload.id,
+            upload.rows_committed,
+            upload.rows_total,
         )
-        normalized_names = [row["normalized_title"] for row in title_names]
-        existing_titles = {
-            title.normalized_name: title
-            for title in Title.objects.filter(normalized_name__in=normalized_names)
-        }
-        missing_titles = [
-            Title(name=row["clean_title"], normalized_name=row["normalized_title"])
-            for row in title_names
-            if row["normalized_title"] not in existing_titles
-        ]
-        if missing_titles:
-            Title.objects.bulk_create(missing_titles, ignore_conflicts=True)
-            existing_titles = {
-                title.normalized_name: title
-                for title in Title.objects.filter(normalized_name__in=normalized_names)
-            }
-
-        watchtime_by_title = {}
-        for _, row in parsed_df.iterrows():
-            title = existing_titles[row["normalized_title"]]
-            watchtime_by_title[str(title.id)] = watchtime_by_title.get(str(title.id), 0) + duration_to_seconds(row["Duration"])
-
-        titles_for_enrichment = list(existing_titles.values())
-
-        for _, row in parsed_df.iterrows():
-            profile = existing_profiles[row["clean_profile_name"]]
-            title = existing_titles[row["normalized_title"]]
-            started_at = row["parsed_start_time"]
-            if timezone.is_naive(started_at):
-                started_at = timezone.make_aware(started_at, timezone.get_current_timezone())
-
-            duration_seconds = duration_to_seconds(row["Duration"])
-            row_hash = build_row_hash(
-                user.id if user else upload.id,
-                profile.name,
-                started_at,
-                row["Title"],
-                row["Duration"],
-            )
 
-            events_to_create.append(
-                ViewingEvent(
-                    upload=upload,
-                    profile=profile,
-                    title=title,
-                    title_raw=clean_string(row["Title"]),
-                    series_title=clean_string(row.get("Series Title")),
-                    season_label=clean_string(row.get("Season Label")),
-                    episode_title=clean_string(row.get("Episode Title")),
-                    episode_number=None if pd.isna(row.get("Episode Number")) else int(row.get("Episode Number")),
-                    is_episode=bool(row.get("Is Episode")),
-                    parsed_media_type=clean_string(row.get("Parsed Media Type")),
-                    classification_confidence=0 if pd.isna(row.get("Classification Confidence")) else float(row.get("Classification Confidence")),
-                    classification_source=clean_string(row.get("Classification Source")),
-                    started_at=started_at,
-                    duration_seconds=duration_seconds,
-                    device_type=clean_string(row.get("Device Type")),
-                    country=clean_string(row.get("Country")),
-                    supplemental_video_type=clean_string(row.get("Supplemental Video Type")),
-                    row_hash=row_hash,
+    try:
+        rows = hashed_viewing_rows(user.id, dataframe)
+        with transaction.atomic():
+            existing_profiles = ensure_profiles(user, pd.unique(rows["profile_names"]))
+            upload.status = Upload.Status.PROCESSING
+            upload.error_message = ""
+            upload.rows_total = len(rows["row_hashes"])
+            upload.save(update_fields=["status", "error_message", "rows_total"])
+        rows = with_pending_title_parts(rows, existing_profiles, upload.rows_committed)
+
+        titles_for_enrichment, watchtime_by_title = (
+            committed_titles(upload) if upload.rows_committed else ({}, {})
+        )
+        for start in range(upload.rows_committed, upload.rows_total, chunk_rows):
+            stop = min(start + chunk_rows, upload.rows_total)
+            with transaction.atomic():
+                result = ingest_viewing_rows(
+                    upload,
+                    slice_viewing_rows(rows, start, stop),
+                    existing_profiles,
+                    loader=loader,
                 )
+                record_event_load(upload, result)
+                upload.rows_committed = stop
+                upload.save(update_fields=["rows_committed", *LOAD_STAT_FIELDS])
+
+            titles_for_enrichment.update(result["titles"])
+            for title_id, seconds in result["watchtime_by_title"].items():
+                watchtime_by_title[title_id] = watchtime_by_title.get(title_id, 0) + seconds
+            if progress:
+                progress(upload)
+
+        log_event_load(upload)
+        with transaction.atomic():
+            finish_ingestion(
+                upload,
+                list(titles_for_enrichment.values()),
+                watchtime_by_title,
             )
-
-        ViewingEvent.objects.bulk_create(events_to_create, ignore_conflicts=True)
-        YearlyRecap.objects.filter(user=user).delete()
-        transaction.on_commit(
-            lambda: enrich_titles_safely(
-                titles_for_enrichment,
-                watchtime_by_title=watchtime_by_title,
-                max_titles=getattr(settings, "TMDB_ENRICHMENT_MAX_TITLES", 50),
-                max_calls=getattr(settings, "TMDB_ENRICHMENT_MAX_CALLS", 100),
-            )
-        )
-        upload.status = Upload.Status.COMPLETED
-        upload.completed_at = timezone.now()
-        upload.save(update_fields=["status", "completed_at"])
         return upload
     except Exception as exc:
-        upload.status = Upload.Status.FAILED
-        upload.error_message = str(exc)
-        upload.save(update_fields=["status", "error_message"])
+        mark_upload_failed(upload, exc)
         raise
@@ -0,0 +1,127 @@
+import pandas as pd
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from api.models import NetflixProfile, ViewingEvent, ViewingRollup
+
+
+# Same thresholds as the short and likely-finished counts of core stats
+SHORT_WATCH_SECONDS = 5 * 60
+FINISHED_WATCH_SECONDS = 20 * 60
+ROLLUP_DATE_BATCH = 500
+ROLLUP_CREATE_BATCH = 5_000
+
+# Event fields every rollup row carries; all follow from the raw title
+ROLLUP_TITLE_FIELDS = [
+    "title_id",
+    "title_raw",
+    "series_title",
+    "season_label",
+    "episode_title",
+    "episode_number",
+    "is_episode",
+    "parsed_media_type",
+    "classification_source",
+]
+
+
+def watchable_events(events):
+    # Recaps drop rows with any supplemental video type
+    return events.filter(supplemental_video_type="")
+
+
+def rollup_dates(started_at):
+    """Local calendar dates of aware start times, as rollups bucket them."""
+    started_at = pd.Series(pd.to_datetime(list(started_at), utc=True))
+    return set(started_at.dt.tz_convert(timezone.get_current_timezone()).dt.date)
+
+
+def rollups_from_events(profile_id, events):
+    buckets = (
+        watchable_events(events)
+        .annotate(bucket_date=TruncDate("started_at"), bucket_hour=ExtractHour("started_at"))
+        .values("bucket_date", "bucket_hour", *ROLLUP_TITLE_FIELDS)
+        .annotate(
+            confidence=Max("classification_confidence"),
+            total_seconds=Sum("duration_seconds"),
+            events=Count("id"),
+            short_events=Count("id", filter=Q(duration_seconds__lt=SHORT_WATCH_SECONDS)),
+            finished_events=Count("id", filter=Q(duration_seconds__gte=FINISHED_WATCH_SECONDS)),
+            longest=Max("duration_seconds"),
+            first_started=Min("started_at"),
+            last_started=Max("started_at"),
+        )
+        .order_by()
+    )
+    return [
+        ViewingRollup(
+            profile_id=profile_id,
+            date=bucket["bucket_date"],
+            hour=bucket["bucket_hour"],
+            **{field: bucket[field] for field in ROLLUP_TITLE_FIELDS},
+            classification_confidence=bucket["confidence"] or 0,
+            watch_seconds=bucket["total_seconds"] or 0,
+            event_count=bucket["events"],
+            short_count=bucket["short_events"],
+            finished_count=bucket["finished_events"],
+            longest_seconds=bucket["longest"] or 0,
+            first_started_at=bucket["first_started"],
+            last_started_at=bucket["last_started"],
+        )
+        for bucket in buckets
+    ]
+
+
+def rebuild_viewing_rollups(profile_id, dates):
+    """
+    Replace the profile's rollup rows on ``dates`` with fresh aggregates of
+    its stored events, so rebuilding a date twice is harmless.
+
+    Runs atomically with the profile row locked, so concurrent rebuilds of
+    the same profile, e.g. two recap requests backfilling it, take turns
+    instead of both inserting.
+    """
+    dates = sorted(set(dates))
+    with transaction.atomic():
+        NetflixProfile.objects.select_for_update().filter(id=profile_id).first()
+        for start in range(0, len(dates), ROLLUP_DATE_BATCH):
+            batch = dates[start:start + ROLLUP_DATE_BATCH]
+            ViewingRollup.objects.filter(profile_id=profile_id, date__in=batch).delete()
+            ViewingRollup.objects.bulk_create(
+                rollups_from_events(
+                    profile_id,
+                    ViewingEvent.objects.filter(profile_id=profile_id, started_at__date__in=batch),
+                ),
+                batch_size=ROLLUP_CREATE_BATCH,
+            )
+
+
+def refresh_ingested_rollups(profiles, started_at):
+    """Rebuild the rollup dates touched by freshly loaded events, per profile."""
+    dates_by_profile = {}
+    for profile, started in zip(profiles, started_at):
+        dates_by_profile.setdefault(profile.id, []).append(started)
+    for profile_id, profile_started_at in dates_by_profile.items():
+        rebuild_viewing_rollups(profile_id, rollup_dates(profile_started_at))
+
+
+def ensure_viewing_rollups(events, rollups):
+    """
+    Backfill rollups for profiles whose rows in ``rollups`` don't account for
+    every watchable event in ``events``, e.g. history stored before rollups
+    existed. Both querysets must cover the same profiles and period.
+    """
+    event_counts = dict(
+        watchable_events(events).order_by().values_list("profile_id").annotate(Count("id"))
+    )
+    rollup_counts = dict(
+        rollups.order_by().values_list("profile_id").annotate(Sum("event_count"))
+    )
+    for profile_id, event_count in event_counts.items():
+        if rollup_counts.get(profile_id) != event_count:
+            rebuild_viewing_rollups(
+                profile_id,
+                events.filter(profile_id=profile_id).dates("started_at", "day"),
+            )
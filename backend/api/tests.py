@@ -1,18 +1,30 @@
 from datetime import timedelta
+import hashlib
+import io
+import json
+import os
+import tempfile
 import unittest
+import uuid
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.core import mail
 from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import resolve
 from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from rest_framework.test import APIClient
 
+from .management.commands._synthetic_history import synthetic_viewing_history
 from .models import (
     ExternalCatalogTitle,
     NetflixProfile,
@@ -21,11 +33,25 @@ from .models import (
     Title,
     Upload,
     ViewingEvent,
+    ViewingRollup,
+    YearlyRecap,
+)
+from .services.recap_data import (
+    accumulator_from_rollups,
+    composed_accumulator,
+    event_rows,
+    profile_comparisons,
+    profile_comparisons_from_dataframe,
+    profile_events,
+    saved_or_generated_recap,
+    year_recaps,
 )
 from .services.recommendations import generate_recommendations
 from .services.recap_cache import (
     create_processing_state,
     get_processing_state,
+    load_parsed_upload,
+    load_upload_data,
     owner_key,
     ready_profile_years,
     result_cache_key,
@@ -34,6 +60,7 @@ from .services.recap_cache import (
 )
 from .services.recap_jobs import (
     process_anonymous_upload,
+    process_authenticated_upload,
     process_initial_profile_year,
 )
 from .views.recap_views import (
@@ -45,14 +72,75 @@ from .views.recap_views import (
     YearComparisonView,
 )
 from .views.recommendation_views import RecommendationFeedbackView
-from .services.viewing_ingestion import clean_title, ingest_viewing_dataframe
+from .services.viewing_event_loader import (
+    LOADER_COPY,
+    VIEWING_EVENT_FIELDS,
+    copy_text_value,
+    load_viewing_events,
+)
+from .utils import EXPECTED_COLUMNS, read_csv_header, read_viewing_history
+from .services.viewing_ingestion import (
+    build_row_hash,
+    clean_title,
+    count_known_rows,
+    duration_seconds_column,
+    duration_to_seconds,
+    ingest_viewing_dataframe,
+    ingest_viewing_dataframe_chunked,
+    parse_distinct_titles,
+)
 from .services.title_metadata import apply_manual_overrides
-from utils.data_analysis import enrichWithTitleMetadata, getGenreContentInsightsData
+import utils.data_analysis as data_analysis
+from utils.data_analysis import (
+    enrichWithTitleMetadata,
+    getAccumulatedGraphData,
+    getGenreContentInsightsData,
+    getJsonGraphData,
+    getRecapAccumulator,
+)
+import utils.workflows as workflows
+from utils.metadata_resolver import METADATA_RESOLVER, MetadataResolver
+from utils.recap_accumulator import RecapAccumulator
+from utils.recap_cube import RecapCube
+from utils.recap_payload import (
+    DEFAULT_RECAP_SECTIONS,
+    HEAVY_RECAP_SECTIONS,
+    INITIAL_RECAP_SECTIONS,
+    build_recap_payload,
+    heavy_sections,
+)
+from utils.workflows import TitleCatalog, TitleParseCache, parseUploadFrame
 
 
 User = get_user_model()
 
 
+def create_test_user(email):
+    return User.objects.create_user(
+        email=email,
+        password="Password123!",
+        firstName=email.split("@")[0].title(),
+        lastName="User",
+    )
+
+
+def viewing_frame(rows, profile_name="Main", **columns):
+    """Upload rows for ``profile_name`` from ``(start time, duration, title)`` tuples."""
+    return pd.DataFrame(
+        [
+            {
+                "Profile Name": profile_name,
+                "Start Time": start_time,
+                "Duration": duration,
+                "Title": title,
+                "Supplemental Video Type": None,
+                **columns,
+            }
+            for start_time, duration, title in rows
+        ]
+    )
+
+
 @override_settings(
     EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
     FRONTEND_URL="http://localhost:3000",
@@ -516,6 +604,128 @@ class RecapQueueTests(TestCase):
         self.assertIn("profile_comparisons", full_result)
 
 
+class ViewingHistoryUploadParsingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def csv_file(self, rows, bom=False):
+        dataframe = pd.DataFrame(rows, columns=EXPECTED_COLUMNS)
+        content = dataframe.to_csv(index=False)
+        return io.BytesIO((("\ufeff" if bom else "") + content).encode("utf-8"))
+
+    def csv_upload(self, rows):
+        return SimpleUploadedFile("ViewingActivity.csv", self.csv_file(rows).getvalue(), content_type="text/csv")
+
+    def row(self, profile, start_time, title, duration="00:30:00"):
+        return {
+            "Profile Name": profile,
+            "Start Time": start_time,
+            "Duration": duration,
+            "Attributes": "",
+            "Title": title,
+            "Supplemental Video Type": "",
+            "Device Type": "TV",
+            "Bookmark": "00:10:00",
+            "Latest Bookmark": "00:10:00",
+            "Country": "US (United States)",
+        }
+
+    def test_header_is_read_from_first_bytes(self):
+        upload = self.csv_file([self.row("Main", "2024-01-05 20:00:00", "Example")], bom=True)
+
+        self.assertEqual(read_csv_header(upload), EXPECTED_COLUMNS)
+        self.assertEqual(upload.tell(), 0)
+
+    def test_chunks_are_deduplicated_across_files(self):
+        first = self.csv_file([
+            self.row("Main", "2024-01-05 20:00:00", "Example"),
+            self.row("Main", "2024-01-05 20:00:00", "Example"),
+            self.row("Kids", "2023-06-01 09:00:00", "Cartoon"),
+        ])
+        second = self.csv_file([
+            self.row("Kids", "2023-06-01 09:00:00", "Cartoon"),
+            self.row("1234", "2022-02-02 10:00:00", "Example"),
+            self.row("Main", "not a date", "Example"),
+        ])
+
+        result = read_viewing_history([first, second], chunksize=2)
+
+        self.assertEqual(result["rows_read"], 6)
+        self.assertEqual(result["duplicates_skipped"], 2)
+        self.assertEqual(
+            result["profile_years_map"],
+            {"Main": [2024], "Kids": [2023], "1234": [2022]},
+        )
+        self.assertEqual(len(result["dataframe"]), 3)
+        self.assertNotIn("Bookmark", result["dataframe"].columns)
+        self.assertTrue(result["dataframe"]["Supplemental Video Type"].isna().all())
+
+    def test_fingerprint_ignores_file_and_row_order(self):
+        rows = [
+            self.row("Main", "2024-01-05 20:00:00", "Example"),
+            self.row("Kids", "2023-06-01 09:00:00", "Cartoon"),
+        ]
+        forward = read_viewing_history([self.csv_file(rows[:1]), self.csv_file(rows[1:])])
+        backward = read_viewing_history([self.csv_file(rows[::-1])])
+        changed = read_viewing_history([self.csv_file([rows[0], {**rows[1], "Device Type": "Phone"}])])
+
+        self.assertEqual(forward["fingerprint"], backward["fingerprint"])
+        self.assertNotEqual(forward["fingerprint"], changed["fingerprint"])
+
+    def test_identical_upload_reuses_existing_job(self):
+        client = APIClient()
+        rows = [self.row("Main", "2024-01-05 20:00:00", "Example")]
+
+        with mock.patch("api.views.recap_views.enqueue_anonymous_recap") as enqueue:
+            first = client.post("/api/csv/quick-extract/", {"file": self.csv_upload(rows)}, format="multipart")
+            second = client.post("/api/csv/quick-extract/", {"file": self.csv_upload(rows)}, format="multipart")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(enqueue.call_count, 1)
+        self.assertFalse(first.data["reused"])
+        self.assertTrue(second.data["reused"])
+        self.assertEqual(second.data["job_id"], first.data["job_id"])
+        self.assertEqual(second.data["ready_profile_years"], first.data["ready_profile_years"])
+        self.assertEqual(second.data["merge_stats"], first.data["merge_stats"])
+
+    def test_identical_upload_from_another_visitor_is_not_reused(self):
+        rows = [self.row("Main", "2024-01-05 20:00:00", "Example")]
+
+        with mock.patch("api.views.recap_views.enqueue_anonymous_recap") as enqueue:
+            first = APIClient().post("/api/csv/quick-extract/", {"file": self.csv_upload(rows)}, format="multipart")
+            second = APIClient().post("/api/csv/quick-extract/", {"file": self.csv_upload(rows)}, format="multipart")
+
+        self.assertEqual(enqueue.call_count, 2)
+        self.assertFalse(second.data["reused"])
+        self.assertNotEqual(second.data["job_id"], first.data["job_id"])
+
+    def test_upload_is_ingested_again_after_wiping_saved_data(self):
+        user = create_test_user("rewipe@example.com")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        rows = [self.row("Main", "2024-01-05 20:00:00", "Example")]
+
+        with mock.patch("api.views.recap_views.enqueue_authenticated_recap") as enqueue:
+            first = client.post("/api/csv/quick-extract/", {"file": self.csv_upload(rows)}, format="multipart")
+            with mock.patch("api.services.recap_jobs.process_anonymous_upload"), mock.patch(
+                "api.services.recap_jobs._warm_recommendations"
+            ):
+                process_authenticated_upload(*enqueue.call_args.args)
+            self.assertEqual(ViewingEvent.objects.filter(profile__user=user).count(), 1)
+
+            wiped = client.post(
+                "/api/auth/account/wipe-data/",
+                {"currentPassword": "Password123!"},
+                format="json",
+            )
+            second = client.post("/api/csv/quick-extract/", {"file": self.csv_upload(rows)}, format="multipart")
+
+        self.assertEqual(wiped.status_code, 200)
+        self.assertEqual(enqueue.call_count, 2)
+        self.assertFalse(second.data["reused"])
+        self.assertNotEqual(second.data["job_id"], first.data["job_id"])
+
+
 class ViewingIngestionTitleCleanupTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -586,6 +796,966 @@ class ViewingIngestionTitleCleanupTests(TestCase):
         )
 
 
+class ViewingIngestionColumnarTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("columnar@example.com")
+
+    def test_vectorized_duration_parsing_matches_row_parser(self):
+        durations = pd.Series(["00:22:00", "1:02:03", " 02 : 00 : 09 ", "bad", None, "00:30"])
+
+        self.assertEqual(
+            duration_seconds_column(durations).tolist(),
+            [duration_to_seconds(value) for value in durations],
+        )
+
+    @override_settings(TITLE_PARSE_PARALLEL_MIN_TITLES=1)
+    def test_parallel_title_parsing_matches_serial_output(self):
+        titles = [
+            "Avatar: The Last Airbender: Book 3: Sozin's Comet: Avatar Aang (Episode 21)",
+            "Star Wars: Episode VIII: The Last Jedi",
+            "Example Show: Season 2: Chapter 3 (Episode 3)",
+            "Example Show: Season 2: Chapter 4 (Episode 4)",
+            "Love Island Australia: Season 1_hook_primary_16x9",
+            "Example Movie",
+        ] * 3
+
+        serial_codes, serial = parse_distinct_titles(titles, workers=1)
+        parallel_codes, parallel = parse_distinct_titles(titles, workers=2)
+
+        self.assertEqual(serial_codes.tolist(), parallel_codes.tolist())
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_events_keep_row_hashes_and_parsed_columns(self):
+        dataframe = pd.DataFrame(
+            [
+                {
+                    "Profile Name": "Main",
+                    "Start Time": "2024-03-01 21:15:00",
+                    "Duration": "00:42:10",
+                    "Title": "Avatar: The Last Airbender: Book 3: Sozin's Comet: Avatar Aang (Episode 21)",
+                    "Supplemental Video Type": None,
+                    "Device Type": "TV",
+                },
+                {
+                    "Profile Name": "Main",
+                    "Start Time": "2024-03-02 10:00:00",
+                    "Duration": "01:55:00",
+                    "Title": "Star Wars: Episode VIII: The Last Jedi",
+                    "Supplemental Video Type": None,
+                    "Device Type": None,
+                },
+            ]
+        )
+
+        ingest_viewing_dataframe(self.user, dataframe, "viewing.csv")
+
+        events = {event.title_raw: event for event in ViewingEvent.objects.all()}
+        for row in dataframe.to_dict("records"):
+            event = events[row["Title"]]
+            started_at = timezone.make_aware(pd.Timestamp(row["Start Time"]), timezone.get_current_timezone())
+            self.assertEqual(
+                event.row_hash,
+                build_row_hash(self.user.id, "Main", started_at, row["Title"], row["Duration"]),
+            )
+            self.assertEqual(event.duration_seconds, duration_to_seconds(row["Duration"]))
+
+        episode = events[dataframe.iloc[0]["Title"]]
+        self.assertEqual(episode.title.name, "Avatar: The Last Airbender")
+        self.assertEqual(episode.episode_number, 21)
+        self.assertEqual(episode.device_type, "TV")
+        self.assertEqual(events[dataframe.iloc[1]["Title"]].device_type, "")
+
+
+class ViewingEventLoaderTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("loader@example.com")
+        self.dataframe = viewing_frame(
+            [
+                ("2024-05-01 20:00:00", "00:30:00", "Example Show: Season 1: Pilot (Episode 1)"),
+                ("2024-05-02 20:00:00", "01:40:00", "Example Movie"),
+            ],
+            **{"Device Type": "TV"},
+        )
+
+    def test_copy_text_values_are_escaped(self):
+        self.assertEqual(copy_text_value(None), r"\N")
+        self.assertEqual(copy_text_value(True), "t")
+        self.assertEqual(copy_text_value("Tab\there\\now\n"), "Tab\\there\\\\now\\n")
+
+    def test_non_postgres_backends_fall_back_to_bulk_create(self):
+        with override_settings(VIEWING_EVENT_COPY_THRESHOLD=1), mock.patch(
+            "api.services.viewing_event_loader.copy_supported",
+            return_value=False,
+        ):
+            first = ingest_viewing_dataframe(self.user, self.dataframe, "viewing.csv")
+            second = ingest_viewing_dataframe(self.user, self.dataframe, "viewing.csv")
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.events_inserted, first.events_skipped, first.event_loader), (2, 0, "bulk_create"))
+        self.assertEqual((second.events_inserted, second.events_skipped, second.event_loader), (0, 0, "bulk_create"))
+        self.assertEqual(second.known_rows_skipped, 2)
+        self.assertEqual(ViewingEvent.objects.count(), 2)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_copy_loader_skips_existing_row_hashes(self):
+        with override_settings(VIEWING_EVENT_COPY_THRESHOLD=1):
+            upload = ingest_viewing_dataframe(self.user, self.dataframe, "viewing.csv")
+        self.assertEqual((upload.events_inserted, upload.events_skipped, upload.event_loader), (2, 0, "copy"))
+
+        rows = [
+            [uuid.uuid4() if field == "id" else getattr(event, field) for field in VIEWING_EVENT_FIELDS]
+            for event in ViewingEvent.objects.order_by("started_at")
+        ]
+        rows[1][VIEWING_EVENT_FIELDS.index("row_hash")] = "new-row-hash"
+
+        result = load_viewing_events(rows, upload, loader=LOADER_COPY)
+
+        self.assertEqual(result, {"inserted": 1, "skipped": 1, "loader": "copy"})
+        self.assertEqual(ViewingEvent.objects.count(), 3)
+
+    def test_reupload_only_ingests_rows_missing_from_known_index(self):
+        ingest_viewing_dataframe(self.user, self.dataframe, "viewing.csv")
+        profile = NetflixProfile.objects.get(user=self.user, name="Main")
+        self.assertEqual(profile.row_hash_filter_count, 2)
+        self.assertEqual(
+            profile.latest_started_at,
+            timezone.make_aware(pd.Timestamp("2024-05-02 20:00:00"), timezone.get_current_timezone()),
+        )
+
+        cumulative = pd.concat(
+            [
+                self.dataframe,
+                viewing_frame(
+                    [
+                        ("2024-04-01 20:00:00", "00:45:00", "Older Movie"),
+                        ("2024-06-01 20:00:00", "00:45:00", "Newer Movie"),
+                    ],
+                    **{"Device Type": "TV"},
+                ),
+            ],
+            ignore_index=True,
+        )
+        self.assertEqual(count_known_rows(self.user, cumulative), 2)
+
+        upload = ingest_viewing_dataframe(self.user, cumulative, "viewing.csv")
+
+        self.assertEqual(upload.known_rows_skipped, 2)
+        self.assertEqual(upload.events_inserted, 2)
+        self.assertEqual(ViewingEvent.objects.filter(profile=profile).count(), 4)
+        profile.refresh_from_db()
+        self.assertEqual(profile.row_hash_filter_count, 4)
+
+
+class ParsedUploadTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("parsed@example.com")
+        self.dataframe = viewing_frame(
+            [
+                ("2024-05-01 20:00:00", "00:30:00", "Example Show: Season 1: Pilot (Episode 1)"),
+                ("2024-05-02 20:00:00", "01:40:00", "Example Movie"),
+                ("2024-05-02 22:00:00", "00:00:30", "Example Movie_hook_primary_16x9"),
+            ],
+            year=2024,
+            **{"Device Type": "TV"},
+        )
+        self.dataframe.loc[2, "Supplemental Video Type"] = "HOOK"
+
+    def test_parsed_upload_is_not_parsed_again_downstream(self):
+        parsed = parseUploadFrame(self.dataframe)
+
+        self.assertEqual(parsed["Duration Seconds"].tolist(), [1800, 6000, 30])
+        self.assertTrue(parsed["Is Episode"].iloc[0])
+        self.assertTrue(pd.isna(parsed["Parsed Media Type"].iloc[2]))
+
+        with mock.patch("utils.workflows.parseDistinctTitleParts") as reparse, mock.patch(
+            "api.services.viewing_ingestion.parse_distinct_titles"
+        ) as reingest_parse:
+            graph_data = getJsonGraphData(parsed.copy(), "Main", 2024)
+            ingest_viewing_dataframe(self.user, parsed, "viewing.csv")
+
+        reparse.assert_not_called()
+        reingest_parse.assert_not_called()
+        self.assertEqual(graph_data, getJsonGraphData(self.dataframe.copy(), "Main", 2024) | {
+            "_timings_ms": graph_data["_timings_ms"],
+        })
+        episode = ViewingEvent.objects.get(title_raw=self.dataframe.iloc[0]["Title"])
+        self.assertEqual(episode.title.name, "Example Show")
+        self.assertEqual(episode.duration_seconds, 1800)
+
+
+    def test_cached_upload_keeps_parsed_times_for_workers(self):
+        cache.clear()
+        owner = owner_key(None, "parsed-times")
+        parsed = workflows.parseViewingTimes(self.dataframe)
+        store_upload(owner, "parsed-times", {"dataframe_json": parsed.to_json(orient="records")})
+
+        with mock.patch("utils.workflows.parseStartTimes") as reparse_times, mock.patch(
+            "utils.workflows.durationSecondsColumn"
+        ) as reparse_durations:
+            _, dataframe = load_parsed_upload(owner, "parsed-times")
+            getJsonGraphData(dataframe, "Main", 2024)
+
+        reparse_times.assert_not_called()
+        reparse_durations.assert_not_called()
+        self.assertEqual(dataframe["parsed_start_time"].tolist(), parsed["parsed_start_time"].tolist())
+        self.assertEqual(dataframe["Duration Seconds"].tolist(), [1800, 6000, 30])
+
+    def test_titles_parsed_for_workers_are_stored_in_the_cached_upload(self):
+        cache.clear()
+        owner = owner_key(None, "parsed-titles")
+        store_upload(owner, "parsed-titles", {"dataframe_json": self.dataframe.to_json(orient="records")})
+
+        _, first = load_parsed_upload(owner, "parsed-titles")
+        with mock.patch("utils.workflows.parseDistinctTitleParts") as reparse, mock.patch(
+            "api.services.viewing_ingestion.parse_distinct_titles"
+        ) as reparse_distinct:
+            _, second = load_parsed_upload(owner, "parsed-titles")
+
+        reparse.assert_not_called()
+        reparse_distinct.assert_not_called()
+        self.assertEqual(second["Series Title"].tolist(), first["Series Title"].tolist())
+        self.assertEqual(second["Is Episode"].tolist(), [True, False, False])
+        stored = json.loads(load_upload_data(owner, "parsed-titles")["dataframe_json"])
+        self.assertEqual(stored[0]["Series Title"], "Example Show")
+
+    def test_start_times_outside_export_format_fall_back_to_inference(self):
+        parsed = workflows.parseStartTimes(
+            pd.Series(["2024-05-01 20:00:00", "2024-05-02T21:30:00", "not a time", None])
+        )
+
+        self.assertEqual(
+            parsed.tolist()[:2],
+            [pd.Timestamp("2024-05-01 20:00:00"), pd.Timestamp("2024-05-02 21:30:00")],
+        )
+        self.assertTrue(parsed.iloc[2:].isna().all())
+
+
+class ChunkedIngestionTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("chunked@example.com")
+        self.dataframe = viewing_frame(
+            [
+                (f"2024-05-0{day} 20:00:00", "00:30:00", f"Example Show: Season 1: Chapter {day} (Episode {day})")
+                for day in range(1, 4)
+            ],
+            **{"Device Type": "TV"},
+        )
+
+    def test_failed_job_resumes_after_last_committed_chunk(self):
+        def crash_after_first_chunk(upload):
+            raise RuntimeError("worker timeout")
+
+        with self.assertRaises(RuntimeError):
+            ingest_viewing_dataframe_chunked(
+                self.user,
+                self.dataframe,
+                job_id="resume-job",
+                chunk_rows=1,
+                progress=crash_after_first_chunk,
+            )
+        upload = Upload.objects.get(job_id="resume-job")
+        self.assertEqual(upload.status, Upload.Status.FAILED)
+        self.assertEqual((upload.rows_committed, upload.rows_total), (1, 3))
+        self.assertEqual(ViewingEvent.objects.count(), 1)
+
+        progress = []
+        with mock.patch("api.services.viewing_ingestion.enrich_titles_safely") as enrich, self.captureOnCommitCallbacks(
+            execute=True
+        ):
+            resumed = ingest_viewing_dataframe_chunked(
+                self.user,
+                self.dataframe,
+                job_id="resume-job",
+                chunk_rows=1,
+                progress=lambda upload: progress.append(upload.rows_committed),
+            )
+
+        self.assertEqual(resumed.id, upload.id)
+        self.assertEqual(resumed.status, Upload.Status.COMPLETED)
+        self.assertEqual(progress, [2, 3])
+        resumed.refresh_from_db()
+        self.assertEqual((resumed.events_inserted, resumed.events_skipped), (3, 0))
+        title = Title.objects.get(normalized_name="example show")
+        self.assertEqual(enrich.call_args.args[0], [title])
+        self.assertEqual(enrich.call_args.kwargs["watchtime_by_title"], {str(title.id): 3 * 30 * 60})
+        self.assertEqual(ViewingEvent.objects.filter(upload=upload).count(), 3)
+
+        with override_settings(VIEWING_INGEST_CHUNK_ROWS=2):
+            again = ingest_viewing_dataframe_chunked(self.user, self.dataframe, job_id="resume-job")
+        self.assertEqual(again.id, upload.id)
+
+    def test_titles_are_parsed_once_per_upload_before_chunking(self):
+        with mock.patch(
+            "api.services.viewing_ingestion.parse_distinct_titles",
+            wraps=parse_distinct_titles,
+        ) as parse:
+            ingest_viewing_dataframe_chunked(self.user, self.dataframe, job_id="parse-once", chunk_rows=1)
+
+        parse.assert_called_once()
+        self.assertEqual(len(parse.call_args.args[0]), 3)
+        self.assertEqual(ViewingEvent.objects.filter(is_episode=True).count(), 3)
+
+    def test_reupload_job_parses_only_rows_not_stored_yet(self):
+        cache.clear()
+        ingest_viewing_dataframe(self.user, self.dataframe.iloc[:2])
+        owner = owner_key(self.user, "reupload")
+        store_upload(owner, "reupload", {"dataframe_json": self.dataframe.to_json(orient="records")})
+
+        with mock.patch(
+            "api.services.viewing_ingestion.parse_distinct_titles",
+            wraps=parse_distinct_titles,
+        ) as parse, mock.patch("api.services.recap_jobs.process_anonymous_upload"), mock.patch(
+            "api.services.recap_jobs._warm_recommendations"
+        ):
+            process_authenticated_upload("reupload", owner, self.user.id, {"Main": [2024]}, "history.csv")
+
+        # Ingestion parses first; recaps parse the whole upload afterwards
+        self.assertEqual(
+            list(parse.call_args_list[0].args[0]),
+            ["Example Show: Season 1: Chapter 3 (Episode 3)"],
+        )
+        self.assertEqual(ViewingEvent.objects.count(), 3)
+
+    def test_authenticated_job_reads_the_cached_upload_once(self):
+        cache.clear()
+        owner = owner_key(self.user, "read-once")
+        store_upload(owner, "read-once", {"dataframe_json": self.dataframe.assign(year=2024).to_json(orient="records")})
+        set_processing_state("read-once", create_processing_state({"Main": [2024]}))
+
+        with mock.patch(
+            "api.services.recap_cache.load_upload_data",
+            wraps=load_upload_data,
+        ) as load, mock.patch("api.services.recap_jobs._warm_recommendations"):
+            process_authenticated_upload("read-once", owner, self.user.id, {"Main": [2024]}, "history.csv")
+
+        load.assert_called_once()
+        self.assertEqual(ViewingEvent.objects.count(), 3)
+        self.assertEqual(get_processing_state("read-once")["profiles"], {"Main": {"2024": "ready"}})
+
+
+class ViewingRollupTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("rollups@example.com")
+        self.dataframe = viewing_frame(
+            [
+                ("2024-05-01 20:05:00", "00:03:00", "Example Show: Season 1: Pilot (Episode 1)"),
+                ("2024-05-01 20:15:00", "00:45:00", "Example Show: Season 1: Pilot (Episode 1)"),
+                ("2024-05-01 20:40:00", "00:25:00", "Example Show: Season 1: Pilot (Episode 1)"),
+                ("2024-05-01 21:10:00", "01:50:00", "Example Movie"),
+                ("2024-06-02 09:00:00", "00:30:00", "Example Show: Season 1: Second (Episode 2)"),
+            ]
+        )
+
+    def test_ingestion_sums_events_per_profile_date_hour_and_title(self):
+        ingest_viewing_dataframe(self.user, self.dataframe.iloc[:2])
+        ingest_viewing_dataframe(self.user, self.dataframe)
+
+        rollup = ViewingRollup.objects.get(hour=20)
+        self.assertEqual(ViewingRollup.objects.count(), 3)
+        self.assertEqual(rollup.title_raw, "Example Show: Season 1: Pilot (Episode 1)")
+        self.assertEqual(rollup.series_title, "Example Show")
+        self.assertEqual(
+            (rollup.event_count, rollup.watch_seconds, rollup.short_count, rollup.finished_count, rollup.longest_seconds),
+            (3, 73 * 60, 1, 2, 45 * 60),
+        )
+        self.assertEqual(rollup.last_started_at.minute, 40)
+
+    def test_recap_from_rollups_matches_recap_from_events(self):
+        ingest_viewing_dataframe(self.user, self.dataframe)
+        ViewingRollup.objects.filter(date__month=6).delete()
+
+        for year in (2024, "all"):
+            with self.subTest(year=year):
+                profile, events = profile_events(self.user, "Main", year)
+                from_rollups = getAccumulatedGraphData(accumulator_from_rollups(profile, events, year), "Main", year)
+                from_events = getJsonGraphData(pd.DataFrame(event_rows(events)), "Main", year)
+                from_rollups.pop("_timings_ms")
+                from_events.pop("_timings_ms")
+
+                self.assertEqual(json.dumps(from_rollups), json.dumps(from_events))
+                self.assertEqual(from_rollups["core_stats"]["total_viewing_events"], 5)
+        # The recap backfilled the rollups it found missing
+        self.assertEqual(ViewingRollup.objects.count(), 3)
+
+
+class SavedRecapAccumulatorTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("accumulators@example.com")
+        self.dataframe = viewing_frame(
+            [
+                (
+                    f"2024-{month:02d}-0{day} 2{day}:00:00",
+                    f"00:{10 * day:02d}:00",
+                    f"Example Show: Season 1: Chapter {month} (Episode {month})",
+                )
+                for month in range(3, 7)
+                for day in range(1, 4)
+            ]
+        )
+
+    def saved_recap(self):
+        profile, events = profile_events(self.user, "Main", 2024)
+        graph_data = saved_or_generated_recap(self.user, profile, events, "Main", 2024)
+        return {key: value for key, value in graph_data.items() if key != "_timings_ms"}
+
+    def test_appended_events_are_folded_into_saved_recap(self):
+        ingest_viewing_dataframe(self.user, self.dataframe.iloc[:9])
+        self.saved_recap()
+        ingest_viewing_dataframe(self.user, self.dataframe)
+
+        with mock.patch(
+            "api.services.recap_data.accumulator_from_rollups",
+            wraps=accumulator_from_rollups,
+        ) as from_rollups:
+            folded = self.saved_recap()
+        from_rollups.assert_not_called()
+
+        YearlyRecap.objects.all().delete()
+        self.assertEqual(json.dumps(folded), json.dumps(self.saved_recap()))
+        self.assertEqual(folded["core_stats"]["total_viewing_events"], 12)
+
+    def test_events_before_saved_recap_force_full_recompute(self):
+        ingest_viewing_dataframe(self.user, self.dataframe.iloc[3:])
+        self.saved_recap()
+        ingest_viewing_dataframe(self.user, self.dataframe)
+
+        with mock.patch(
+            "api.services.recap_data.accumulator_from_rollups",
+            wraps=accumulator_from_rollups,
+        ) as from_rollups:
+            recap = self.saved_recap()
+        from_rollups.assert_called_once()
+        self.assertEqual(recap["core_stats"]["first_watched_title"]["date"], "2024-03-01")
+
+    def test_saved_recap_comparisons_follow_other_profiles_viewing(self):
+        cache.clear()
+        kids = [("2024-04-05 20:00:00", "00:30:00", "Example Movie")]
+        ingest_viewing_dataframe(self.user, pd.concat([self.dataframe, viewing_frame(kids, "Kids")]))
+        before = self.saved_recap()["profile_comparisons"]
+
+        ingest_viewing_dataframe(
+            self.user,
+            viewing_frame([*kids, ("2024-07-05 20:00:00", "02:00:00", "Example Movie")], "Kids"),
+        )
+        after = self.saved_recap()["profile_comparisons"]
+
+        self.assertNotEqual(after["profile_watchtime"], before["profile_watchtime"])
+        self.assertEqual(after, profile_comparisons(self.user, "Main", 2024))
+        self.assertNotIn("profile_comparisons", YearlyRecap.objects.get(year="2024").data)
+
+    def test_unchanged_saved_recap_is_read_without_accumulators(self):
+        ingest_viewing_dataframe(self.user, self.dataframe)
+        self.saved_recap()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.saved_recap()
+
+        self.assertFalse(any("accumulators" in query["sql"] for query in queries.captured_queries))
+
+
+class YearSummaryTests(TestCase):
+    def setUp(self):
+        self.user = create_test_user("year-summaries@example.com")
+        ingest_viewing_dataframe(
+            self.user,
+            viewing_frame(
+                [
+                    (
+                        f"{year}-{month:02d}-0{day} 2{day}:00:00",
+                        f"00:{10 * day:02d}:00",
+                        f"Example Show: Season 1: Chapter {month} (Episode {month})",
+                    )
+                    for year in (2022, 2023, 2024)
+                    for month in range(3, 6 if year < 2024 else 8)
+                    for day in range(1, 4)
+                ]
+            ),
+        )
+
+    def test_all_years_recap_is_composed_from_year_recaps(self):
+        profile, events = profile_events(self.user, "Main", "all")
+        composed = saved_or_generated_recap(self.user, profile, events, "Main", "all")
+
+        self.assertEqual(
+            sorted(YearlyRecap.objects.values_list("year", flat=True)),
+            ["2022", "2023", "2024", "all"],
+        )
+        full = getAccumulatedGraphData(
+            accumulator_from_rollups(profile, events, "all"),
+            "Main",
+            "all",
+        )
+        ignored = {"_timings_ms", "profile_comparisons"}
+        self.assertEqual(
+            json.dumps({key: value for key, value in composed.items() if key not in ignored}),
+            json.dumps({key: value for key, value in full.items() if key not in ignored}),
+        )
+
+    def test_year_recaps_saved_without_accumulators_are_refreshed_for_all_years(self):
+        profile, events = profile_events(self.user, "Main", "all")
+        year_recaps(self.user, profile, [2022, 2023, 2024])
+        YearlyRecap.objects.filter(year__in=["2023", "2024"]).update(accumulators={})
+
+        with CaptureQueriesContext(connection) as queries:
+            composed = saved_or_generated_recap(self.user, profile, events, "Main", "all")
+
+        self.assertEqual(composed["core_stats"]["total_viewing_events"], 33)
+        self.assertFalse(YearlyRecap.objects.filter(year__in=["2022", "2023", "2024"], accumulators={}).exists())
+        # Composing reads each year's accumulators with its recap, not in a deferred query
+        self.assertFalse(
+            any(
+                query["sql"].startswith('SELECT "api_yearlyrecap"."id", "api_yearlyrecap"."accumulators"')
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_composing_refuses_year_recaps_without_accumulators(self):
+        profile, _ = profile_events(self.user, "Main", "all")
+        recaps = year_recaps(self.user, profile, [2023, 2024])
+        recaps[0].accumulators = {}
+
+        with self.assertRaises(ValueError):
+            composed_accumulator(recaps)
+
+    def test_trends_return_recent_year_series(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(
+            "/api/recap-trends/",
+            {"profile_name": "Main", "years": 2},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        trends = response.data["data"]
+        self.assertEqual(trends["years"], [2023, 2024])
+        self.assertEqual(trends["series"]["total_viewing_events"], [9, 15])
+        self.assertFalse(YearlyRecap.objects.filter(year="2022").exists())
+
+
+class HouseholdComparisonTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dataframe = pd.concat(
+            [
+                viewing_frame(
+                    [
+                        (f"2024-0{month}-05 20:00:00", "00:30:00", title)
+                        for month, title in enumerate(titles, start=1)
+                    ],
+                    profile_name,
+                    year=2024,
+                )
+                for profile_name, titles in {
+                    "Main": ["Example Movie", "Shared Movie"],
+                    "Kids": ["Shared Movie", "Cartoon Movie"],
+                }.items()
+            ],
+            ignore_index=True,
+        )
+
+    def test_upload_household_is_computed_once_per_job_year(self):
+        with mock.patch(
+            "api.services.recap_data.getHouseholdComparisonData",
+            wraps=data_analysis.getHouseholdComparisonData,
+        ) as household:
+            comparisons = {
+                profile_name: profile_comparisons_from_dataframe(
+                    self.dataframe,
+                    profile_name,
+                    2024,
+                    "anonymous:household",
+                    "household",
+                )
+                for profile_name in ["Main", "Kids"]
+            }
+
+        household.assert_called_once()
+        for profile_name, comparison in comparisons.items():
+            self.assertEqual(
+                comparison,
+                data_analysis.getProfileComparisonData(self.dataframe, profile_name, 2024),
+            )
+        self.assertEqual(comparisons["Kids"]["overlap_scores"][0]["profile"], "Main")
+
+    def test_stored_household_is_reused_until_events_change(self):
+        user = create_test_user("household@example.com")
+        ingest_viewing_dataframe(user, self.dataframe.drop(columns="year"))
+
+        with mock.patch(
+            "api.services.recap_data.getHouseholdComparisonData",
+            wraps=data_analysis.getHouseholdComparisonData,
+        ) as household:
+            main = profile_comparisons(user, "Main", 2024)
+            profile_comparisons(user, "Kids", 2024)
+            self.assertEqual(household.call_count, 1)
+
+            ingest_viewing_dataframe(
+                user,
+                viewing_frame([("2024-03-05 20:00:00", "00:30:00", "Example Movie")], "Kids"),
+            )
+            updated = profile_comparisons(user, "Main", 2024)
+            self.assertEqual(household.call_count, 2)
+
+        self.assertEqual(main["overlap_scores"][0]["shared_titles"], 1)
+        self.assertEqual(updated["overlap_scores"][0]["shared_titles"], 2)
+
+
+class TitleParseCacheTests(TestCase):
+    def test_cache_counts_hits_and_evicts_least_recently_used(self):
+        parse_cache = TitleParseCache(maxsize=2)
+        calls = []
+
+        def parse(title):
+            return parse_cache.get("parts", title, "", lambda: calls.append(title) or title.upper())
+
+        self.assertEqual(parse("a"), "A")
+        self.assertEqual(parse("b"), "B")
+        self.assertEqual(parse("a"), "A")
+        parse("c")
+        parse("b")
+
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        self.assertEqual(parse_cache.stats(), {"hits": 1, "misses": 4, "size": 2, "maxsize": 2})
+
+    def test_cache_is_cleared_when_title_sources_change(self):
+        parse_cache = TitleParseCache()
+        parse_cache.get("parts", "Title", "", lambda: "parsed")
+
+        with mock.patch.object(TitleParseCache, "_sources_signature", return_value=("changed",)):
+            parse_cache.refreshIfStale()
+
+        self.assertEqual(parse_cache.stats()["size"], 0)
+
+
+class TitleCatalogTests(TestCase):
+    def write_catalog(self, directory, rows):
+        source_path = os.path.join(directory, "titles.csv")
+        pd.DataFrame(rows, columns=["title", "type", "rating"]).to_csv(source_path, index=False)
+        return source_path
+
+    def test_catalog_snapshot_is_rebuilt_when_source_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source_path = self.write_catalog(directory, [["The Crown!", "TV Show", None]])
+            snapshot_path = os.path.join(directory, "titles.snapshot.pkl")
+
+            catalog = TitleCatalog(source_path, snapshot_path)
+            self.assertEqual(catalog.title_by_normalized, {"the crown": "The Crown!"})
+            self.assertEqual(catalog.rating_by_title, {"The Crown!": "Unknown"})
+            self.assertTrue(os.path.exists(snapshot_path))
+
+            with mock.patch.object(TitleCatalog, "_build_tables") as build_tables:
+                self.assertEqual(
+                    TitleCatalog(source_path, snapshot_path).type_by_title,
+                    {"The Crown!": "TV Show"},
+                )
+            build_tables.assert_not_called()
+
+            self.write_catalog(directory, [["Dark", "TV Show", "TV-MA"]])
+            self.assertEqual(
+                TitleCatalog(source_path, snapshot_path).type_by_normalized,
+                {"dark": "TV Show"},
+            )
+
+    def test_parse_cache_refresh_reloads_a_changed_catalog(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source_path = self.write_catalog(directory, [["The Crown!", "TV Show", None]])
+            catalog = TitleCatalog(source_path, os.path.join(directory, "titles.pkl"))
+            parse_cache = TitleParseCache(catalog=catalog)
+            self.assertEqual(catalog.matcher.resolve(["Dark"]), ("Dark", "Unknown"))
+
+            self.write_catalog(directory, [["Dark", "TV Show", "TV-MA"]])
+            parse_cache.refreshIfStale()
+
+            self.assertEqual(catalog.type_by_title, {"Dark": "TV Show"})
+            self.assertEqual(catalog.matcher.resolve(["Dark"]), ("Dark", "TV Show"))
+
+    def test_matcher_finds_longest_catalog_prefix_and_suffix(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source_path = self.write_catalog(
+                directory,
+                [
+                    ["Star Wars", "Movie", "PG"],
+                    ["Star Wars: The Clone Wars", "TV Show", "TV-PG"],
+                    ["The Crown!", "TV Show", "TV-MA"],
+                ],
+            )
+            matcher = TitleCatalog(source_path, os.path.join(directory, "titles.pkl")).matcher
+
+        self.assertEqual(
+            matcher.longest_prefix(["Star Wars", "The Clone Wars", "Trailer"]),
+            "Star Wars: The Clone Wars",
+        )
+        self.assertEqual(matcher.longest_prefix(["Star Wars", "Trailer"]), "Star Wars")
+        self.assertEqual(matcher.longest_suffix(["Clip", "the crown"]), "The Crown!")
+        self.assertIsNone(matcher.longest_suffix(["The Crown", "Clip"]))
+        self.assertEqual(matcher.resolve(["STAR WARS"]), ("Star Wars", "Movie"))
+        self.assertEqual(matcher.resolve(["Unlisted", "Show"]), ("Unlisted: Show", "Unknown"))
+
+    def test_module_constants_resolve_to_catalog(self):
+        self.assertIs(workflows.K_NETFLIX_TITLES, workflows.TITLE_CATALOG.frame)
+        self.assertIs(workflows.K_TYPE_BY_TITLE, workflows.TITLE_CATALOG.type_by_title)
+        with self.assertRaises(AttributeError):
+            workflows.K_UNKNOWN
+
+
+class MetadataResolverTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        METADATA_RESOLVER.invalidate()
+
+    def test_overrides_snapshot_is_rebuilt_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            overrides_path = os.path.join(directory, "overrides.json")
+            with open(overrides_path, "w", encoding="utf-8") as handle:
+                json.dump({"young sheldon": {"genres": ["TV Comedies"]}}, handle)
+            resolver = MetadataResolver(overrides_path, workflows.TITLE_CATALOG)
+
+            first = resolver.snapshot()
+            self.assertIs(resolver.snapshot(), first)
+            self.assertEqual(
+                resolver.resolve_many(["Young Sheldon!"])[0]["override"],
+                {"genres": ["TV Comedies"]},
+            )
+
+            with open(overrides_path, "w", encoding="utf-8") as handle:
+                json.dump({}, handle)
+            os.utime(overrides_path, ns=(0, 0))
+
+            self.assertIsNot(resolver.snapshot(), first)
+            self.assertEqual(resolver.resolve_many(["Young Sheldon"])[0]["override"], {})
+
+    def test_stored_titles_load_once_until_title_enrichment_changes(self):
+        title = Title.objects.create(name="Dark", normalized_name="dark", genres=["Drama"])
+
+        with CaptureQueriesContext(connection) as queries:
+            METADATA_RESOLVER.stored_many([title.id])
+            stored = METADATA_RESOLVER.stored_many([title.id])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(stored[title.id]["genres"], ["Drama"])
+
+        title.genres = ["Thriller"]
+        title.save(update_fields=["genres", "updated_at"])
+
+        self.assertEqual(METADATA_RESOLVER.stored_many([title.id])[title.id]["genres"], ["Thriller"])
+
+    def test_event_rows_read_title_metadata_from_resolver(self):
+        user = create_test_user("resolver@example.com")
+        ingest_viewing_dataframe(
+            user,
+            viewing_frame(
+                [
+                    (f"2024-01-0{day} 20:00:00", "00:45:00", "Dark: Season 1: Secrets (Episode 1)")
+                    for day in range(1, 4)
+                ]
+            ),
+            "viewing.csv",
+        )
+        Title.objects.update(genres=["Drama"], release_year=2017)
+        METADATA_RESOLVER.invalidate()
+
+        _, events = profile_events(user, "Main", 2024)
+        with mock.patch.object(
+            METADATA_RESOLVER,
+            "_title_loader",
+            wraps=METADATA_RESOLVER._title_loader,
+        ) as loader:
+            rows = event_rows(events)
+
+        loader.assert_called_once()
+        self.assertEqual([row["Metadata Genres"] for row in rows], [["Drama"]] * 3)
+        self.assertEqual({row["Metadata Release Year"] for row in rows}, {2017})
+
+
+class RecapPayloadTests(TestCase):
+    def test_dependencies_are_built_first_and_passed_downstream(self):
+        calls = []
+        builders = {
+            "core_stats": lambda: calls.append("core_stats") or {"unique_titles": 2},
+            "title_level_insights": lambda: calls.append("title_level_insights") or {"top_titles": []},
+            "wrapped_cards": lambda core_stats, title_level_insights: {
+                "unique_titles": core_stats["unique_titles"],
+                "top_titles": title_level_insights["top_titles"],
+            },
+        }
+
+        graphs = build_recap_payload(builders, {"wrapped_cards"})
+
+        self.assertEqual(calls, ["core_stats", "title_level_insights"])
+        self.assertEqual(graphs["wrapped_cards"], {"unique_titles": 2, "top_titles": []})
+        self.assertNotIn("core_stats", graphs)
+        self.assertEqual(
+            list(graphs["_timings_ms"]),
+            ["core_stats", "title_level_insights", "wrapped_cards", "sections_wall", "sections_cpu"],
+        )
+        self.assertEqual(
+            list(graphs["_timings_ms"]["sections_cpu"]),
+            ["core_stats", "title_level_insights", "wrapped_cards"],
+        )
+
+    def test_pooled_executors_match_serial_payload(self):
+        dataframe = pd.DataFrame(
+            [
+                {
+                    "Profile Name": "Main",
+                    "Start Time": f"2024-0{month}-0{day} {day * 5:02d}:00:00",
+                    "Duration": "00:45:00",
+                    "Title": title,
+                    "Supplemental Video Type": None,
+                }
+                for month in range(1, 4)
+                for day, title in enumerate(
+                    ["Dark: Season 1: Secrets (Episode 1)", "Dick Johnson Is Dead", "Blood & Water: Season 1: Episode 2"],
+                    start=1,
+                )
+            ]
+        )
+
+        def without_timings(graph_data):
+            return {key: value for key, value in graph_data.items() if key != "_timings_ms"}
+
+        serial = getJsonGraphData(dataframe.copy(), "Main", 2024)
+        for executor in ("thread", "process"):
+            with self.subTest(executor=executor):
+                graph_data = getJsonGraphData(dataframe.copy(), "Main", 2024, executor=executor, workers=2)
+                self.assertEqual(json.dumps(without_timings(graph_data)), json.dumps(without_timings(serial)))
+                self.assertEqual(set(graph_data["_timings_ms"]["sections_cpu"]), set(DEFAULT_RECAP_SECTIONS))
+
+    def test_payload_json_is_unchanged(self):
+        # Pinned from the whole-second recap cube; update only for intended output changes
+        history = synthetic_viewing_history(3000, profiles=2, years=1)
+
+        graph_data = getJsonGraphData(history[history["Profile Name"] == "Alex"].copy(), "Alex", 2025)
+        graph_data.pop("_timings_ms")
+        graph_data["profile_comparisons"] = data_analysis.getProfileComparisonData(history.copy(), "Alex", 2025)
+        # Ties in shared_titles follow set iteration order, which varies with the hash seed
+        graph_data["profile_comparisons"].pop("shared_titles")
+
+        self.assertEqual(
+            hashlib.sha256(json.dumps(graph_data).encode()).hexdigest(),
+            "8ba06a01c53784a45de47c04efa19502a5859014c98231864c9261d54529ea13",
+        )
+
+    def test_recap_cube_rollups_match_event_groupbys(self):
+        events = pd.DataFrame(
+            {
+                "Type": ["Movie", "TV Show", "TV Show", "Movie", None],
+                "Genres": [("Drama",), ("Comedy", "Drama"), (), ("Drama",), ("Comedy",)],
+                "Started Date": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03", "2024-01-03"],
+            }
+        )
+        seconds = pd.Series([1800, 3600, 900, 1200, 600])
+        cube = RecapCube.from_events(events, seconds)
+
+        by_type = cube.rollup(["Type"], distinct={"active_days": "Started Date"})
+        self.assertEqual(by_type["Type"].tolist(), ["Movie", "TV Show"])
+        self.assertEqual(by_type["Watch Seconds"].tolist(), [3000, 4500])
+        self.assertEqual(by_type["active_days"].tolist(), [2, 2])
+
+        by_genre = cube.subset(cube.column("Type").notna()).explode("Genres").rollup(["Genres"])
+        self.assertEqual(by_genre["Genres"].tolist(), ["Comedy", "Drama"])
+        self.assertEqual(by_genre["Events"].tolist(), [1, 3])
+        self.assertEqual(cube.total_seconds(), int(seconds.sum()))
+
+    def test_compact_recap_frame_groups_like_strings(self):
+        history = synthetic_viewing_history(500, profiles=2, years=1)
+        df = workflows.generateRatings(
+            workflows.generateMediaType(workflows.generateShowTitles(workflows.dataframeSetUp(history)))
+        )
+        strings = df.copy()
+        compact = workflows.compactRecapFrame(df)
+
+        self.assertIsInstance(compact["New Title"].dtype, pd.CategoricalDtype)
+        self.assertEqual(compact["Month"].dtype, np.int8)
+        self.assertEqual(compact["Duration Seconds"].dtype, np.int32)
+        self.assertLess(workflows.frameBytesPerRow(compact), workflows.frameBytesPerRow(strings))
+        for keys in (["Profile Name", "Type"], ["New Title"], ["Rating", "Month"]):
+            with self.subTest(keys=keys):
+                expected = strings.groupby(keys, as_index=False)["Watchtime (hrs)"].sum()
+                grouped = compact.groupby(keys, as_index=False, observed=True)["Watchtime (hrs)"].sum()
+                self.assertEqual(
+                    grouped.astype({key: object for key in keys}).to_dict("records"),
+                    expected.to_dict("records"),
+                )
+
+    def test_recap_pipeline_leaves_input_frame_unchanged(self):
+        history = synthetic_viewing_history(300, profiles=2, years=1)
+        original = history.copy()
+
+        parseUploadFrame(history)
+        getJsonGraphData(history, "Alex", 2025)
+        data_analysis.getHouseholdComparisonData(history, 2025)
+
+        pd.testing.assert_frame_equal(history, original)
+
+    def test_recap_pipeline_refuses_shallow_copies_without_copy_on_write(self):
+        history = synthetic_viewing_history(50, profiles=1, years=1)
+
+        with pd.option_context("mode.copy_on_write", False), self.assertRaises(RuntimeError):
+            parseUploadFrame(history)
+
+    def test_merged_accumulators_match_full_recap(self):
+        history = synthetic_viewing_history(3000, profiles=2, years=1)
+        history = history[history["Profile Name"] == "Alex"].sort_values("Start Time", kind="stable")
+        earlier, later = history.iloc[:1000], history.iloc[1000:]
+
+        stored = json.loads(json.dumps(getRecapAccumulator(earlier.copy()).to_json()))
+        merged = RecapAccumulator.from_json(stored).merge(getRecapAccumulator(later.copy()))
+        graph_data = getAccumulatedGraphData(merged, "Alex", 2025)
+        expected = getJsonGraphData(history.copy(), "Alex", 2025)
+        graph_data.pop("_timings_ms")
+        expected.pop("_timings_ms")
+
+        self.assertEqual(json.dumps(graph_data), json.dumps(expected))
+
+    def test_emitted_records_use_native_types(self):
+        grouped = pd.DataFrame(
+            {
+                "Title": ["A", "B"],
+                "Watchtime (hrs)": [1.005, float("nan")],
+                "Views": [np.int64(3), np.int64(1)],
+                "Started Date": pd.to_datetime(["2024-01-02", "2024-01-03"]).date,
+            }
+        )
+
+        records = workflows.emitRecords(
+            grouped,
+            {
+                "title": "Title",
+                "hrs": ("Watchtime (hrs)", "hrs"),
+                "views": ("Views", "int"),
+                "date": ("Started Date", "iso"),
+            },
+        )
+
+        self.assertEqual(records, [
+            {"title": "A", "hrs": round(1.005, 2), "views": 3, "date": "2024-01-02"},
+            {"title": "B", "hrs": 0, "views": 1, "date": "2024-01-03"},
+        ])
+        self.assertIs(type(records[0]["views"]), int)
+
+    def test_unknown_executor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            build_recap_payload({}, set(), executor="cluster")
+
+    def test_initial_sections_exclude_heavy_sections_and_their_dependents(self):
+        with mock.patch.dict(
+            "utils.recap_payload.RECAP_SECTION_DEPENDENCIES",
+            {"wrapped_cards": ("core_stats", "visualizations")},
+        ):
+            heavy = heavy_sections()
+
+        self.assertIn("wrapped_cards", heavy)
+        self.assertNotIn("wrapped_cards", HEAVY_RECAP_SECTIONS)
+        self.assertEqual(
+            INITIAL_RECAP_SECTIONS,
+            [section for section in DEFAULT_RECAP_SECTIONS if section not in HEAVY_RECAP_SECTIONS],
+        )
+        self.assertIn("wrapped_cards", INITIAL_RECAP_SECTIONS)
+
+
 class TitleMetadataEnrichmentTests(TestCase):
     def test_manual_override_populates_cached_title_metadata(self):
         title = Title.objects.create(name="Young Sheldon", normalized_name="young sheldon")
@@ -625,6 +1795,63 @@ class TitleMetadataEnrichmentTests(TestCase):
         self.assertEqual(enriched.iloc[0]["Metadata Country"], "United States")
         self.assertEqual(enriched.iloc[0]["Runtime Bucket"], "Short")
 
+    def test_static_metadata_is_resolved_once_per_distinct_title(self):
+        import pandas as pd
+
+        dataframe = pd.DataFrame(
+            [
+                {"New Title": "Dick Johnson Is Dead", "Watchtime (hrs)": 1.0},
+                {"New Title": "dick johnson is dead!", "Watchtime (hrs)": 1.0},
+                {"New Title": "Dick Johnson Is Dead", "Watchtime (hrs)": 1.0},
+                {"New Title": "Not In The Catalog", "Watchtime (hrs)": 1.0},
+            ]
+        )
+
+        with mock.patch.object(
+            METADATA_RESOLVER,
+            "resolve_many",
+            wraps=METADATA_RESOLVER.resolve_many,
+        ) as resolve_many:
+            enriched = enrichWithTitleMetadata(dataframe)
+
+        resolve_many.assert_called_once_with(
+            ["Dick Johnson Is Dead", "dick johnson is dead!", "Not In The Catalog"]
+        )
+        self.assertEqual(enriched["Primary Genre"].tolist(), ["Documentaries", "Documentaries", "Documentaries", "Unknown"])
+        self.assertEqual(enriched["Release Year"].tolist()[:3], [2020, 2020, 2020])
+        self.assertEqual(enriched["Runtime Bucket"].tolist(), ["Movie-length", "Movie-length", "Movie-length", "Unknown"])
+
+    def test_recap_sections_share_one_enriched_frame(self):
+        dataframe = pd.DataFrame(
+            [
+                {
+                    "Profile Name": "Main",
+                    "Start Time": f"2024-05-0{day} {day * 5:02d}:00:00",
+                    "Duration": "00:45:00",
+                    "Title": title,
+                    "Supplemental Video Type": None,
+                }
+                for day, title in enumerate(["Dark: Season 1: Secrets (Episode 1)", "Dick Johnson Is Dead"] * 2, start=1)
+            ]
+        )
+
+        with mock.patch(
+            "utils.data_analysis.enrichWithTitleMetadata",
+            wraps=enrichWithTitleMetadata,
+        ) as enrich, mock.patch(
+            "utils.data_analysis.getCoreStatsData",
+            wraps=data_analysis.getCoreStatsData,
+        ) as core_stats:
+            graph_data = getJsonGraphData(dataframe, "Main", 2024)
+
+        enrich.assert_called_once()
+        core_stats.assert_called_once()
+        self.assertEqual(graph_data["wrapped_cards"]["shareable_recap"]["unique_titles"], 2)
+        self.assertEqual(
+            [cell["daypart"] for cell in graph_data["visualizations"]["daypart_by_day_heatmap"] if cell["hrs"]],
+            ["Late night", "Morning", "Afternoon", "Evening"],
+        )
+
     def test_analytics_uses_manual_override_for_raw_csv_titles(self):
         import pandas as pd
 
@@ -3,6 +3,7 @@ from api.views.recap_views import (
     AvailableRecapsView,
     RecapDataView,
     RecapProcessingStatusView,
+    RecapTrendsView,
     SavedRecapView,
     ViewingHistoryUploadView,
     YearComparisonView,
@@ -47,6 +48,7 @@ urlpatterns = [
     path('stored-data/', AvailableRecapsView.as_view(), name='stored-data'),
     path('get-stored-data/', SavedRecapView.as_view(), name='get-stored-data'),
     path('compare-years/', YearComparisonView.as_view(), name='compare-years'),
+    path('recap-trends/', RecapTrendsView.as_view(), name='recap-trends'),
     path('recommendations/', ProfileRecommendationsView.as_view(), name='recommendations'),
     path('recommendations/feedback/', RecommendationFeedbackView.as_view(), name='recommendation-feedback'),
     path('observability/health/', HealthCheckView.as_view(), name='observability-health'),
@@ -1,8 +1,16 @@
+import csv
+import hashlib
+import io
+from collections import defaultdict
+
 from rest_framework.response import Response
 from rest_framework import status
+import numpy as np
 import pandas as pd
 from functools import wraps
 
+from utils.workflows import parseViewingTimes
+
 EXPECTED_COLUMNS = [
     "Profile Name",
     "Start Time",
@@ -15,6 +23,99 @@ EXPECTED_COLUMNS = [
     "Latest Bookmark",
     "Country"
 ]
+UNUSED_COLUMNS = {"Attributes", "Bookmark", "Latest Bookmark"}
+VIEWING_HISTORY_COLUMNS = [
+    column for column in EXPECTED_COLUMNS if column not in UNUSED_COLUMNS
+]
+VIEWING_HISTORY_DTYPES = {column: str for column in VIEWING_HISTORY_COLUMNS}
+DEDUP_COLUMNS = ["Profile Name", "Start Time", "Duration", "Title"]
+CSV_HEADER_SNIFF_BYTES = 64 * 1024
+CSV_CHUNK_ROWS = 20_000
+
+
+def read_csv_header(file_obj):
+    """Read the header row from the first bytes of an upload without parsing the body."""
+    file_obj.seek(0)
+    head = file_obj.read(CSV_HEADER_SNIFF_BYTES)
+    file_obj.seek(0)
+    if isinstance(head, bytes):
+        head = head.decode("utf-8-sig", errors="replace")
+    first_line = head.splitlines()[0] if head else ""
+    header = next(csv.reader(io.StringIO(first_line)), [])
+    return [column.strip() for column in header]
+
+
+def iter_viewing_history_chunks(file_obj, chunksize=CSV_CHUNK_ROWS):
+    file_obj.seek(0)
+    return pd.read_csv(
+        file_obj,
+        usecols=VIEWING_HISTORY_COLUMNS,
+        dtype=VIEWING_HISTORY_DTYPES,
+        encoding="utf-8-sig",
+        chunksize=chunksize,
+    )
+
+
+def row_set_fingerprint(row_key_arrays):
+    row_keys = (
+        np.sort(np.concatenate(row_key_arrays))
+        if row_key_arrays
+        else np.array([], dtype=np.uint64)
+    )
+    return hashlib.sha256(row_keys.astype("<u8").tobytes()).hexdigest()
+
+
+def read_viewing_history(file_objs, chunksize=CSV_CHUNK_ROWS):
+    """
+    Stream uploaded viewing history files in bounded chunks.
+
+    Duplicates are dropped across files as chunks arrive and the profile/year
+    map is built incrementally, so only accepted rows are ever held in memory.
+    The fingerprint hashes the accepted row set independently of file and row
+    order, so identical exports can be recognised on re-upload.
+    """
+    seen_rows = set()
+    accepted_chunks = []
+    accepted_row_keys = []
+    profile_years = defaultdict(set)
+    rows_read = 0
+    duplicate_count = 0
+
+    for file_obj in file_objs:
+        for chunk in iter_viewing_history_chunks(file_obj, chunksize=chunksize):
+            rows_read += len(chunk)
+            row_keys = pd.util.hash_pandas_object(chunk[DEDUP_COLUMNS], index=False)
+            is_new = ~row_keys.duplicated() & ~row_keys.isin(seen_rows)
+            seen_rows.update(row_keys[is_new].tolist())
+            duplicate_count += int((~is_new).sum())
+
+            chunk = chunk[is_new.to_numpy()]
+            chunk = parseViewingTimes(chunk)
+            chunk = chunk.dropna(subset=["parsed_start_time", "Profile Name"])
+            chunk = chunk.assign(year=chunk["parsed_start_time"].dt.year)
+            for profile_name, year in chunk[["Profile Name", "year"]].drop_duplicates().itertuples(index=False):
+                profile_years[profile_name].add(int(year))
+            accepted_chunks.append(chunk)
+            accepted_row_keys.append(
+                pd.util.hash_pandas_object(chunk[VIEWING_HISTORY_COLUMNS], index=False).to_numpy()
+            )
+
+    dataframe = (
+        pd.concat(accepted_chunks, ignore_index=True)
+        if accepted_chunks
+        else pd.DataFrame(columns=[*VIEWING_HISTORY_COLUMNS, "parsed_start_time", "Duration Seconds", "year"])
+    )
+    return {
+        "dataframe": dataframe,
+        "profile_years_map": {
+            profile: sorted(years)
+            for profile, years in profile_years.items()
+        },
+        "rows_read": rows_read,
+        "duplicates_skipped": duplicate_count,
+        "fingerprint": row_set_fingerprint(accepted_row_keys),
+    }
+
 
 def validate_csv_columns(func):
     @wraps(func)
@@ -23,26 +124,21 @@ def validate_csv_columns(func):
         if not file_objs:
             return Response({"error": "Missing file"}, status=status.HTTP_400_BAD_REQUEST)
 
-        dataframes = []
         try:
             for file_obj in file_objs:
-                file_obj.seek(0)
-                df = pd.read_csv(file_obj)
-                if not set(EXPECTED_COLUMNS).issubset(set(df.columns)):
+                columns = read_csv_header(file_obj)
+                if not set(EXPECTED_COLUMNS).issubset(set(columns)):
                     return Response({
                         "error": "CSV headers do not match expected columns.",
                         "expected_columns": EXPECTED_COLUMNS,
-                        "found_columns": list(df.columns),
+                        "found_columns": columns,
                         "file": getattr(file_obj, "name", "upload.csv"),
                     }, status=status.HTTP_400_BAD_REQUEST)
-                dataframes.append(df)
+
+            request.viewing_history = read_viewing_history(file_objs)
         except Exception as e:
             return Response({"error": "Failed to read CSV: " + str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        request.csv_dfs = dataframes
-        request.csv_df = pd.concat(dataframes, ignore_index=True) if len(dataframes) > 1 else dataframes[0]
-
         return func(self, request, *args, **kwargs)
 
     return wrapper
-
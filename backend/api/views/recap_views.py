@@ -1,8 +1,6 @@
-from collections import defaultdict
 import logging
 import uuid
 
-import pandas as pd
 from django.core.cache import cache
 from rest_framework import status
 from rest_framework.parsers import FormParser, MultiPartParser
@@ -14,18 +12,20 @@ from redis.exceptions import RedisError
 from utils.data_analysis import getJsonGraphData
 
 from ..authentication import JWTCookieAuthentication
-from ..models import NetflixProfile, ViewingEvent
+from ..models import NetflixProfile, Upload, ViewingEvent
 from ..services.recap_cache import (
     ANONYMOUS_CACHE_TTL_SECONDS,
     anonymous_expiry,
     create_processing_state,
     get_processing_state,
     job_status_key,
-    load_upload,
+    load_parsed_upload,
     owner_key,
     processing_status_payload,
     ready_profile_years,
+    remember_upload_fingerprint,
     result_cache_key,
+    reusable_upload_job,
     set_processing_state,
     store_upload,
     update_processing_state,
@@ -36,15 +36,19 @@ from ..services.recap_data import (
     is_all_years,
     profile_comparisons_from_dataframe,
     profile_events,
+    profile_years,
+    recap_trends,
     repair_cached_graph_data,
     saved_or_generated_recap,
     year_comparison_payload,
+    year_recaps,
 )
 from ..services.recap_jobs import (
     enqueue_authenticated_recap,
     enqueue_anonymous_recap,
     process_initial_profile_year,
 )
+from ..services.viewing_ingestion import count_known_rows
 from ..utils import validate_csv_columns
 
 
@@ -57,6 +61,15 @@ def get_authenticated_user(request):
     return None
 
 
+def upload_session_key(request, user_obj, create=False):
+    """Session that scopes an anonymous upload's reuse; saved uploads need none."""
+    if user_obj:
+        return None
+    if create and not request.session.session_key:
+        request.session.create()
+    return request.session.session_key
+
+
 def get_requested_recap(request, profile_field="profile_name"):
     return (
         str(request.data.get(profile_field) or "").strip(),
@@ -84,6 +97,30 @@ def default_profile_year(profile_years_map):
     return None, None
 
 
+def upload_response(
+    message,
+    job_id,
+    processing_state,
+    profile_years_map,
+    user_obj,
+    expires_at,
+    merge_stats,
+    reused=False,
+):
+    return Response({
+        "message": message,
+        "profile_years": profile_years_map,
+        "ready_profile_years": ready_profile_years(processing_state),
+        "processing_state": processing_state,
+        "job_id": job_id,
+        "status": processing_state.get("status", "processing"),
+        "is_persisted": bool(user_obj),
+        "expires_at": expires_at,
+        "reused": reused,
+        "merge_stats": merge_stats,
+    })
+
+
 class ViewingHistoryUploadView(APIView):
     """
     Quick extraction that immediately returns profile/year options
@@ -103,33 +140,71 @@ class ViewingHistoryUploadView(APIView):
         user_obj = get_authenticated_user(request)
 
         try:
-            # Quick validation and profile/year extraction
-            raw_row_count = sum(len(csv_df) for csv_df in getattr(request, "csv_dfs", []))
-            df = request.csv_df.copy()
-            before_dedup_count = len(df)
-            df = df.drop_duplicates(
-                subset=["Profile Name", "Start Time", "Duration", "Title"],
-                keep="first",
-            )
-            duplicate_count = before_dedup_count - len(df)
+            viewing_history = request.viewing_history
+            df = viewing_history["dataframe"]
+            profile_years_map = viewing_history["profile_years_map"]
+            duplicate_count = viewing_history["duplicates_skipped"]
             source_filename = ", ".join(getattr(file, "name", "upload.csv") for file in uploaded_files)
-            logger.info("Validated viewing history with %s rows", len(df))
-            # Quick extraction of profile/year combinations
-            df['parsed_start_time'] = pd.to_datetime(df["Start Time"], errors="coerce")
-            df = df.dropna(subset=['parsed_start_time', 'Profile Name'])
-            df['year'] = df['parsed_start_time'].dt.year
-
-            profile_year_df = df.groupby(['Profile Name', 'year']).size().reset_index(name='count')
-            
-            profile_years_map = defaultdict(set)
-            for _, row in profile_year_df.iterrows():
-                profile_years_map[row['Profile Name']].add(int(row['year']))
-            
-            profile_years_map = {
-                profile: sorted(list(years)) 
-                for profile, years in profile_years_map.items()
+            fingerprint = viewing_history["fingerprint"]
+
+            reused_job_id, reused_state, reused_merge_stats = reusable_upload_job(
+                fingerprint,
+                upload_session_key(request, user_obj),
+            )
+            if reused_job_id:
+                logger.info("Reusing job %s for an identical upload", reused_job_id)
+                return upload_response(
+                    "Identical upload found. Reusing earlier results.",
+                    reused_job_id,
+                    reused_state,
+                    profile_years_map,
+                    user_obj,
+                    reused_state.get("expires_at"),
+                    reused_merge_stats,
+                    reused=True,
+                )
+
+            known_rows_skipped = count_known_rows(user_obj, df) if user_obj else 0
+            logger.info(
+                "Validated viewing history with %s rows, %s already imported",
+                len(df),
+                known_rows_skipped,
+            )
+            merge_stats = {
+                "files_uploaded": len(uploaded_files),
+                "rows_read": viewing_history["rows_read"],
+                "duplicates_skipped": duplicate_count,
+                "rows_accepted": len(df),
+                "known_rows_skipped": known_rows_skipped,
             }
 
+            if user_obj and Upload.objects.filter(
+                user=user_obj,
+                fingerprint=fingerprint,
+                status=Upload.Status.COMPLETED,
+            ).exists():
+                # Everything in this file is already saved, so recaps are served from the database.
+                job_id = str(uuid.uuid4())
+                processing_state = create_processing_state(profile_years_map, status_value="ready")
+                processing_state["status"] = "completed"
+                set_processing_state(job_id, processing_state)
+                cache.set(
+                    job_status_key(job_id),
+                    "completed",
+                    timeout=ANONYMOUS_CACHE_TTL_SECONDS,
+                )
+                logger.info("Identical upload already saved; skipping processing for job %s", job_id)
+                return upload_response(
+                    "Identical upload already saved. Reusing saved recaps.",
+                    job_id,
+                    processing_state,
+                    profile_years_map,
+                    user_obj,
+                    None,
+                    merge_stats,
+                    reused=True,
+                )
+
             job_id = str(uuid.uuid4())
             recap_owner = owner_key(user_obj, job_id)
             expires_at = None if user_obj else anonymous_expiry()
@@ -145,9 +220,16 @@ class ViewingHistoryUploadView(APIView):
                 "profile_years_map": profile_years_map,
                 "owner_key": recap_owner,
                 "job_id": job_id,
+                "fingerprint": fingerprint,
                 "expires_at": expires_at.isoformat() if expires_at else None,
             }
             store_upload(recap_owner, job_id, upload_data)
+            remember_upload_fingerprint(
+                fingerprint,
+                job_id,
+                merge_stats,
+                upload_session_key(request, user_obj, create=True),
+            )
             set_processing_state(job_id, processing_state)
 
             initial_profile, initial_year = default_profile_year(profile_years_map)
@@ -185,22 +267,15 @@ class ViewingHistoryUploadView(APIView):
                 else:
                     enqueue_anonymous_recap(job_id, recap_owner, profile_years_map)
 
-            return Response({
-                "message": "CSV uploaded successfully. Processing in background.",
-                "profile_years": profile_years_map,
-                "ready_profile_years": ready_profile_years(processing_state),
-                "processing_state": processing_state,
-                "job_id": job_id,
-                "status": processing_state.get("status", "processing"),
-                "is_persisted": bool(user_obj),
-                "expires_at": expires_at.isoformat() if expires_at else None,
-                "merge_stats": {
-                    "files_uploaded": len(uploaded_files),
-                    "rows_read": raw_row_count,
-                    "duplicates_skipped": duplicate_count,
-                    "rows_accepted": len(df),
-                },
-            })
+            return upload_response(
+                "CSV uploaded successfully. Processing in background.",
+                job_id,
+                processing_state,
+                profile_years_map,
+                user_obj,
+                expires_at.isoformat() if expires_at else None,
+                merge_stats,
+            )
 
         except RedisError:
             logger.exception("Redis is unavailable during viewing history upload")
@@ -398,27 +473,18 @@ class YearComparisonView(APIView):
                 if not events_a.exists() or not events_b.exists():
                     return not_found_response("One or both years are missing")
 
-                graph_a = saved_or_generated_recap(
+                recap_a, recap_b = year_recaps(
                     user_obj,
                     profile,
-                    events_a,
-                    profile_name,
-                    year_a,
-                )
-                graph_b = saved_or_generated_recap(
-                    user_obj,
-                    profile,
-                    events_b,
-                    profile_name,
-                    year_b,
+                    [year_a, year_b],
                 )
                 return Response({
                     "status": "ready",
                     "data": year_comparison_payload(
                         year_a,
-                        graph_a,
+                        recap_a.data,
                         year_b,
-                        graph_b,
+                        recap_b.data,
                     ),
                 })
 
@@ -426,8 +492,8 @@ class YearComparisonView(APIView):
                 return Response({"status": "not_found", "message": "Anonymous comparisons require a job_id"}, status=404)
 
             recap_owner = owner_key(None, job_id)
-            csv_data, df = load_upload(recap_owner, job_id)
-            if df is None:
+            csv_data, df = load_parsed_upload(recap_owner, job_id)
+            if csv_data is None or df is None:
                 return Response({"status": "expired", "message": "Temporary upload expired"}, status=404)
 
             graphs = []
@@ -440,6 +506,8 @@ class YearComparisonView(APIView):
                     df,
                     profile_name,
                     year,
+                    recap_owner,
+                    job_id,
                 )
                 graphs.append(graph_data)
 
@@ -518,3 +586,30 @@ class SavedRecapView(APIView):
             year,
         )
         return ready_response(graph_data)
+
+
+class RecapTrendsView(APIView):
+    authentication_classes = [JWTCookieAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        profile_name = str(request.data.get("profile_name") or "").strip()
+        try:
+            years = int(request.data.get("years") or 0)
+        except (TypeError, ValueError):
+            years = -1
+        if not profile_name or years < 0:
+            return Response(
+                {"error": "profile_name is required and years must be a positive number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        profile, events = profile_events(request.user, profile_name, "all")
+        if not profile or not events.exists():
+            return not_found_response()
+
+        # Only the most recent ``years`` when given, otherwise every year
+        recent_years = profile_years(events)[-years:] if years else profile_years(events)
+        return ready_response(
+            recap_trends(year_recaps(request.user, profile, recent_years))
+        )
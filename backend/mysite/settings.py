@@ -31,6 +31,12 @@ TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 OMDB_API_KEY = os.getenv("OMDB_API_KEY")  # optional
 TMDB_ENRICHMENT_MAX_TITLES = int(os.getenv("TMDB_ENRICHMENT_MAX_TITLES", "50"))
 TMDB_ENRICHMENT_MAX_CALLS = int(os.getenv("TMDB_ENRICHMENT_MAX_CALLS", "100"))
+VIEWING_EVENT_COPY_THRESHOLD = int(os.getenv("VIEWING_EVENT_COPY_THRESHOLD", "5000"))
+VIEWING_INGEST_CHUNK_ROWS = int(os.getenv("VIEWING_INGEST_CHUNK_ROWS", "10000"))
+TITLE_PARSE_WORKERS = int(os.getenv("TITLE_PARSE_WORKERS", "1"))
+TITLE_PARSE_PARALLEL_MIN_TITLES = int(os.getenv("TITLE_PARSE_PARALLEL_MIN_TITLES", "20000"))
+RECAP_SECTION_EXECUTOR = os.getenv("RECAP_SECTION_EXECUTOR", "serial")
+RECAP_SECTION_WORKERS = int(os.getenv("RECAP_SECTION_WORKERS", str(os.cpu_count() or 1)))
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 FRONTEND_ORIGINS = [
     origin.strip()
@@ -1,13 +1,14 @@
+import numpy as np
 import pandas as pd
-import os
-import json
 import logging
-import string
+import threading
+from functools import partial
 from time import perf_counter
 
 from utils.workflows import (
-    K_NETFLIX_TITLES,
+    compactRecapFrame,
     dataframeSetUp,
+    frameBytesPerRow,
     generateMediaType,
     generateRatings,
     generateShowTitles,
@@ -15,14 +16,22 @@ from utils.workflows import (
     getMostWatchedRatingsData,
     getTotalTitleWatchtimeData,
     getTotalTypeWatchtimeData,
-    preprocessTitles,
+    emitRecords,
+    shallowCopy,
 )
-from utils.recap_payload import DEFAULT_RECAP_SECTIONS, build_recap_payload
+from utils.metadata_resolver import METADATA_RESOLVER
+from utils.recap_accumulator import POSTER_COLUMNS, RecapAccumulator
+from utils.recap_cube import EVENTS, HOURS, RecapCube
+from utils.recap_payload import DEFAULT_RECAP_SECTIONS, SharedFrame, build_recap_payload
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 GRAPH_SCHEMA_VERSION = 5
-METADATA_OVERRIDES_CACHE = None
 logger = logging.getLogger(__name__)
+# Pre-aggregated frames, such as rollups of stored history, use one row for
+# several events of a title and carry their event-level facts in these columns
+SHORT_EVENTS = "Short Events"
+FINISHED_EVENTS = "Finished Events"
+LONGEST_SECONDS = "Longest Seconds"
+LAST_START_TIME = "Last Start Time"
 COUNTRY_CODE_LABELS = {
     "US": "United States",
     "KR": "South Korea",
@@ -79,34 +88,6 @@ def _longest_date_streak(dates):
     return longest
 
 
-def _metadata_for_title(title):
-    if not title or title == "Unknown":
-        return {}
-
-    matches = K_NETFLIX_TITLES[K_NETFLIX_TITLES["title"] == title]
-    if matches.empty:
-        normalized = preprocessTitles(str(title).strip().lower())
-        matches = K_NETFLIX_TITLES[K_NETFLIX_TITLES["normalized title"] == normalized]
-    if matches.empty:
-        return {}
-    return matches.iloc[0].to_dict()
-
-
-def _manual_metadata_for_title(title):
-    global METADATA_OVERRIDES_CACHE
-    if METADATA_OVERRIDES_CACHE is None:
-        overrides_path = os.path.join(BASE_DIR, "title_metadata_overrides.json")
-        try:
-            with open(overrides_path, "r", encoding="utf-8") as handle:
-                METADATA_OVERRIDES_CACHE = json.load(handle)
-        except FileNotFoundError:
-            METADATA_OVERRIDES_CACHE = {}
-    normalized = str(title).strip().lower().translate(
-        str.maketrans({char: " " for char in string.punctuation})
-    )
-    return METADATA_OVERRIDES_CACHE.get(" ".join(normalized.split()), {})
-
-
 def _split_genres(value):
     if isinstance(value, list):
         return [genre for genre in value if genre] or ["Unknown"]
@@ -191,105 +172,338 @@ def _metadata_country_label(value):
     return COUNTRY_CODE_LABELS.get(country.upper(), country)
 
 
+def _resolve_row_metadata(titles: pd.Series) -> np.ndarray:
+    """Resolve metadata once per distinct title and join it back onto rows."""
+    codes, uniques = pd.factorize(titles)
+    distinct = list(uniques)
+    if (codes == -1).any():
+        distinct.append(np.nan)
+    resolved = np.empty(len(uniques) + 1, dtype=object)
+    resolved[:len(distinct)] = METADATA_RESOLVER.resolve_many(distinct)
+    return resolved[codes]
+
+
+def _cached_column(df: pd.DataFrame, column: str, fallbacks) -> list:
+    if column not in df.columns:
+        return list(fallbacks)
+    return [
+        _cached_value({column: value}, column, fallback)
+        for value, fallback in zip(df[column].tolist(), fallbacks)
+    ]
+
+
 def enrichWithTitleMetadata(df: pd.DataFrame) -> pd.DataFrame:
-    working_df = df.copy()
-    metadata_rows = working_df["New Title"].apply(_metadata_for_title)
-    manual_metadata_rows = working_df["New Title"].apply(_manual_metadata_for_title)
-
-    working_df["Genres"] = working_df.apply(
-        lambda row: _split_genres(
-            _cached_value(
-                row,
-                "Metadata Genres",
-                manual_metadata_rows.loc[row.name].get("genres") or metadata_rows.loc[row.name].get("listed_in"),
-            )
-        ),
-        axis=1,
+    working_df = shallowCopy(df)
+    resolved_rows = _resolve_row_metadata(working_df["New Title"])
+    metadata_rows = [resolved["catalog"] for resolved in resolved_rows]
+    manual_metadata_rows = [resolved["override"] for resolved in resolved_rows]
+
+    genres = _cached_column(
+        working_df,
+        "Metadata Genres",
+        [
+            manual.get("genres") or metadata.get("listed_in")
+            for manual, metadata in zip(manual_metadata_rows, metadata_rows)
+        ],
     )
+    working_df["Genres"] = pd.Series([_split_genres(value) for value in genres], index=working_df.index, dtype=object)
     working_df["Primary Genre"] = working_df["Genres"].apply(lambda genres: genres[0])
-    working_df["Release Year"] = working_df.apply(
-        lambda row: _cached_value(
-            row,
+    working_df["Release Year"] = pd.Series(
+        _cached_column(
+            working_df,
             "Metadata Release Year",
-            manual_metadata_rows.loc[row.name].get("release_year") or metadata_rows.loc[row.name].get("release_year"),
+            [
+                manual.get("release_year") or metadata.get("release_year")
+                for manual, metadata in zip(manual_metadata_rows, metadata_rows)
+            ],
         ),
-        axis=1,
+        index=working_df.index,
     )
     working_df["Release Period"] = working_df["Release Year"].apply(_release_period)
-    working_df["Metadata Country"] = working_df.apply(
-        lambda row: _cached_value(
-            row,
-            "Metadata Origin Countries",
-            manual_metadata_rows.loc[row.name].get("origin_countries") or metadata_rows.loc[row.name].get("country"),
-        ),
-        axis=1,
+    countries = _cached_column(
+        working_df,
+        "Metadata Origin Countries",
+        [
+            manual.get("origin_countries") or metadata.get("country")
+            for manual, metadata in zip(manual_metadata_rows, metadata_rows)
+        ],
     )
-    working_df["Metadata Country"] = working_df["Metadata Country"].apply(
-        lambda value: _metadata_country_from_codes(value)
-        if isinstance(value, list)
-        else _metadata_country_label(value)
+    working_df["Metadata Country"] = pd.Series(
+        [
+            _metadata_country_from_codes(value)
+            if isinstance(value, list)
+            else _metadata_country_label(value)
+            for value in countries
+        ],
+        index=working_df.index,
     )
-    working_df["Runtime Bucket"] = working_df.apply(
-        lambda row: (
-            _runtime_bucket_from_minutes(row.get("Type"), row.get("Metadata Runtime Minutes"))
-            if row.get("Metadata Runtime Minutes")
-            else _runtime_bucket(metadata_rows.loc[row.name].get("type"), metadata_rows.loc[row.name].get("duration"))
+    runtime_minutes = (
+        working_df["Metadata Runtime Minutes"].tolist()
+        if "Metadata Runtime Minutes" in working_df.columns
+        else [None] * len(working_df)
+    )
+    media_types = working_df["Type"].tolist() if "Type" in working_df.columns else [None] * len(working_df)
+    working_df["Runtime Bucket"] = pd.Series(
+        [
+            _runtime_bucket_from_minutes(media_type, minutes)
+            if minutes
+            else _runtime_bucket(metadata.get("type"), metadata.get("duration"))
+            for media_type, minutes, metadata in zip(media_types, runtime_minutes, metadata_rows)
+        ],
+        index=working_df.index,
+    )
+    working_df["Poster URL"] = pd.Series(
+        _cached_column(
+            working_df,
+            "Metadata Poster URL",
+            [manual.get("poster_url") or "" for manual in manual_metadata_rows],
         ),
-        axis=1,
+        index=working_df.index,
     )
-    working_df["Poster URL"] = working_df.apply(
-        lambda row: _cached_value(row, "Metadata Poster URL", manual_metadata_rows.loc[row.name].get("poster_url") or ""),
-        axis=1,
+    return compactRecapFrame(working_df)
+
+
+def _map_distinct(values: pd.Series, func) -> pd.Series:
+    return values.map({value: func(value) for value in values.unique()})
+
+
+RECAP_DERIVED_COLUMNS = {
+    "Started Date": lambda context: context.df["Start Time"].dt.date,
+    "Day Of Week": lambda context: context.df["Start Time"].dt.day_name(),
+    "Day Index": lambda context: context.df["Start Time"].dt.dayofweek.astype("int8"),
+    "Hour": lambda context: context.df["Start Time"].dt.hour.astype("int8"),
+    "Date": lambda context: _map_distinct(context.column("Started Date"), lambda value: value.isoformat()),
+    "Daypart": lambda context: _map_distinct(context.column("Hour"), lambda hour: _daypart_for_hour(hour)[0]),
+    "Daypart Index": lambda context: _map_distinct(context.column("Hour"), lambda hour: _daypart_for_hour(hour)[1]),
+    "Month Label": lambda context: _map_distinct(context.df["Month"], _month_label),
+}
+
+# Calendar dimensions of the recap cube, derived once per distinct month, date or hour
+RECAP_CUBE_DERIVED_DIMENSIONS = {
+    "Month Label": ("Month", lambda month: _month_label(month)),
+    "Date": ("Started Date", lambda value: value.isoformat()),
+    "Day Of Week": ("Started Date", lambda value: pd.Timestamp(value).day_name()),
+    "Day Index": ("Started Date", lambda value: value.weekday()),
+    "Daypart": ("Hour", lambda hour: _daypart_for_hour(hour)[0]),
+    "Daypart Index": ("Hour", lambda hour: _daypart_for_hour(hour)[1]),
+}
+
+
+def _optional_column(df, column, default):
+    if column not in df.columns:
+        return pd.Series(default, index=df.index)
+    values = df[column]
+    if not values.hasnans:
+        return values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Categoricals only take fill values that are already categories
+        values = values.astype(object)
+    return values.fillna(default)
+
+
+def _recap_cube_dimensions(context) -> pd.DataFrame:
+    enriched = context.enriched
+    # Frames without start times still roll up by month and title
+    timed = (
+        {"Started Date": context.column("Started Date"), "Hour": context.column("Hour")}
+        if "Start Time" in enriched.columns
+        else {}
+    )
+    return pd.DataFrame(
+        {
+            **timed,
+            "Month": enriched["Month"],
+            "New Title": enriched["New Title"],
+            "Series Title": _optional_column(enriched, "Series Title", enriched["New Title"]),
+            "Season Label": _optional_column(enriched, "Season Label", ""),
+            "Episode Title": _optional_column(enriched, "Episode Title", ""),
+            "Is Episode": _optional_column(enriched, "Is Episode", False).astype(bool),
+            "Type": enriched["Type"],
+            "Rating": enriched["Rating"],
+            "Genres": [tuple(genres) for genres in enriched["Genres"].tolist()],
+            "Primary Genre": enriched["Primary Genre"],
+            "Release Period": enriched["Release Period"],
+            "Metadata Country": enriched["Metadata Country"],
+            "Runtime Bucket": enriched["Runtime Bucket"],
+            "Title": _optional_column(enriched, "Title", enriched["New Title"]),
+        },
+        index=enriched.index,
     )
-    return working_df
 
 
-def _poster_for_title(df: pd.DataFrame, title: str) -> str:
-    if not title or "Poster URL" not in df.columns:
-        return ""
-    series_match = df["Series Title"] == title if "Series Title" in df.columns else False
-    matches = df[(df["New Title"] == title) | series_match]
-    if len(matches) == 0:
-        return ""
-    posters = matches["Poster URL"].dropna()
-    posters = posters[posters.astype(str).str.strip() != ""]
-    return str(posters.iloc[0]) if len(posters) else ""
+def _first_sorted_position(values, ascending):
+    # Position of the first row once sorted by values, without reordering every column
+    return values.reset_index(drop=True).sort_values(ascending=ascending, kind="stable").index[0]
 
 
-def _top_title_posters(df: pd.DataFrame, limit=5) -> list:
-    if "Poster URL" not in df.columns:
-        return []
-    grouped = (
-        df.groupby("New Title", as_index=False)
-        .agg(
-            hrs=("Watchtime (hrs)", "sum"),
-            poster_url=("Poster URL", lambda values: next(
-                (str(value) for value in values if pd.notna(value) and str(value).strip()),
-                "",
-            )),
-        )
-        .sort_values("hrs", ascending=False)
+def _event_count(df, column, mask):
+    # Events matching mask, or the per-row counts of a pre-aggregated frame
+    if column in df.columns:
+        return int(df[column].sum())
+    return int(mask.sum())
+
+
+def _event_facts(df: pd.DataFrame) -> dict:
+    # Event-level facts the cube can't answer, in the mergeable form of RecapAccumulator
+    longest_hours = (
+        df[LONGEST_SECONDS] / 3600
+        if LONGEST_SECONDS in df.columns
+        else df["Watchtime (hrs)"]
     )
-    grouped = grouped[grouped["poster_url"] != ""].head(limit)
-    return [
+    last_started = (
+        pd.to_datetime(df[LAST_START_TIME])
+        if LAST_START_TIME in df.columns
+        else df["Start Time"]
+    )
+    longest = _first_sorted_position(longest_hours, ascending=False)
+    first = _first_sorted_position(df["Start Time"], ascending=True)
+    last = _first_sorted_position(last_started, ascending=False)
+    return {
+        "short_events": _event_count(df, SHORT_EVENTS, df["Watchtime (hrs)"] < (5 / 60)),
+        "finished_events": _event_count(df, FINISHED_EVENTS, df["Watchtime (hrs)"] >= (20 / 60)),
+        "longest": {"title": str(df["New Title"].iloc[longest]), "hours": float(longest_hours.iloc[longest])},
+        "first": {"title": str(df["New Title"].iloc[first]), "start": df["Start Time"].iloc[first]},
+        "last": {"title": str(df["New Title"].iloc[last]), "start": last_started.iloc[last]},
+    }
+
+
+def _listed_posters(df: pd.DataFrame) -> pd.DataFrame:
+    # First row listing each poster, by position in the frame
+    if "Poster URL" not in df.columns:
+        return pd.DataFrame(columns=POSTER_COLUMNS)
+    poster_text = df["Poster URL"].astype(str)
+    listed = (df["Poster URL"].notna() & (poster_text.str.strip() != "")).to_numpy()
+    series_titles = df["Series Title"] if "Series Title" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    return pd.DataFrame(
         {
-            "title": row["New Title"],
-            "hrs": _round_number(row["hrs"]),
-            "poster_url": row["poster_url"],
+            "New Title": df["New Title"].to_numpy()[listed],
+            "Series Title": series_titles.to_numpy()[listed],
+            "Poster URL": poster_text.to_numpy()[listed],
+            "Position": np.flatnonzero(listed),
         }
-        for _, row in grouped.iterrows()
-    ]
+    ).drop_duplicates(POSTER_COLUMNS[:3], ignore_index=True)
+
+
+class RecapContext:
+    """
+    Transformed recap frame shared by every section builder of one recap.
+
+    Metadata enrichment and derived calendar columns are computed on first
+    use and memoized, once even when builders run on several threads.
+    Builders get copy-on-write copies from ``frame`` and may mutate them
+    freely; ``df``, ``enriched``, ``cube``, ``facts`` and ``posters`` are
+    shared and read-only. A context made from a ``RecapAccumulator`` has no frame;
+    sections only read its cube, facts and posters.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._enriched = None
+        self._cube = None
+        self._facts = None
+        self._posters = None
+        self._columns = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def of(cls, df) -> "RecapContext":
+        if isinstance(df, RecapAccumulator):
+            return cls.from_accumulator(df)
+        return df if isinstance(df, cls) else cls(df)
+
+    @classmethod
+    def from_accumulator(cls, accumulator: RecapAccumulator) -> "RecapContext":
+        context = cls(None)
+        context._cube = RecapCube.from_cells(accumulator.cells, derived=RECAP_CUBE_DERIVED_DIMENSIONS)
+        context._facts = accumulator.facts
+        context._posters = accumulator.posters
+        return context
+
+    def accumulator(self) -> RecapAccumulator:
+        return RecapAccumulator(self.cube.base_cells(), self.facts, self.posters, len(self.df))
+
+    @property
+    def enriched(self) -> pd.DataFrame:
+        with self._lock:
+            if self._enriched is None:
+                self._enriched = enrichWithTitleMetadata(self.df)
+        return self._enriched
+
+    @property
+    def cube(self) -> RecapCube:
+        with self._lock:
+            if self._cube is None:
+                # Durations are whole seconds; keep them exact in the cube
+                seconds = (
+                    self.df["Duration Seconds"].astype("int64")
+                    if "Duration Seconds" in self.df.columns
+                    else (self.df["Watchtime (hrs)"].fillna(0) * 3600).round().astype("int64")
+                )
+                self._cube = RecapCube.from_events(
+                    _recap_cube_dimensions(self),
+                    seconds,
+                    derived=RECAP_CUBE_DERIVED_DIMENSIONS,
+                    counts=self.df[EVENTS] if EVENTS in self.df.columns else None,
+                )
+        return self._cube
+
+    @property
+    def facts(self) -> dict:
+        with self._lock:
+            if self._facts is None:
+                self._facts = _event_facts(self.df)
+        return self._facts
+
+    @property
+    def posters(self) -> pd.DataFrame:
+        with self._lock:
+            if self._posters is None:
+                self._posters = _listed_posters(self.enriched)
+        return self._posters
+
+    def column(self, name: str) -> pd.Series:
+        with self._lock:
+            if name not in self._columns:
+                self._columns[name] = RECAP_DERIVED_COLUMNS[name](self)
+        return self._columns[name]
+
+    def frame(self, *columns: str, enriched=False) -> pd.DataFrame:
+        working_df = shallowCopy(self.enriched if enriched else self.df)
+        for name in columns:
+            working_df[name] = self.column(name)
+        return working_df
+
+
+def _poster_for_title(posters: pd.DataFrame, title: str) -> str:
+    if not title:
+        return ""
+    matches = posters[(posters["New Title"] == title) | (posters["Series Title"] == title)]
+    return str(matches["Poster URL"].iloc[0]) if len(matches) else ""
+
+
+def _top_title_posters(posters: pd.DataFrame, cube: RecapCube, limit=5) -> list:
+    if not len(posters):
+        return []
+    first_posters = posters.drop_duplicates("New Title").set_index("New Title")["Poster URL"]
+    grouped = cube.rollup(["New Title"]).rename(columns={HOURS: "hrs"})
+    grouped["poster_url"] = grouped["New Title"].map(first_posters).fillna("")
+    grouped = grouped.sort_values("hrs", ascending=False)
+    grouped = grouped[grouped["poster_url"] != ""].head(limit)
+    return emitRecords(
+        grouped,
+        {"title": "New Title", "hrs": ("hrs", "hrs"), "poster_url": "poster_url"},
+    )
 
 
 def _month_label(month):
     return pd.Timestamp(year=2000, month=int(month), day=1).strftime("%B")
 
 
-def _watching_personality(df):
-    avg_session_minutes = df["Watchtime (hrs)"].mean() * 60
-    night_hours = df[df["Start Time"].dt.hour >= 21]["Watchtime (hrs)"].sum()
-    weekend_hours = df[df["Start Time"].dt.dayofweek >= 5]["Watchtime (hrs)"].sum()
-    total_hours = df["Watchtime (hrs)"].sum() or 1
+def _watching_personality(cube: RecapCube):
+    avg_session_minutes = cube.total_seconds() / cube.total_events() / 60
+    night_hours = cube.subset(cube.column("Hour") >= 21).total_seconds() / 3600
+    weekend_hours = cube.subset(cube.column("Day Index") >= 5).total_seconds() / 3600
+    total_hours = cube.total_seconds() / 3600 or 1
 
     if night_hours / total_hours >= 0.35:
         return {
@@ -312,12 +526,18 @@ def _watching_personality(df):
     }
 
 
-def getWrappedCardsData(df: pd.DataFrame) -> dict:
-    working_df = enrichWithTitleMetadata(df)
-    working_df["Started Date"] = working_df["Start Time"].dt.date
+def getWrappedCardsData(
+    df: pd.DataFrame | RecapContext,
+    core_stats: dict | None = None,
+    title_level_insights: dict | None = None,
+) -> dict:
+    context = RecapContext.of(df)
+    cube = context.cube
 
-    title_insights = getTitleLevelInsightsData(working_df)
-    core_stats = getCoreStatsData(working_df)
+    title_insights = (
+        title_level_insights if title_level_insights is not None else getTitleLevelInsightsData(context)
+    )
+    core_stats = core_stats if core_stats is not None else getCoreStatsData(context)
 
     comfort_show = None
     if title_insights.get("rewatched_favorites"):
@@ -325,45 +545,38 @@ def getWrappedCardsData(df: pd.DataFrame) -> dict:
         comfort_show = {
             "value": top_rewatch["title"],
             "description": f"{top_rewatch['watch_count']} watches across {top_rewatch['active_days']} active days.",
-            "poster_url": _poster_for_title(working_df, top_rewatch["title"]),
+            "poster_url": _poster_for_title(context.posters, top_rewatch["title"]),
         }
     elif title_insights.get("top_shows"):
         top_show = title_insights["top_shows"][0]
         comfort_show = {
             "value": top_show["show"],
             "description": f"{top_show['hrs']} hours watched.",
-            "poster_url": _poster_for_title(working_df, top_show["show"]),
+            "poster_url": _poster_for_title(context.posters, top_show["show"]),
         }
 
-    month_grouped = (
-        working_df.groupby("Month", as_index=False)
-        .agg(
-            hrs=("Watchtime (hrs)", "sum"),
-            titles=("New Title", "nunique"),
-            genres=("Primary Genre", "nunique"),
-        )
-    )
+    month_grouped = cube.rollup(
+        ["Month"],
+        distinct={"titles": "New Title", "genres": "Primary Genre"},
+    ).rename(columns={HOURS: "hrs"})
     month_grouped["chaos_score"] = month_grouped["hrs"] + month_grouped["titles"] * 0.75 + month_grouped["genres"] * 1.5
     chaotic_month = month_grouped.sort_values("chaos_score", ascending=False).iloc[0]
 
     genre_era_df = (
-        working_df.groupby(["Primary Genre", "Release Period"], as_index=False)["Watchtime (hrs)"]
-        .sum()
+        cube.rollup(["Primary Genre", "Release Period"])
         .sort_values("Watchtime (hrs)", ascending=False)
     )
     top_genre_era = genre_era_df.iloc[0] if len(genre_era_df) else None
 
     binge_days = 0
-    total_active_days = max(working_df["Started Date"].nunique(), 1)
-    if len(working_df):
-        binge_days = int(
-            working_df.groupby("Started Date").size().loc[lambda values: values >= 3].count()
-        )
+    total_active_days = max(cube.distinct("Started Date"), 1)
+    if len(cube):
+        binge_days = int((cube.rollup(["Started Date"])[EVENTS] >= 3).sum())
     binge_rate = binge_days / total_active_days
     binge_percentile = min(99, max(1, round(45 + binge_rate * 95)))
 
     cards = {
-        "watching_personality": _watching_personality(working_df),
+        "watching_personality": _watching_personality(cube),
         "comfort_show": comfort_show or {
             "value": core_stats["longest_session"]["title"],
             "description": "Your longest single session title.",
@@ -389,42 +602,37 @@ def getWrappedCardsData(df: pd.DataFrame) -> dict:
             "total_watchtime_hours": core_stats["total_watchtime_hours"],
             "unique_titles": core_stats["unique_titles"],
         },
-        "top_title_posters": _top_title_posters(working_df),
+        "top_title_posters": _top_title_posters(context.posters, cube),
     }
     return cards
 
 
-def getCoreStatsData(df: pd.DataFrame) -> dict:
-    working_df = df.copy()
-    working_df["Started Date"] = working_df["Start Time"].dt.date
-    working_df["Day Of Week"] = working_df["Start Time"].dt.day_name()
-    working_df["Hour"] = working_df["Start Time"].dt.hour
+def getCoreStatsData(df: pd.DataFrame | RecapContext) -> dict:
+    context = RecapContext.of(df)
+    cube = context.cube
+    media_types = cube.column("Type")
 
-    total_watchtime = _round_number(working_df["Watchtime (hrs)"].sum())
-    total_events = int(len(working_df))
-    unique_titles = int(working_df["New Title"].nunique())
-    unique_movies = int(working_df[working_df["Type"] == "Movie"]["New Title"].nunique())
-    unique_shows = int(working_df[working_df["Type"] == "TV Show"]["New Title"].nunique())
-    average_session_minutes = _round_number(working_df["Watchtime (hrs)"].mean() * 60)
+    total_watchtime = _round_number(cube.total_seconds() / 3600)
+    total_events = cube.total_events()
+    unique_titles = cube.distinct("New Title")
+    unique_movies = cube.subset(media_types == "Movie").distinct("New Title")
+    unique_shows = cube.subset(media_types == "TV Show").distinct("New Title")
+    average_session_minutes = _round_number(cube.total_seconds() / total_events / 60)
 
-    longest_row = working_df.sort_values("Watchtime (hrs)", ascending=False).iloc[0]
-    first_row = working_df.sort_values("Start Time", ascending=True).iloc[0]
-    last_row = working_df.sort_values("Start Time", ascending=False).iloc[0]
+    facts = context.facts
+    longest = facts["longest"]
 
     active_day = (
-        working_df.groupby("Day Of Week")["Watchtime (hrs)"]
-        .sum()
+        cube.rollup(["Day Of Week"])
+        .set_index("Day Of Week")[HOURS]
         .sort_values(ascending=False)
     )
     active_hour = (
-        working_df.groupby("Hour")["Watchtime (hrs)"]
-        .sum()
+        cube.rollup(["Hour"])
+        .set_index("Hour")[HOURS]
         .sort_values(ascending=False)
     )
-    title_counts = working_df.groupby("New Title").size()
-
-    short_watch_count = int((working_df["Watchtime (hrs)"] < (5 / 60)).sum())
-    likely_finished_count = int((working_df["Watchtime (hrs)"] >= (20 / 60)).sum())
+    title_counts = cube.rollup(["New Title"])[EVENTS]
 
     return {
         "total_watchtime_hours": total_watchtime,
@@ -434,11 +642,11 @@ def getCoreStatsData(df: pd.DataFrame) -> dict:
         "unique_shows": unique_shows,
         "average_session_minutes": average_session_minutes,
         "longest_session": {
-            "title": str(longest_row["New Title"]),
-            "minutes": _round_number(longest_row["Watchtime (hrs)"] * 60),
-            "hours": _round_number(longest_row["Watchtime (hrs)"]),
+            "title": longest["title"],
+            "minutes": _round_number(longest["hours"] * 60),
+            "hours": _round_number(longest["hours"]),
         },
-        "longest_watch_streak_days": _longest_date_streak(working_df["Started Date"]),
+        "longest_watch_streak_days": _longest_date_streak(cube.column("Started Date").unique()),
         "most_active_day": {
             "day": str(active_day.index[0]),
             "hours": _round_number(active_day.iloc[0]),
@@ -449,34 +657,31 @@ def getCoreStatsData(df: pd.DataFrame) -> dict:
             "hours": _round_number(active_hour.iloc[0]),
         },
         "first_watched_title": {
-            "title": str(first_row["New Title"]),
-            "date": first_row["Start Time"].date().isoformat(),
+            "title": facts["first"]["title"],
+            "date": facts["first"]["start"].date().isoformat(),
         },
         "last_watched_title": {
-            "title": str(last_row["New Title"]),
-            "date": last_row["Start Time"].date().isoformat(),
+            "title": facts["last"]["title"],
+            "date": facts["last"]["start"].date().isoformat(),
         },
         "rewatched_titles": int((title_counts > 1).sum()),
-        "short_watch_count": short_watch_count,
-        "likely_finished_count": likely_finished_count,
+        "short_watch_count": facts["short_events"],
+        "likely_finished_count": facts["finished_events"],
     }
 
 
 def _group_watchtime_records(df, group_keys, rename_map, limit=None):
-    grouped = (
-        df.groupby(group_keys, as_index=False)["Watchtime (hrs)"]
-        .sum()
-        .sort_values("Watchtime (hrs)", ascending=False)
-    )
+    if isinstance(df, RecapCube):
+        grouped = df.rollup(group_keys)
+    else:
+        grouped = df.groupby(group_keys, as_index=False, observed=True)["Watchtime (hrs)"].sum()
+    grouped = grouped.sort_values("Watchtime (hrs)", ascending=False)
     if limit:
         grouped = grouped.head(limit)
 
-    records = []
-    for _, row in grouped.iterrows():
-        record = {target: row[source] for source, target in rename_map.items()}
-        record["hrs"] = _round_number(row["Watchtime (hrs)"])
-        records.append(record)
-    return records
+    fields = {target: source for source, target in rename_map.items()}
+    fields["hrs"] = ("Watchtime (hrs)", "hrs")
+    return emitRecords(grouped, fields)
 
 
 def _prefer_known_rows(df, column):
@@ -486,45 +691,36 @@ def _prefer_known_rows(df, column):
     return known if len(known) else df
 
 
-def _title_group_records(df, group_keys, rename_map, limit=None, include_counts=True):
+def _prefer_known_cells(cube: RecapCube, column: str) -> RecapCube:
+    known = cube.column(column) != "Unknown"
+    return cube.subset(known) if known.any() else cube
+
+
+def _title_group_records(cube, group_keys, rename_map, limit=None, include_counts=True):
     grouped = (
-        df.groupby(group_keys, as_index=False)
-        .agg(
-            hrs=("Watchtime (hrs)", "sum"),
-            watch_count=("Watchtime (hrs)", "size"),
-            active_days=("Start Time", lambda values: values.dt.date.nunique()),
-        )
+        cube.rollup(group_keys, distinct={"active_days": "Started Date"})
+        .rename(columns={HOURS: "hrs", EVENTS: "watch_count"})
         .sort_values(["hrs", "watch_count"], ascending=[False, False])
     )
     if limit:
         grouped = grouped.head(limit)
 
-    records = []
-    for _, row in grouped.iterrows():
-        record = {target: row[source] for source, target in rename_map.items()}
-        record["hrs"] = _round_number(row["hrs"])
-        if include_counts:
-            record["watch_count"] = int(row["watch_count"])
-            record["active_days"] = int(row["active_days"])
-        records.append(record)
-    return records
-
-
-def getTitleLevelInsightsData(df: pd.DataFrame) -> dict:
-    working_df = df.copy()
-    working_df["Series Title"] = working_df.get("Series Title", working_df["New Title"]).fillna(working_df["New Title"])
-    working_df["Season Label"] = working_df.get("Season Label", "").fillna("")
-    working_df["Episode Title"] = working_df.get("Episode Title", "").fillna("")
-    working_df["Is Episode"] = working_df.get("Is Episode", False).fillna(False).astype(bool)
-    working_df["Started Date"] = working_df["Start Time"].dt.date
-
-    shows_df = working_df[
-        (working_df["Type"] == "TV Show") | (working_df["Is Episode"])
-    ].copy()
-    movies_df = working_df[working_df["Type"] == "Movie"].copy()
+    fields = {target: source for source, target in rename_map.items()}
+    fields["hrs"] = ("hrs", "hrs")
+    if include_counts:
+        fields["watch_count"] = ("watch_count", "int")
+        fields["active_days"] = ("active_days", "int")
+    return emitRecords(grouped, fields)
+
+
+def getTitleLevelInsightsData(df: pd.DataFrame | RecapContext) -> dict:
+    cube = RecapContext.of(df).cube
+    media_types = cube.column("Type")
+    shows_df = cube.subset((media_types == "TV Show") | cube.column("Is Episode"))
+    movies_df = cube.subset(media_types == "Movie")
 
     top_titles = _title_group_records(
-        working_df,
+        cube,
         ["New Title", "Type"],
         {"New Title": "title", "Type": "type"},
         limit=10,
@@ -544,59 +740,64 @@ def getTitleLevelInsightsData(df: pd.DataFrame) -> dict:
 
     episodes_per_show = []
     if len(shows_df):
+        named_episodes = (
+            shows_df.subset(shows_df.column("Episode Title") != "")
+            .rollup(["Series Title"], distinct={"episodes": "Episode Title"})
+            .set_index("Series Title")["episodes"]
+        )
+        episode_grouped = shows_df.rollup(["Series Title"]).rename(columns={EVENTS: "watches", HOURS: "hrs"})
+        episode_grouped["episodes"] = (
+            episode_grouped["Series Title"].map(named_episodes).fillna(0).astype("int64")
+        )
         episode_grouped = (
-            shows_df.groupby("Series Title", as_index=False)
-            .agg(
-                episodes=("Episode Title", lambda values: int(values.replace("", pd.NA).dropna().nunique())),
-                watches=("Episode Title", "size"),
-                hrs=("Watchtime (hrs)", "sum"),
-            )
+            episode_grouped
             .sort_values(["episodes", "watches", "hrs"], ascending=[False, False, False])
             .head(10)
         )
-        episodes_per_show = [
+        # Shows without named episodes count each watch as an episode
+        episode_grouped["episodes"] = episode_grouped["episodes"].where(
+            episode_grouped["episodes"] != 0,
+            episode_grouped["watches"],
+        )
+        episodes_per_show = emitRecords(
+            episode_grouped,
             {
-                "show": row["Series Title"],
-                "episodes": int(row["episodes"] or row["watches"]),
-                "watches": int(row["watches"]),
-                "hrs": _round_number(row["hrs"]),
-            }
-            for _, row in episode_grouped.iterrows()
-        ]
+                "show": "Series Title",
+                "episodes": ("episodes", "int"),
+                "watches": ("watches", "int"),
+                "hrs": ("hrs", "hrs"),
+            },
+        )
 
     season_watchtime = []
-    season_df = shows_df[shows_df["Season Label"] != ""]
+    season_df = shows_df.subset(shows_df.column("Season Label") != "")
     if len(season_df):
         season_grouped = (
-            season_df.groupby(["Series Title", "Season Label"], as_index=False)
-            .agg(
-                hrs=("Watchtime (hrs)", "sum"),
-                watch_count=("Watchtime (hrs)", "size"),
-                active_days=("Start Time", lambda values: values.dt.date.nunique()),
-            )
+            season_df.rollup(["Series Title", "Season Label"], distinct={"active_days": "Started Date"})
+            .rename(columns={HOURS: "hrs", EVENTS: "watch_count"})
             .sort_values("hrs", ascending=False)
             .head(12)
         )
-        season_watchtime = [
+        season_grouped["label"] = (
+            season_grouped["Series Title"].astype(str) + " - " + season_grouped["Season Label"].astype(str)
+        )
+        season_watchtime = emitRecords(
+            season_grouped,
             {
-                "show": row["Series Title"],
-                "season": row["Season Label"],
-                "label": f"{row['Series Title']} - {row['Season Label']}",
-                "hrs": _round_number(row["hrs"]),
-                "watch_count": int(row["watch_count"]),
-                "active_days": int(row["active_days"]),
-            }
-            for _, row in season_grouped.iterrows()
-        ]
+                "show": "Series Title",
+                "season": "Season Label",
+                "label": "label",
+                "hrs": ("hrs", "hrs"),
+                "watch_count": ("watch_count", "int"),
+                "active_days": ("active_days", "int"),
+            },
+        )
 
     most_binged_series = []
     if len(shows_df):
         binge_grouped = (
-            shows_df.groupby(["Series Title", "Started Date"], as_index=False)
-            .agg(
-                episode_watches=("Episode Title", "size"),
-                hrs=("Watchtime (hrs)", "sum"),
-            )
+            shows_df.rollup(["Series Title", "Started Date"])
+            .rename(columns={EVENTS: "episode_watches", HOURS: "hrs"})
             .sort_values(["episode_watches", "hrs"], ascending=[False, False])
         )
         best_binge_by_show = (
@@ -605,37 +806,34 @@ def getTitleLevelInsightsData(df: pd.DataFrame) -> dict:
             .sort_values(["episode_watches", "hrs"], ascending=[False, False])
             .head(10)
         )
-        most_binged_series = [
+        most_binged_series = emitRecords(
+            best_binge_by_show,
             {
-                "show": row["Series Title"],
-                "date": row["Started Date"].isoformat(),
-                "episode_watches": int(row["episode_watches"]),
-                "hrs": _round_number(row["hrs"]),
-            }
-            for _, row in best_binge_by_show.iterrows()
-        ]
+                "show": "Series Title",
+                "date": ("Started Date", "iso"),
+                "episode_watches": ("episode_watches", "int"),
+                "hrs": ("hrs", "hrs"),
+            },
+        )
 
     rewatch_grouped = (
-        working_df.groupby(["New Title", "Type"], as_index=False)
-        .agg(
-            watch_count=("Watchtime (hrs)", "size"),
-            hrs=("Watchtime (hrs)", "sum"),
-            active_days=("Start Time", lambda values: values.dt.date.nunique()),
-        )
+        cube.rollup(["New Title", "Type"], distinct={"active_days": "Started Date"})
+        .rename(columns={EVENTS: "watch_count", HOURS: "hrs"})
     )
-    rewatched = rewatch_grouped[rewatch_grouped["watch_count"] > 1].copy()
+    rewatched = rewatch_grouped[rewatch_grouped["watch_count"] > 1]
     rewatched = rewatched.sort_values(["watch_count", "hrs"], ascending=[False, False]).head(10)
-    rewatched_favorites = [
+    rewatched["repeat_watches"] = rewatched["watch_count"] - 1
+    rewatched_favorites = emitRecords(
+        rewatched,
         {
-            "title": row["New Title"],
-            "type": row["Type"],
-            "watch_count": int(row["watch_count"]),
-            "repeat_watches": int(row["watch_count"] - 1),
-            "active_days": int(row["active_days"]),
-            "hrs": _round_number(row["hrs"]),
-        }
-        for _, row in rewatched.iterrows()
-    ]
+            "title": "New Title",
+            "type": "Type",
+            "watch_count": ("watch_count", "int"),
+            "repeat_watches": ("repeat_watches", "int"),
+            "active_days": ("active_days", "int"),
+            "hrs": ("hrs", "hrs"),
+        },
+    )
 
     hidden_obsession = rewatched_favorites[0] if rewatched_favorites else None
 
@@ -651,19 +849,18 @@ def getTitleLevelInsightsData(df: pd.DataFrame) -> dict:
     }
 
 
-def getGenreContentInsightsData(df: pd.DataFrame) -> dict:
-    working_df = enrichWithTitleMetadata(df)
-    exploded_genres = working_df.explode("Genres")
-    known_genres = _prefer_known_rows(exploded_genres, "Genres")
-    known_periods = _prefer_known_rows(working_df, "Release Period")
-    known_countries = _prefer_known_rows(working_df, "Metadata Country")
-    known_runtime = _prefer_known_rows(working_df, "Runtime Bucket")
-    known_ratings = _prefer_known_rows(working_df, "Rating")
+def getGenreContentInsightsData(df: pd.DataFrame | RecapContext) -> dict:
+    cube = RecapContext.of(df).cube
+    exploded_genres = cube.explode("Genres")
+    known_genres = _prefer_known_cells(exploded_genres, "Genres")
+    known_periods = _prefer_known_cells(cube, "Release Period")
+    known_countries = _prefer_known_cells(cube, "Metadata Country")
+    known_runtime = _prefer_known_cells(cube, "Runtime Bucket")
+    known_ratings = _prefer_known_cells(cube, "Rating")
 
     top_genre_by_month = []
     monthly_genres = (
-        exploded_genres.groupby(["Month", "Genres"], as_index=False)["Watchtime (hrs)"]
-        .sum()
+        exploded_genres.rollup(["Month", "Genres"])
         .sort_values(["Month", "Watchtime (hrs)"], ascending=[True, False])
     )
     for month, month_df in monthly_genres.groupby("Month"):
@@ -712,41 +909,28 @@ def getGenreContentInsightsData(df: pd.DataFrame) -> dict:
             ["Runtime Bucket"],
             {"Runtime Bucket": "bucket"},
         ),
-        "rating_watchtime": getMostWatchedRatingsData(known_ratings),
+        "rating_watchtime": getMostWatchedRatingsData(known_ratings.rollup(["Rating"])),
     }
 
 
-def getVisualizationData(df: pd.DataFrame) -> dict:
-    working_df = enrichWithTitleMetadata(df)
-    working_df["Started Date"] = working_df["Start Time"].dt.date
-    working_df["Date"] = working_df["Started Date"].apply(lambda value: value.isoformat())
-    working_df["Day Of Week"] = working_df["Start Time"].dt.day_name()
-    working_df["Day Index"] = working_df["Start Time"].dt.dayofweek
-    working_df["Hour"] = working_df["Start Time"].dt.hour
-    working_df[["Daypart", "Daypart Index"]] = working_df["Hour"].apply(
-        lambda hour: pd.Series(_daypart_for_hour(hour))
-    )
-    working_df["Month Label"] = working_df["Month"].apply(_month_label)
+def getVisualizationData(df: pd.DataFrame | RecapContext) -> dict:
+    cube = RecapContext.of(df).cube
 
     day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     daypart_order = ["Late night", "Morning", "Afternoon", "Evening"]
 
-    day_totals = (
-        working_df.groupby(["Day Of Week", "Day Index"], as_index=False)["Watchtime (hrs)"]
-        .sum()
-        .sort_values("Day Index")
-    )
-    day_of_week = [
+    day_totals = cube.rollup(["Day Of Week", "Day Index"]).sort_values("Day Index")
+    day_of_week = emitRecords(
+        day_totals,
         {
-            "day": row["Day Of Week"],
-            "day_index": int(row["Day Index"]),
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in day_totals.iterrows()
-    ]
+            "day": "Day Of Week",
+            "day_index": ("Day Index", "int"),
+            "hrs": ("Watchtime (hrs)", "hrs"),
+        },
+    )
 
-    hour_totals = working_df.groupby("Hour", as_index=False)["Watchtime (hrs)"].sum()
-    hour_lookup = {int(row["Hour"]): row["Watchtime (hrs)"] for _, row in hour_totals.iterrows()}
+    hour_totals = cube.rollup(["Hour"])
+    hour_lookup = dict(zip(hour_totals["Hour"].astype("int64").tolist(), hour_totals[HOURS].tolist()))
     hour_of_day = [
         {
             "hour": hour,
@@ -756,17 +940,14 @@ def getVisualizationData(df: pd.DataFrame) -> dict:
         for hour in range(24)
     ]
 
-    daypart_totals = (
-        working_df.groupby(
-            ["Day Of Week", "Day Index", "Daypart", "Daypart Index"],
-            as_index=False,
-        )["Watchtime (hrs)"]
-        .sum()
-    )
-    daypart_lookup = {
-        (int(row["Day Index"]), int(row["Daypart Index"])): row["Watchtime (hrs)"]
-        for _, row in daypart_totals.iterrows()
-    }
+    daypart_totals = cube.rollup(["Day Index", "Daypart Index"])
+    daypart_lookup = dict(zip(
+        zip(
+            daypart_totals["Day Index"].astype("int64").tolist(),
+            daypart_totals["Daypart Index"].astype("int64").tolist(),
+        ),
+        daypart_totals[HOURS].tolist(),
+    ))
     daypart_by_day = [
         {
             "day": day,
@@ -779,62 +960,53 @@ def getVisualizationData(df: pd.DataFrame) -> dict:
         for daypart_index, daypart in enumerate(daypart_order)
     ]
 
-    calendar_totals = working_df.groupby("Date", as_index=False)["Watchtime (hrs)"].sum()
-    calendar = [
-        {
-            "date": row["Date"],
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in calendar_totals.sort_values("Date").iterrows()
-    ]
+    calendar_totals = cube.rollup(["Date"])
+    calendar = emitRecords(
+        calendar_totals.sort_values("Date"),
+        {"date": "Date", "hrs": ("Watchtime (hrs)", "hrs")},
+    )
 
     daily_timeline = calendar
 
-    monthly_type_df = (
-        working_df.groupby(["Month", "Month Label", "Type"], as_index=False)["Watchtime (hrs)"]
-        .sum()
-        .sort_values(["Month", "Type"])
-    )
-    movie_show_by_month = [
+    monthly_type_df = cube.rollup(["Month", "Month Label", "Type"]).sort_values(["Month", "Type"])
+    movie_show_by_month = emitRecords(
+        monthly_type_df,
         {
-            "month": row["Month Label"],
-            "month_number": int(row["Month"]),
-            "type": row["Type"],
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in monthly_type_df.iterrows()
-    ]
+            "month": "Month Label",
+            "month_number": ("Month", "int"),
+            "type": "Type",
+            "hrs": ("Watchtime (hrs)", "hrs"),
+        },
+    )
 
     title_rows = (
-        working_df.groupby(["New Title", "Primary Genre", "Type"], as_index=False)["Watchtime (hrs)"]
-        .sum()
+        cube.rollup(["New Title", "Primary Genre", "Type"])
         .sort_values("Watchtime (hrs)", ascending=False)
     )
-    title_bubbles = [
+    title_bubbles = emitRecords(
+        title_rows.head(60),
         {
-            "title": row["New Title"],
-            "genre": row["Primary Genre"],
-            "type": row["Type"],
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in title_rows.head(60).iterrows()
-    ]
+            "title": "New Title",
+            "genre": "Primary Genre",
+            "type": "Type",
+            "hrs": ("Watchtime (hrs)", "hrs"),
+        },
+    )
 
     genre_title_rows = (
-        working_df.groupby(["Primary Genre", "New Title"], as_index=False)["Watchtime (hrs)"]
-        .sum()
+        cube.rollup(["Primary Genre", "New Title"])
         .sort_values("Watchtime (hrs)", ascending=False)
     )
-    treemap = [
+    treemap = emitRecords(
+        genre_title_rows.head(120),
         {
-            "genre": row["Primary Genre"],
-            "title": row["New Title"],
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in genre_title_rows.head(120).iterrows()
-    ]
+            "genre": "Primary Genre",
+            "title": "New Title",
+            "hrs": ("Watchtime (hrs)", "hrs"),
+        },
+    )
 
-    active_dates = set(working_df["Started Date"].unique())
+    active_dates = set(cube.column("Started Date").unique())
     streak_dates = []
     for active_date in sorted(active_dates):
         before = active_date - pd.Timedelta(days=1)
@@ -856,12 +1028,17 @@ def getVisualizationData(df: pd.DataFrame) -> dict:
         "streak_calendar": {
             "days": calendar,
             "streak_dates": streak_dates,
-            "longest_streak_days": _longest_date_streak(working_df["Started Date"]),
+            "longest_streak_days": _longest_date_streak(cube.column("Started Date").unique()),
         },
     }
 
 
-def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, year: int) -> dict:
+def getHouseholdComparisonData(dataframe: pd.DataFrame, year: int) -> dict:
+    """
+    Comparison of every profile in the household, before any profile is
+    selected. ``projectProfileComparison`` derives each profile's view, so
+    one household result serves all of its profiles.
+    """
     df = dataframeSetUp(dataframe)
     if len(df) == 0:
         return {}
@@ -869,6 +1046,7 @@ def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, yea
     df = generateShowTitles(df)
     df = generateMediaType(df)
     df = generateRatings(df)
+    df = compactRecapFrame(df)
 
     profile_watchtime = _group_watchtime_records(
         df,
@@ -877,24 +1055,23 @@ def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, yea
     )
 
     type_split_df = (
-        df.groupby(["Profile Name", "Type"], as_index=False)["Watchtime (hrs)"]
+        df.groupby(["Profile Name", "Type"], as_index=False, observed=True)["Watchtime (hrs)"]
         .sum()
         .sort_values(["Profile Name", "Watchtime (hrs)"], ascending=[True, False])
     )
-    movie_show_split = [
+    movie_show_split = emitRecords(
+        type_split_df,
         {
-            "profile": row["Profile Name"],
-            "type": row["Type"],
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in type_split_df.iterrows()
-    ]
+            "profile": "Profile Name",
+            "type": "Type",
+            "hrs": ("Watchtime (hrs)", "hrs"),
+        },
+    )
 
     profile_titles = {
         profile: set(profile_df["New Title"].dropna().unique())
-        for profile, profile_df in df.groupby("Profile Name")
+        for profile, profile_df in df.groupby("Profile Name", observed=True)
     }
-    selected_titles = profile_titles.get(selected_profile, set())
 
     shared_titles = []
     all_title_profiles = {}
@@ -920,17 +1097,6 @@ def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, yea
             "total_titles": len(titles),
         })
 
-    overlap_scores = []
-    for profile, titles in profile_titles.items():
-        if profile == selected_profile:
-            continue
-        union = selected_titles | titles
-        overlap_scores.append({
-            "profile": profile,
-            "overlap_score": _round_number(len(selected_titles & titles) / len(union) * 100 if union else 0),
-            "shared_titles": len(selected_titles & titles),
-        })
-
     profile_similarity_links = []
     profile_names = sorted(profile_titles.keys())
     for source_index, source_profile in enumerate(profile_names):
@@ -947,26 +1113,26 @@ def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, yea
             })
 
     household_timeline_df = (
-        df.groupby(["Profile Name", "Month"], as_index=False)["Watchtime (hrs)"]
+        df.groupby(["Profile Name", "Month"], as_index=False, observed=True)["Watchtime (hrs)"]
         .sum()
         .sort_values(["Profile Name", "Month"])
     )
-    household_timeline = [
+    household_timeline = emitRecords(
+        household_timeline_df,
         {
-            "profile": row["Profile Name"],
-            "month": int(row["Month"]),
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in household_timeline_df.iterrows()
-    ]
+            "profile": "Profile Name",
+            "month": ("Month", "int"),
+            "hrs": ("Watchtime (hrs)", "hrs"),
+        },
+    )
 
     radar_rows = []
-    profile_genre_type_df = enrichWithTitleMetadata(df)
+    profile_genre_type_df = enrichWithTitleMetadata(df)[["Profile Name", "Genres", "Type", "Watchtime (hrs)"]]
     profile_genre_type_df = profile_genre_type_df.explode("Genres")
-    for profile, profile_df in df.groupby("Profile Name"):
+    for profile, profile_df in df.groupby("Profile Name", observed=True):
         title_set = set(profile_df["New Title"].dropna().unique())
         total_hrs = profile_df["Watchtime (hrs)"].sum()
-        event_count = len(profile_df)
+        event_count = int(profile_df[EVENTS].sum()) if EVENTS in profile_df.columns else len(profile_df)
         movie_hrs = profile_df.loc[profile_df["Type"] == "Movie", "Watchtime (hrs)"].sum()
         show_hrs = profile_df.loc[profile_df["Type"] == "TV Show", "Watchtime (hrs)"].sum()
         active_days = profile_df["Start Time"].dt.date.nunique()
@@ -981,19 +1147,19 @@ def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, yea
         })
 
     sankey_grouped = (
-        profile_genre_type_df.groupby(["Profile Name", "Genres", "Type"], as_index=False)["Watchtime (hrs)"]
+        profile_genre_type_df.groupby(["Profile Name", "Genres", "Type"], as_index=False, observed=True)["Watchtime (hrs)"]
         .sum()
         .sort_values("Watchtime (hrs)", ascending=False)
     )
-    sankey = [
+    sankey = emitRecords(
+        sankey_grouped.head(80),
         {
-            "profile": row["Profile Name"],
-            "genre": row["Genres"],
-            "type": row["Type"],
-            "hrs": _round_number(row["Watchtime (hrs)"]),
-        }
-        for _, row in sankey_grouped.head(80).iterrows()
-    ]
+            "profile": "Profile Name",
+            "genre": "Genres",
+            "type": "Type",
+            "hrs": ("Watchtime (hrs)", "hrs"),
+        },
+    )
 
     most_unique_profile = None
     if unique_title_counts:
@@ -1001,12 +1167,11 @@ def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, yea
 
     return {
         "year": "all" if str(year).lower() == "all" else int(year),
-        "selected_profile": selected_profile,
+        "profile_titles": {profile: sorted(titles) for profile, titles in profile_titles.items()},
         "profile_watchtime": profile_watchtime,
         "movie_show_split": movie_show_split,
         "shared_titles": sorted(shared_titles, key=lambda item: item["profile_count"], reverse=True)[:20],
         "unique_title_counts": sorted(unique_title_counts, key=lambda item: item["unique_titles"], reverse=True),
-        "overlap_scores": sorted(overlap_scores, key=lambda item: item["overlap_score"], reverse=True),
         "profile_similarity_links": sorted(
             profile_similarity_links,
             key=lambda item: item["similarity"],
@@ -1018,15 +1183,84 @@ def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, yea
         "sankey_profile_genre_type": sankey,
     }
 
-def getJsonGraphData(dataframe, user, year, sections=None):
-    context = {
-        "profile": user,
-        "year": str(year),
-        "input_rows": len(dataframe),
+
+def projectProfileComparison(household: dict, selected_profile: str) -> dict:
+    """``selected_profile``'s comparison out of ``getHouseholdComparisonData``."""
+    if not household:
+        return {}
+    profile_titles = {profile: set(titles) for profile, titles in household["profile_titles"].items()}
+    selected_titles = profile_titles.get(selected_profile, set())
+
+    overlap_scores = []
+    for profile, titles in profile_titles.items():
+        if profile == selected_profile:
+            continue
+        union = selected_titles | titles
+        overlap_scores.append({
+            "profile": profile,
+            "overlap_score": _round_number(len(selected_titles & titles) / len(union) * 100 if union else 0),
+            "shared_titles": len(selected_titles & titles),
+        })
+
+    return {
+        "year": household["year"],
+        "selected_profile": selected_profile,
+        "profile_watchtime": household["profile_watchtime"],
+        "movie_show_split": household["movie_show_split"],
+        "shared_titles": household["shared_titles"],
+        "unique_title_counts": household["unique_title_counts"],
+        "overlap_scores": sorted(overlap_scores, key=lambda item: item["overlap_score"], reverse=True),
+        "profile_similarity_links": household["profile_similarity_links"],
+        "most_unique_profile": household["most_unique_profile"],
+        "household_timeline": household["household_timeline"],
+        "radar_metrics": household["radar_metrics"],
+        "sankey_profile_genre_type": household["sankey_profile_genre_type"],
     }
-    total_start = perf_counter()
-    logger.info("recap generation started", extra=context)
 
+
+def getProfileComparisonData(dataframe: pd.DataFrame, selected_profile: str, year: int) -> dict:
+    return projectProfileComparison(getHouseholdComparisonData(dataframe, year), selected_profile)
+
+RECAP_SECTION_BUILDERS = {
+    "total_title_watchtime": lambda recap: getTotalTitleWatchtimeData(recap.cube.rollup(["Title"])),
+    "total_type_watchtime": lambda recap: getTotalTypeWatchtimeData(recap.cube.rollup(["Type"])),
+    "monthly_watchtime": lambda recap: getMonthlyWatchtimeData(recap.cube.rollup(["Month"])),
+    "ratings_watchtime": lambda recap: getMostWatchedRatingsData(recap.cube.rollup(["Rating"])),
+    "core_stats": lambda recap: getCoreStatsData(recap),
+    "title_level_insights": lambda recap: getTitleLevelInsightsData(recap),
+    "wrapped_cards": lambda recap, **upstream: getWrappedCardsData(recap, **upstream),
+    "genre_content_insights": lambda recap: getGenreContentInsightsData(recap),
+    "visualizations": lambda recap: getVisualizationData(recap),
+}
+
+
+def _build_section(recap, section_name, **upstream):
+    # Picklable by reference, so process pools can run it against a SharedFrame
+    return RECAP_SECTION_BUILDERS[section_name](recap, **upstream)
+
+
+def recapSectionBuilders(source, executor="serial"):
+    """
+    Section builders for ``build_recap_payload`` over one transformed frame
+    or a ``RecapAccumulator``.
+
+    Returns the builders and the ``SharedFrame`` backing them in process
+    mode, which the caller must close.
+    """
+    if executor == "process":
+        shared = SharedFrame(source, RecapContext.of)
+        recap = shared
+    else:
+        shared = None
+        recap = RecapContext.of(source)
+    builders = {
+        section_name: partial(_build_section, recap, section_name)
+        for section_name in RECAP_SECTION_BUILDERS
+    }
+    return builders, shared
+
+
+def _transformedRecapFrame(dataframe, context):
     setup_start = perf_counter()
     df = dataframeSetUp(dataframe)
     setup_ms = round((perf_counter() - setup_start) * 1000, 2)
@@ -1036,35 +1270,35 @@ def getJsonGraphData(dataframe, user, year, sections=None):
     )
     
     if len(df) == 0:
-        return {"error": "No data found after processing"}
+        return df, {"dataframe_setup": setup_ms}
 
     transform_start = perf_counter()
     df = generateShowTitles(df)
     df = generateMediaType(df)
     df = generateRatings(df)
+    df = compactRecapFrame(df)
     transform_ms = round((perf_counter() - transform_start) * 1000, 2)
     logger.info(
         "recap dataframe transforms completed",
-        extra={**context, "elapsed_ms": transform_ms},
+        extra={**context, "elapsed_ms": transform_ms, "bytes_per_row": frameBytesPerRow(df)},
     )
+    return df, {"dataframe_setup": setup_ms, "dataframe_transforms": transform_ms}
+
 
+def _renderGraphData(source, context, sections, executor, workers, timings, total_start):
     requested_sections = set(sections or DEFAULT_RECAP_SECTIONS)
-    builders = {
-        "total_title_watchtime": lambda: getTotalTitleWatchtimeData(df),
-        "total_type_watchtime": lambda: getTotalTypeWatchtimeData(df),
-        "monthly_watchtime": lambda: getMonthlyWatchtimeData(df),
-        "ratings_watchtime": lambda: getMostWatchedRatingsData(df),
-        "core_stats": lambda: getCoreStatsData(df),
-        "title_level_insights": lambda: getTitleLevelInsightsData(df),
-        "wrapped_cards": lambda: getWrappedCardsData(df),
-        "genre_content_insights": lambda: getGenreContentInsightsData(df),
-        "visualizations": lambda: getVisualizationData(df),
-    }
+    builders, shared = recapSectionBuilders(source, executor)
     
     try:
         graphs = {
             "schema_version": GRAPH_SCHEMA_VERSION,
-            **build_recap_payload(builders, requested_sections, context=context),
+            **build_recap_payload(
+                builders,
+                requested_sections,
+                context=context,
+                executor=executor,
+                workers=workers,
+            ),
         }
     except Exception as exc:
         logger.exception(
@@ -1072,9 +1306,11 @@ def getJsonGraphData(dataframe, user, year, sections=None):
             extra={**context, "sections": sorted(requested_sections)},
         )
         return {"error": f"Failed to generate graph data: {str(exc)}"}
+    finally:
+        if shared is not None:
+            shared.close()
 
-    graphs["_timings_ms"]["dataframe_setup"] = setup_ms
-    graphs["_timings_ms"]["dataframe_transforms"] = transform_ms
+    graphs["_timings_ms"].update(timings)
     graphs["_timings_ms"]["total"] = round((perf_counter() - total_start) * 1000, 2)
     logger.info(
         "recap generation completed",
@@ -1082,3 +1318,39 @@ def getJsonGraphData(dataframe, user, year, sections=None):
     )
     
     return graphs
+
+
+def getJsonGraphData(dataframe, user, year, sections=None, executor="serial", workers=None):
+    context = {
+        "profile": user,
+        "year": str(year),
+        "input_rows": len(dataframe),
+    }
+    total_start = perf_counter()
+    logger.info("recap generation started", extra=context)
+
+    df, timings = _transformedRecapFrame(dataframe, context)
+    if len(df) == 0:
+        return {"error": "No data found after processing"}
+
+    return _renderGraphData(df, context, sections, executor, workers, timings, total_start)
+
+
+def getRecapAccumulator(dataframe) -> RecapAccumulator | None:
+    """Mergeable summary of a viewing frame, or None when nothing in it is watchable."""
+    df, _ = _transformedRecapFrame(dataframe, {"input_rows": len(dataframe)})
+    if len(df) == 0:
+        return None
+    return RecapContext(df).accumulator()
+
+
+def getAccumulatedGraphData(accumulator, user, year, sections=None, executor="serial", workers=None):
+    """``getJsonGraphData`` for the events summarized by ``accumulator``."""
+    context = {
+        "profile": user,
+        "year": str(year),
+        "input_rows": accumulator.rows,
+    }
+    total_start = perf_counter()
+    logger.info("recap generation started", extra=context)
+    return _renderGraphData(accumulator, context, sections, executor, workers, {}, total_start)
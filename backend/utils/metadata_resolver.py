@@ -0,0 +1,135 @@
+import json
+import string
+import threading
+from types import MappingProxyType
+
+from utils.workflows import TITLE_CATALOG, _file_signature, overrides_path
+
+STORED_TITLE_MEMO_SIZE = 50_000
+OVERRIDE_KEY_TABLE = str.maketrans({char: " " for char in string.punctuation})
+
+
+def metadata_key(value) -> str:
+    # Manual overrides are keyed by lowercase words with punctuation dropped
+    text = str(value or "").strip().lower().translate(OVERRIDE_KEY_TABLE)
+    return " ".join(text.split())
+
+
+class MetadataSnapshot:
+    """
+    Read-only view of the static catalog and manual overrides at one version.
+
+    Consumers must treat the returned records as immutable; a new snapshot is
+    built whenever the overrides file changes or the resolver is invalidated.
+    """
+
+    def __init__(self, version, catalog, overrides):
+        self.version = version
+        self.catalog = catalog
+        self.overrides = MappingProxyType(overrides)
+
+    def catalog_record(self, title) -> dict:
+        if not title or title == "Unknown":
+            return {}
+        return self.catalog.record_for(title)
+
+    def override_for(self, *titles) -> dict:
+        # The first title with an override wins
+        for title in titles:
+            override = self.overrides.get(metadata_key(title))
+            if override:
+                return override
+        return {}
+
+
+class MetadataResolver:
+    """
+    Single in-process source of title metadata.
+
+    Layers the Kaggle catalog, the manual overrides file and, once Django
+    registers a loader, enriched ``Title`` rows. Stored titles are memoized
+    until the registered version source moves, so recaps in one process share
+    a single batch load.
+    """
+
+    def __init__(self, overrides_path, catalog):
+        self.overrides_path = overrides_path
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._local_version = 0
+        self._title_loader = None
+        self._version_source = None
+        self._stored = {}
+        self._stored_version = None
+
+    def register_title_loader(self, loader, version_source=None):
+        """``loader(title_ids)`` returns ``{title_id: metadata}`` for stored titles."""
+        with self._lock:
+            self._title_loader = loader
+            self._version_source = version_source
+            self._local_version += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._local_version += 1
+
+    def _version(self):
+        return (self._local_version, _file_signature(self.overrides_path))
+
+    def _load_overrides(self) -> dict:
+        try:
+            with open(self.overrides_path, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {}
+
+    def snapshot(self) -> MetadataSnapshot:
+        version = self._version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        snapshot = MetadataSnapshot(version, self.catalog, self._load_overrides())
+        self._snapshot = snapshot
+        return snapshot
+
+    def resolve_many(self, titles) -> list[dict]:
+        """Catalog record and manual override for each title, in input order."""
+        snapshot = self.snapshot()
+        return [
+            {
+                "catalog": snapshot.catalog_record(title),
+                "override": snapshot.override_for(title),
+            }
+            for title in titles
+        ]
+
+    def stored_many(self, title_ids) -> dict:
+        """Enriched stored metadata by title id, loaded in one batch per version."""
+        title_ids = list(title_ids)
+        version = (self._local_version, self._version_source() if self._version_source else None)
+        with self._lock:
+            if version != self._stored_version:
+                self._stored = {}
+                self._stored_version = version
+            stored = self._stored
+            found = {title_id: stored[title_id] for title_id in title_ids if title_id in stored}
+            loader = self._title_loader
+
+        missing = [title_id for title_id in title_ids if title_id not in found]
+        if missing and loader is not None:
+            loaded = loader(missing)
+            loaded = {title_id: loaded.get(title_id) for title_id in missing}
+            found.update(loaded)
+            with self._lock:
+                # A version change meanwhile started a fresh memo; don't refill it with stale rows
+                if self._stored is stored:
+                    if len(stored) + len(loaded) > STORED_TITLE_MEMO_SIZE:
+                        stored.clear()
+                    stored.update(loaded)
+
+        return {title_id: found.get(title_id) for title_id in title_ids}
+
+
+METADATA_RESOLVER = MetadataResolver(overrides_path, TITLE_CATALOG)
@@ -0,0 +1,144 @@
+import datetime
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.recap_cube import EVENTS, SECONDS, RecapCube
+
+
+POSTER_COLUMNS = ["New Title", "Series Title", "Poster URL", "Position"]
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if _is_missing(value):
+        return None
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _column_kind(values) -> str | None:
+    for value in values:
+        if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+            return "date"
+        if isinstance(value, tuple):
+            return "tuple"
+        if not _is_missing(value):
+            return None
+    return None
+
+
+COLUMN_DECODERS = {
+    "date": lambda value: datetime.date.fromisoformat(value),
+    "tuple": tuple,
+}
+
+
+def _frame_to_json(frame: pd.DataFrame) -> dict:
+    # Object columns repeat a few dimension values across many cells, so
+    # each distinct value is stored once and cells refer to it by position
+    columns = {}
+    for name in frame.columns:
+        values = frame[name].tolist()
+        if frame[name].dtype != object and not isinstance(frame[name].dtype, pd.CategoricalDtype):
+            columns[name] = {"values": values}
+            continue
+        distinct = {}
+        codes = [distinct.setdefault(None if _is_missing(value) else value, len(distinct)) for value in values]
+        columns[name] = {
+            "distinct": [_json_value(value) for value in distinct],
+            "kind": _column_kind(distinct),
+            "codes": codes,
+        }
+    return columns
+
+
+def _frame_from_json(data: dict) -> pd.DataFrame:
+    columns = {}
+    for name, column in data.items():
+        if "values" in column:
+            columns[name] = pd.Series(column["values"])
+            continue
+        decode = COLUMN_DECODERS.get(column["kind"])
+        distinct = np.empty(len(column["distinct"]), dtype=object)
+        distinct[:] = [None if value is None or decode is None else decode(value) for value in column["distinct"]]
+        if decode is None:
+            distinct[:] = column["distinct"]
+        columns[name] = pd.Series(distinct[np.asarray(column["codes"], dtype=np.intp)], dtype=object)
+    return pd.DataFrame(columns)
+
+
+def _later_wins(earlier, later, key, prefer_greater):
+    # Ties keep the earlier events, like a stable sort over all of them
+    if prefer_greater:
+        return later if key(later) > key(earlier) else earlier
+    return later if key(later) < key(earlier) else earlier
+
+
+class RecapAccumulator:
+    """
+    Mergeable summary of the events behind one recap.
+
+    Holds the recap cube's base cells, the event-level facts the cube can't
+    answer (longest session, first and last watch, short and finished
+    counts) and the first listed poster of each title. Merging the
+    accumulator of events appended later gives the accumulator of all the
+    events, so a saved recap can absorb new viewing without its history.
+    """
+
+    def __init__(self, cells: pd.DataFrame, facts: dict, posters: pd.DataFrame, rows: int):
+        self.cells = cells
+        self.facts = facts
+        self.posters = posters
+        self.rows = rows
+
+    def merge(self, later: "RecapAccumulator") -> "RecapAccumulator":
+        """Accumulator over these events followed by ``later``'s."""
+        facts = {
+            "short_events": self.facts["short_events"] + later.facts["short_events"],
+            "finished_events": self.facts["finished_events"] + later.facts["finished_events"],
+            "longest": _later_wins(self.facts["longest"], later.facts["longest"], lambda fact: fact["hours"], True),
+            "first": _later_wins(self.facts["first"], later.facts["first"], lambda fact: fact["start"], False),
+            "last": _later_wins(self.facts["last"], later.facts["last"], lambda fact: fact["start"], True),
+        }
+        posters = pd.concat(
+            [self.posters, later.posters.assign(Position=later.posters["Position"] + self.rows)],
+            ignore_index=True,
+        ).drop_duplicates(POSTER_COLUMNS[:3])
+        return RecapAccumulator(
+            RecapCube.from_cells(pd.concat([self.cells, later.cells], ignore_index=True)).base_cells(),
+            facts,
+            posters.reset_index(drop=True),
+            self.rows + later.rows,
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "cells": _frame_to_json(self.cells),
+            "facts": {
+                name: {key: _json_value(value) for key, value in fact.items()} if isinstance(fact, dict) else fact
+                for name, fact in self.facts.items()
+            },
+            "posters": _frame_to_json(self.posters),
+            "rows": self.rows,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "RecapAccumulator":
+        facts = dict(data["facts"])
+        for name in ("first", "last"):
+            facts[name] = {**facts[name], "start": pd.Timestamp(facts[name]["start"])}
+        cells = _frame_from_json(data["cells"])
+        cells[SECONDS] = cells[SECONDS].astype("int64")
+        cells[EVENTS] = cells[EVENTS].astype("int64")
+        posters = _frame_from_json(data["posters"]).reindex(columns=POSTER_COLUMNS)
+        return cls(cells, facts, posters, int(data["rows"]))
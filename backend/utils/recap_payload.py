@@ -1,33 +1,125 @@
 import logging
-from time import perf_counter
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+from time import perf_counter, thread_time
 
 
 logger = logging.getLogger(__name__)
 
 
-DEFAULT_RECAP_SECTIONS = [
-    "total_title_watchtime",
-    "total_type_watchtime",
-    "monthly_watchtime",
-    "ratings_watchtime",
-    "core_stats",
-    "title_level_insights",
-    "wrapped_cards",
-    "genre_content_insights",
-    "visualizations",
-]
+# Each section lists the sections whose results its builder receives.
+RECAP_SECTION_DEPENDENCIES = {
+    "total_title_watchtime": (),
+    "total_type_watchtime": (),
+    "monthly_watchtime": (),
+    "ratings_watchtime": (),
+    "core_stats": (),
+    "title_level_insights": (),
+    "wrapped_cards": ("core_stats", "title_level_insights"),
+    "genre_content_insights": (),
+    "visualizations": (),
+}
 
-HEAVY_RECAP_SECTIONS = {
+# Sections too slow for the first response. profile_comparisons is built
+# outside the payload, over the whole household frame.
+HEAVY_SECTION_ROOTS = {
     "genre_content_insights",
     "visualizations",
     "profile_comparisons",
 }
 
 
-def timed_section(section_name, builder, context=None):
+def section_order(sections):
+    """Requested sections plus their dependencies, dependencies first."""
+    ordered = []
+
+    def visit(section_name, path=()):
+        if section_name in ordered:
+            return
+        if section_name in path:
+            raise ValueError(f"Recap section dependency cycle: {' -> '.join(path + (section_name,))}")
+        for dependency in RECAP_SECTION_DEPENDENCIES[section_name]:
+            visit(dependency, path + (section_name,))
+        ordered.append(section_name)
+
+    for section_name in RECAP_SECTION_DEPENDENCIES:
+        if section_name in sections:
+            visit(section_name)
+    return ordered
+
+
+def heavy_sections():
+    """Heavy roots plus every section that depends on one of them."""
+    heavy = set(HEAVY_SECTION_ROOTS)
+    for section_name in section_order(RECAP_SECTION_DEPENDENCIES):
+        if any(dependency in heavy for dependency in RECAP_SECTION_DEPENDENCIES[section_name]):
+            heavy.add(section_name)
+    return heavy
+
+
+DEFAULT_RECAP_SECTIONS = section_order(RECAP_SECTION_DEPENDENCIES)
+HEAVY_RECAP_SECTIONS = heavy_sections()
+INITIAL_RECAP_SECTIONS = [
+    section_name
+    for section_name in DEFAULT_RECAP_SECTIONS
+    if section_name not in HEAVY_RECAP_SECTIONS
+]
+
+
+RECAP_EXECUTORS = ("serial", "thread", "process")
+_ATTACHED_FRAMES = {}
+
+
+class SharedFrame:
+    """
+    A dataframe pickled once into shared memory for process-pool builders.
+
+    Pickling a ``SharedFrame`` only sends the block name. Each worker process
+    unpickles the frame once, wraps it with ``factory`` and reuses the result
+    for every section it runs.
+    """
+
+    def __init__(self, df, factory):
+        payload = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+        self._block = shared_memory.SharedMemory(create=True, size=len(payload))
+        self._block.buf[:len(payload)] = payload
+        self.name = self._block.name
+        self.size = len(payload)
+        self.factory = factory
+
+    def __reduce__(self):
+        return (_attach_shared_frame, (self.name, self.size, self.factory))
+
+    def close(self):
+        self._block.close()
+        self._block.unlink()
+
+
+def _attach_shared_frame(name, size, factory):
+    if name not in _ATTACHED_FRAMES:
+        # Pool workers share the parent's resource tracker, so the block
+        # stays registered once and is unlinked by ``SharedFrame.close``
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            df = pickle.loads(bytes(block.buf[:size]))
+        finally:
+            block.close()
+        _ATTACHED_FRAMES.clear()
+        _ATTACHED_FRAMES[name] = factory(df)
+    return _ATTACHED_FRAMES[name]
+
+
+def _run_section(builder, upstream):
+    # Module level so process pools can pickle it; thread_time is per thread
     start = perf_counter()
-    result = builder()
-    elapsed_ms = round((perf_counter() - start) * 1000, 2)
+    cpu_start = thread_time()
+    result = builder(**upstream)
+    cpu_ms = round((thread_time() - cpu_start) * 1000, 2)
+    return result, round((perf_counter() - start) * 1000, 2), cpu_ms
+
+
+def _log_section(section_name, elapsed_ms, context):
     logger.info(
         "recap section generated",
         extra={
@@ -36,21 +128,81 @@ def timed_section(section_name, builder, context=None):
             **(context or {}),
         },
     )
-    return result, elapsed_ms
 
 
-def build_recap_payload(builders, requested_sections, context=None):
-    graphs = {}
-    timings = {}
+def _upstream_for(section_name, results):
+    return {
+        dependency: results[dependency]
+        for dependency in RECAP_SECTION_DEPENDENCIES[section_name]
+    }
+
 
-    for section_name in DEFAULT_RECAP_SECTIONS:
-        if section_name not in requested_sections:
-            continue
-        graphs[section_name], timings[section_name] = timed_section(
-            section_name,
-            builders[section_name],
-            context=context,
-        )
+def _run_serial(builders, ordered, context):
+    outcomes = {}
+    for section_name in ordered:
+        upstream = _upstream_for(section_name, {name: outcome[0] for name, outcome in outcomes.items()})
+        outcomes[section_name] = _run_section(builders[section_name], upstream)
+        _log_section(section_name, outcomes[section_name][1], context)
+    return outcomes
+
+
+def _run_pooled(builders, ordered, context, pool):
+    # Submit each section once all of its dependencies have finished
+    outcomes = {}
+    running = {}
+    waiting = list(ordered)
+    while waiting or running:
+        results = {name: outcome[0] for name, outcome in outcomes.items()}
+        for section_name in list(waiting):
+            if all(dependency in outcomes for dependency in RECAP_SECTION_DEPENDENCIES[section_name]):
+                waiting.remove(section_name)
+                future = pool.submit(
+                    _run_section,
+                    builders[section_name],
+                    _upstream_for(section_name, results),
+                )
+                running[future] = section_name
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            section_name = running.pop(future)
+            outcomes[section_name] = future.result()
+            _log_section(section_name, outcomes[section_name][1], context)
+    return outcomes
+
+
+def build_recap_payload(builders, requested_sections, context=None, executor="serial", workers=None):
+    """
+    Run section builders in dependency order.
+
+    A builder receives the results of its dependencies as keyword arguments.
+    Dependencies that were not requested are built but left out of the payload.
+
+    ``executor`` selects how independent sections run: ``serial`` in this
+    thread, ``thread`` on a thread pool, or ``process`` on a process pool,
+    where builders must be picklable (see ``SharedFrame``). The payload is
+    the same in every mode.
+    """
+    if executor not in RECAP_EXECUTORS:
+        raise ValueError(f"Unknown recap section executor: {executor}")
+
+    ordered = section_order(requested_sections)
+    start = perf_counter()
+    if executor == "serial" or len(ordered) < 2:
+        outcomes = _run_serial(builders, ordered, context)
+    else:
+        pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            outcomes = _run_pooled(builders, ordered, context, pool)
+    wall_ms = round((perf_counter() - start) * 1000, 2)
 
-    graphs["_timings_ms"] = timings
+    graphs = {
+        section_name: outcomes[section_name][0]
+        for section_name in ordered
+        if section_name in requested_sections
+    }
+    graphs["_timings_ms"] = {
+        **{section_name: outcomes[section_name][1] for section_name in ordered},
+        "sections_wall": wall_ms,
+        "sections_cpu": {section_name: outcomes[section_name][2] for section_name in ordered},
+    }
     return graphs
@@ -1,48 +1,276 @@
+import hashlib
+import pickle
 import string
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import os
 import re
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(BASE_DIR, 'netflix_titles.csv')
+overrides_path = os.path.join(BASE_DIR, 'title_metadata_overrides.json')
+TITLE_PARSE_CACHE_SIZE = 50_000
+TITLE_PART_COLUMNS = [
+    "Raw Title",
+    "Series Title",
+    "Season Label",
+    "Episode Title",
+    "Episode Number",
+    "Is Episode",
+    "Parsed Media Type",
+    "Classification Confidence",
+    "Classification Source",
+]
+# Recap columns with few distinct values per frame, stored as categoricals so
+# they cost one code per row and groupbys run on the codes
+CATEGORICAL_RECAP_COLUMNS = [
+    "Profile Name",
+    "Title",
+    "Raw Title",
+    "New Title",
+    "Series Title",
+    "Season Label",
+    "Episode Title",
+    "Type",
+    "Rating",
+    "Parsed Media Type",
+    "Classification Source",
+    "Cached Media Type",
+    "Metadata Original Language",
+    "Metadata Rating",
+    "Metadata Poster URL",
+    "Metadata Source",
+    "Device Type",
+    "Country",
+    "Primary Genre",
+    "Release Period",
+    "Metadata Country",
+    "Runtime Bucket",
+    "Poster URL",
+]
+START_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DURATION_PATTERN = r"^\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*$"
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+class TitleCatalog:
+    """
+    Static Netflix title catalog, loaded on first use.
+
+    The parsed frame and lookup dictionaries are kept in a pickle snapshot
+    next to the CSV and rebuilt whenever the CSV checksum changes.
+    """
+
+    SNAPSHOT_VERSION = 2
+    TABLES = (
+        "frame",
+        "title_by_normalized",
+        "type_by_title",
+        "rating_by_title",
+        "type_by_normalized",
+        "position_by_title",
+        "position_by_normalized",
+    )
+    LOOKUPS = {
+        "K_NETFLIX_TITLES": "frame",
+        "K_TITLE_BY_NORMALIZED": "title_by_normalized",
+        "K_TYPE_BY_TITLE": "type_by_title",
+        "K_RATING_BY_TITLE": "rating_by_title",
+        "K_TYPE_BY_NORMALIZED": "type_by_normalized",
+    }
 
+    def __init__(self, source_path, snapshot_path):
+        self.source_path = source_path
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._tables = None
+        self._matcher = None
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self.TABLES:
+            raise AttributeError(name)
+        return self.load()[name]
+
+    def reset(self):
+        """Drop the loaded tables and matcher so the next lookup reloads the CSV."""
+        with self._lock:
+            self._tables = None
+            self._matcher = None
+
+    def load(self) -> dict:
+        if self._tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._tables = self._load_tables()
+        return self._tables
+
+    def _checksum(self) -> str:
+        with open(self.source_path, "rb") as source:
+            return hashlib.sha256(source.read()).hexdigest()
+
+    def _load_tables(self) -> dict:
+        checksum = self._checksum()
+        try:
+            with open(self.snapshot_path, "rb") as snapshot:
+                tables = pickle.load(snapshot)
+            if (tables.get("checksum"), tables.get("version")) == (checksum, self.SNAPSHOT_VERSION):
+                return tables
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass
+
+        tables = self._build_tables(checksum)
+        try:
+            temp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as snapshot:
+                pickle.dump(tables, snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError:
+            # Read-only deployments just rebuild from the CSV in each process
+            pass
+        return tables
+
+    def _build_tables(self, checksum) -> dict:
+        frame = pd.read_csv(self.source_path)
+        frame['normalized title'] = (
+            frame['title']
+            .astype(str)
+            .str.strip()
+            .str.lower()
+            .apply(lambda value: value.translate(PUNCTUATION_TABLE))
+        )
+        by_normalized = frame.drop_duplicates('normalized title').set_index('normalized title')
+        by_title = frame.drop_duplicates('title').set_index('title')
+        return {
+            "checksum": checksum,
+            "version": self.SNAPSHOT_VERSION,
+            "frame": frame,
+            "title_by_normalized": by_normalized['title'].to_dict(),
+            "type_by_title": by_title['type'].to_dict(),
+            "rating_by_title": by_title['rating'].fillna('Unknown').to_dict(),
+            "type_by_normalized": by_normalized['type'].to_dict(),
+            # First catalog row per exact and normalized title, for metadata lookups
+            "position_by_title": {
+                title: position
+                for position, title in frame['title'].dropna().drop_duplicates().items()
+            },
+            "position_by_normalized": {
+                normalized: position
+                for position, normalized in frame['normalized title'].drop_duplicates().items()
+            },
+        }
 
+    def record_for(self, title) -> dict:
+        """Catalog row for a title, matched exactly first and then normalized."""
+        position = self.position_by_title.get(title)
+        if position is None:
+            normalized = str(title).strip().lower().translate(PUNCTUATION_TABLE)
+            position = self.position_by_normalized.get(normalized)
+        if position is None:
+            return {}
+        return self.frame.iloc[position].to_dict()
+
+    @property
+    def matcher(self) -> "TitleMatcher":
+        if self._matcher is None:
+            tables = self.load()
+            with self._lock:
+                if self._matcher is None:
+                    self._matcher = TitleMatcher(tables)
+        return self._matcher
+
+
+class TitleMatcher:
+    """
+    Token tries over the normalized catalog titles.
+
+    Netflix titles are matched one colon-separated part at a time, so the
+    longest catalog prefix or suffix of a title comes out of a single walk
+    instead of normalizing and looking up every candidate join.
+    """
+
+    END = None
+
+    def __init__(self, tables):
+        self.title_by_normalized = tables["title_by_normalized"]
+        self.entries = {}
+        self.prefixes = {}
+        self.suffixes = {}
+        for normalized, canonical in self.title_by_normalized.items():
+            metadata_type = (
+                tables["type_by_title"].get(canonical)
+                or tables["type_by_normalized"].get(normalized)
+                or "Unknown"
+            )
+            entry = (canonical, metadata_type)
+            self.entries[normalized] = entry
+            tokens = normalized.split(" ")
+            self._insert(self.prefixes, tokens, entry)
+            self._insert(self.suffixes, reversed(tokens), entry)
+
+    @classmethod
+    def _insert(cls, node, tokens, entry):
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[cls.END] = entry
+
+    @staticmethod
+    def normalize(part: str) -> str:
+        return part.lower().translate(PUNCTUATION_TABLE)
+
+    @classmethod
+    def _walk(cls, node, part_tokens):
+        # Yield (parts consumed, entry) wherever a catalog title ends on a part boundary
+        for consumed, tokens in enumerate(part_tokens, start=1):
+            for token in tokens:
+                node = node.get(token)
+                if node is None:
+                    return
+            if cls.END in node:
+                yield consumed, node[cls.END]
+
+    def _longest(self, root, part_tokens) -> str | None:
+        canonical = None
+        for _, (title, metadata_type) in self._walk(root, part_tokens):
+            if metadata_type != "Unknown":
+                canonical = title
+        return canonical
+
+    def longest_prefix(self, parts: list[str]) -> str | None:
+        """Canonical title of the longest known ``parts[:index]``, index < len(parts)."""
+        return self._longest(
+            self.prefixes,
+            (self.normalize(part).split(" ") for part in parts[:-1]),
+        )
 
-K_NETFLIX_TITLES = pd.read_csv(csv_path)
-K_NETFLIX_TITLES['normalized title'] = (
-    K_NETFLIX_TITLES['title']
-    .astype(str)
-    .str.strip()
-    .str.lower()
-    .apply(lambda value: value.translate(str.maketrans('', '', string.punctuation)))
-)
-K_TITLE_BY_NORMALIZED = (
-    K_NETFLIX_TITLES
-    .drop_duplicates('normalized title')
-    .set_index('normalized title')['title']
-    .to_dict()
-)
-K_TYPE_BY_TITLE = (
-    K_NETFLIX_TITLES
-    .drop_duplicates('title')
-    .set_index('title')['type']
-    .to_dict()
-)
-K_RATING_BY_TITLE = (
-    K_NETFLIX_TITLES
-    .drop_duplicates('title')
-    .set_index('title')['rating']
-    .fillna('Unknown')
-    .to_dict()
-)
+    def longest_suffix(self, parts: list[str]) -> str | None:
+        """Canonical title of the longest known ``parts[index:]``, index > 0."""
+        return self._longest(
+            self.suffixes,
+            (reversed(self.normalize(part).split(" ")) for part in reversed(parts[1:])),
+        )
+
+    def resolve(self, parts: list[str]) -> tuple[str, str]:
+        """Canonical title and catalog media type for the title joined from ``parts``."""
+        title = ": ".join(parts)
+        normalized = " ".join(self.normalize(part) for part in parts)
+        return self.entries.get(normalized, (title, "Unknown"))
 
-K_TYPE_BY_NORMALIZED = (
-    K_NETFLIX_TITLES
-    .drop_duplicates('normalized title')
-    .set_index('normalized title')['type']
-    .to_dict()
+
+TITLE_CATALOG = TitleCatalog(
+    csv_path,
+    os.getenv("TITLE_CATALOG_SNAPSHOT", os.path.join(BASE_DIR, 'netflix_titles.snapshot.pkl')),
 )
 
+
+def __getattr__(name):
+    # K_* catalog lookups resolve lazily so importing this module stays cheap
+    if name in TitleCatalog.LOOKUPS:
+        return getattr(TITLE_CATALOG, TitleCatalog.LOOKUPS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 SEASON_LABEL_PATTERN = re.compile(
     r"^(Season\s+\d+|Series\s+\d+|Book\s+(\d+|One|Two|Three|Four|Five|Six|Seven|Eight|Nine|Ten)|"
     r"Volume\s+\d+|Part\s+(\d+|I|II|III|IV|V|VI|VII|VIII|IX|X)|Limited Series|Collection)$",
@@ -59,18 +287,106 @@ SUPPLEMENTAL_DESCRIPTOR_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class TitleParseCache:
+    """
+    Bounded, process-wide LRU memo for title parsing.
+
+    Entries are keyed by (kind, raw title, supplemental type) so a rewatch of
+    the same episode is parsed once per process. Call ``refreshIfStale`` at
+    the start of a batch; it clears the memo when the static catalog or the
+    metadata overrides file has changed on disk, and reloads ``catalog``
+    when its CSV has, so the memo refills from the new catalog.
+    """
+
+    def __init__(self, maxsize=TITLE_PARSE_CACHE_SIZE, catalog=None):
+        self.maxsize = maxsize
+        self.catalog = catalog
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._source_signature = self._sources_signature()
+
+    def _sources_signature(self):
+        source_path = self.catalog.source_path if self.catalog is not None else csv_path
+        return (_file_signature(source_path), _file_signature(overrides_path))
+
+    def get(self, kind, title, supplemental_type, compute):
+        key = (kind, title, supplemental_type)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def refreshIfStale(self):
+        signature = self._sources_signature()
+        if signature != self._source_signature:
+            if self.catalog is not None and signature[0] != self._source_signature[0]:
+                self.catalog.reset()
+            self.clear()
+            self._source_signature = signature
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+TITLE_PARSE_CACHE = TitleParseCache(catalog=TITLE_CATALOG)
+
+
+def cachedTitleParse(kind, title, supplemental_type, compute):
+    return TITLE_PARSE_CACHE.get(kind, str(title), str(supplemental_type or ""), compute)
+
+def shallowCopy(df: pd.DataFrame) -> pd.DataFrame:
+    # A shallow copy shares the caller's columns, which is only safe while
+    # pandas copies a shared column on its first write
+    if not pd.get_option("mode.copy_on_write"):
+        raise RuntimeError("Recap frames need pandas copy-on-write; set mode.copy_on_write")
+    return df.copy(deep=False)
+
 # Read in Personal Viewing Data & Kaggle Netflix Dataset
 def dataframeSetUp(df: pd.DataFrame) -> pd.DataFrame:
-    # Remove non traditional media from DataFrame (Promos, Trailers)
-    df = df[df['Supplemental Video Type'].isna()]
+    # Remove non traditional media from DataFrame (Promos, Trailers); the
+    # setup only writes whole columns, so the caller's frame is never changed
+    watchable = df['Supplemental Video Type'].isna()
+    df = df[watchable] if not watchable.all() else shallowCopy(df)
     
     # Drop unneeded columns
-    df = df.drop(columns= ['Attributes', 'Bookmark', 'Latest Bookmark'])
+    df = df.drop(columns= ['Attributes', 'Bookmark', 'Latest Bookmark'], errors='ignore')
 
     df = preserveTitleParts(df)
 
     # Manipulate Title column to remove season and episode information
-    df['Title'] = df['Title'].apply(splitSecondOccurence)
+    df['Title'] = mapDistinctTitles(df['Title'], splitSecondOccurence)
 
     df = startTimeManipulation(df)
     df = convertDurationToHrs(df)
@@ -78,17 +394,6 @@ def dataframeSetUp(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _canonical_title_for(value: str) -> str:
-    normalized = preprocessTitles(str(value).strip().lower())
-    return K_TITLE_BY_NORMALIZED.get(normalized, str(value).strip())
-
-
-def _metadata_type_for(value: str) -> str:
-    normalized = preprocessTitles(str(value).strip().lower())
-    canonical = K_TITLE_BY_NORMALIZED.get(normalized, str(value).strip())
-    return K_TYPE_BY_TITLE.get(canonical) or K_TYPE_BY_NORMALIZED.get(normalized) or "Unknown"
-
-
 def _season_label_index(parts: list[str]) -> int | None:
     return next(
         (index for index, part in enumerate(parts[1:], start=1) if SEASON_LABEL_PATTERN.match(part)),
@@ -96,6 +401,11 @@ def _season_label_index(parts: list[str]) -> int | None:
     )
 
 
+def _series_parts(parts: list[str], season_index: int | None) -> list[str]:
+    # Everything before the season label names the series
+    return parts[:season_index] if season_index is not None else parts
+
+
 def _is_supplemental_descriptor(part: str) -> bool:
     stripped = str(part).strip()
     return bool(
@@ -106,20 +416,19 @@ def _is_supplemental_descriptor(part: str) -> bool:
 
 
 def extractSupplementalContentTitle(title: str) -> str:
+    return cachedTitleParse("supplemental", title, "", lambda: _extractSupplementalContentTitle(title))
+
+
+def _extractSupplementalContentTitle(title: str) -> str:
     raw_title = str(title).strip()
     parts = [part.strip() for part in raw_title.split(":") if part.strip()]
     if len(parts) <= 1:
         return raw_title
 
-    for index in range(len(parts) - 1, 0, -1):
-        candidate = ": ".join(parts[:index]).strip()
-        if _metadata_type_for(candidate) != "Unknown":
-            return _canonical_title_for(candidate)
-
-    for index in range(1, len(parts)):
-        candidate = ": ".join(parts[index:]).strip()
-        if _metadata_type_for(candidate) != "Unknown":
-            return _canonical_title_for(candidate)
+    matcher = TITLE_CATALOG.matcher
+    known_title = matcher.longest_prefix(parts) or matcher.longest_suffix(parts)
+    if known_title is not None:
+        return known_title
 
     content_start = 0
     while content_start < len(parts) - 1 and _is_supplemental_descriptor(parts[content_start]):
@@ -132,17 +441,16 @@ def extractSupplementalContentTitle(title: str) -> str:
 
 
 def parseNetflixTitleParts(title: str) -> dict:
+    # Callers get their own copy so the memoized dict is never mutated.
+    return dict(cachedTitleParse("parts", title, "", lambda: _parseNetflixTitleParts(title)))
+
+
+def _parseNetflixTitleParts(title: str) -> dict:
     raw_title = str(title).strip()
     parts = [part.strip() for part in raw_title.split(":") if part.strip()]
     season_index = _season_label_index(parts)
     episode_number_match = EPISODE_NUMBER_PATTERN.search(raw_title)
-    candidate_series_title = (
-        ": ".join(parts[:season_index]).strip()
-        if season_index is not None
-        else splitSecondOccurence(raw_title).strip()
-    )
-    canonical_candidate = _canonical_title_for(candidate_series_title)
-    metadata_type = _metadata_type_for(candidate_series_title)
+    canonical_candidate, metadata_type = TITLE_CATALOG.matcher.resolve(_series_parts(parts, season_index))
 
     score = 0
     score += 5 if metadata_type == "TV Show" else 0
@@ -183,64 +491,169 @@ def parseNetflixTitleParts(title: str) -> dict:
     }
 
 
-def preserveTitleParts(df: pd.DataFrame) -> pd.DataFrame:
-    title_parts = df["Title"].apply(parseNetflixTitleParts).apply(pd.Series)
+def mapDistinctTitles(titles: pd.Series, func) -> pd.Series:
+    # Apply a memoized title function once per distinct title instead of once per row
+    TITLE_PARSE_CACHE.refreshIfStale()
+    return titles.map({title: func(title) for title in titles.unique()})
+
+
+def parseDistinctTitleParts(titles: pd.Series) -> pd.DataFrame:
+    # Parse each distinct title once and broadcast the result back to every row
+    TITLE_PARSE_CACHE.refreshIfStale()
+    codes, distinct_titles = pd.factorize(titles.astype(str))
+    parsed = pd.DataFrame([parseNetflixTitleParts(title) for title in distinct_titles])
+    title_parts = parsed.iloc[codes]
+    title_parts.index = titles.index
+    return title_parts
+
+
+def _blank(values: pd.Series) -> pd.Series:
+    return values.isna() | (values.astype(str).str.strip() == "")
+
+
+def titlePartsMissing(df: pd.DataFrame) -> pd.Series:
+    # Parsing always sets a media type, so rows without one have not been parsed yet
+    if not all(column in df.columns for column in TITLE_PART_COLUMNS):
+        return pd.Series(True, index=df.index)
+    return _blank(df["Parsed Media Type"])
+
+
+def preserveTitleParts(df: pd.DataFrame, parseTitles=parseDistinctTitleParts) -> pd.DataFrame:
+    needs_parts = titlePartsMissing(df)
+    if not needs_parts.any():
+        return df
+
+    title_parts = parseTitles(df.loc[needs_parts, "Title"]).reindex(df.index)
     for column in title_parts.columns:
         if column in df.columns:
-            existing = df[column]
-            missing = existing.isna() | (existing.astype(str).str.strip() == "")
+            missing = needs_parts & _blank(df[column])
             df.loc[missing, column] = title_parts.loc[missing, column]
         else:
             df[column] = title_parts[column]
     return df
 
 
+def durationSecondsColumn(durations: pd.Series) -> pd.Series:
+    # Malformed durations count as zero seconds; each distinct duration is parsed once
+    codes, distinct = pd.factorize(durations.astype(str))
+    parts = pd.Series(distinct).str.extract(DURATION_PATTERN).astype(float)
+    seconds = (parts[0] * 3600 + parts[1] * 60 + parts[2]).fillna(0).astype("int64")
+    return pd.Series(seconds.to_numpy()[codes], index=durations.index)
+
+
+def parseStartTimes(start_times: pd.Series) -> pd.Series:
+    """
+    Datetimes of ``Start Time`` values, unparseable ones as NaT. Values in
+    the export's own format take a fixed-format fast path; anything else
+    falls back to inferring its format.
+    """
+    if pd.api.types.is_datetime64_any_dtype(start_times):
+        return start_times
+
+    parsed = pd.to_datetime(start_times, format=START_TIME_FORMAT, errors='coerce')
+    fallback = parsed.isna() & start_times.notna()
+    if fallback.all():
+        return pd.to_datetime(start_times, errors='coerce')
+    if fallback.any():
+        parsed[fallback] = pd.to_datetime(start_times[fallback], errors='coerce')
+    return parsed
+
+
+def parseViewingTimes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The one parse of an upload's start times and durations, into
+    ``parsed_start_time`` and ``Duration Seconds``. Both are kept with the
+    cached upload, so frames that already carry them are returned as is.
+    """
+    parsed = {}
+    if 'parsed_start_time' not in df.columns:
+        parsed['parsed_start_time'] = parseStartTimes(df['Start Time'])
+    if 'Duration Seconds' not in df.columns:
+        parsed['Duration Seconds'] = durationSecondsColumn(df['Duration'])
+    return df.assign(**parsed) if parsed else df
+
+
+def parseUploadFrame(df: pd.DataFrame, parseTitles=parseDistinctTitleParts) -> pd.DataFrame:
+    # Build the parsed upload shared by ingestion and every recap for a job:
+    # title parts for watchable rows, typed start times and duration seconds.
+    # ``parseTitles`` maps a Series of titles to their title part columns
+    df = shallowCopy(parseViewingTimes(df))
+    watchable = df['Supplemental Video Type'].isna() if 'Supplemental Video Type' in df.columns else pd.Series(True, index=df.index)
+    present = [column for column in TITLE_PART_COLUMNS if column in df.columns]
+    title_parts = preserveTitleParts(df.loc[watchable, ['Title', *present]], parseTitles)
+    for column in TITLE_PART_COLUMNS:
+        fill_value = False if column == 'Is Episode' else None
+        df[column] = title_parts[column].reindex(df.index, fill_value=fill_value)
+    return df
+
+
 # Manipulate Start Time column to gain new columns: Year, Month
 def startTimeManipulation(df: pd.DataFrame) -> pd.DataFrame:
-    # Convert 'Start Time' to Datetime format
-    df['Start Time'] = pd.to_datetime(df['Start Time'])
-
-    # Create Date column from Start Time column
-    df['Date'] = df['Start Time'].dt.strftime('%Y-%m-%d')
+    # Convert 'Start Time' to Datetime format, reusing the upload's parse
+    df['Start Time'] = (
+        df['parsed_start_time']
+        if 'parsed_start_time' in df.columns
+        else parseStartTimes(df['Start Time'])
+    )
 
-    # Create Year column from Start Time column
-    df['Year'] = df['Start Time'].dt.strftime('%Y').astype(int)
+    # Create Date column from Start Time column, formatting each distinct day once
+    codes, days = pd.factorize(df['Start Time'].dt.normalize(), sort=True)
+    df['Date'] = pd.Categorical.from_codes(codes, days.strftime('%Y-%m-%d'))
 
-    # Create Month column from Start Time column
-    df['Month'] = df['Start Time'].dt.strftime('%m').astype(int)
+    # Create Year and Month columns from Start Time column
+    df['Year'] = df['Start Time'].dt.year.astype('int16')
+    df['Month'] = df['Start Time'].dt.month.astype('int8')
 
     return df
 
 # Clean Title column values dependent on title order construction by delimieter
 def splitSecondOccurence(str: str) -> str:
-    splitList = [part.strip() for part in str.split(":") if part.strip()]
-    if len(splitList) <= 1:
-        return splitList[0] if splitList else ""
+    return cachedTitleParse("split", str, "", lambda: _splitSecondOccurence(str))
 
-    season_index = _season_label_index(splitList)
-    if season_index is not None:
-        return ": ".join(splitList[:season_index])
 
-    return ": ".join(splitList)
+def _splitSecondOccurence(str: str) -> str:
+    splitList = [part.strip() for part in str.split(":") if part.strip()]
+    return ": ".join(_series_parts(splitList, _season_label_index(splitList)))
 
 # Convert Duration Column Format to an hr columns
 def convertDurationToHrs(df: pd.DataFrame) -> pd.DataFrame:
-    df['Duration'] = df['Duration'].astype(str)
+    seconds = (
+        df['Duration Seconds']
+        if 'Duration Seconds' in df.columns
+        else durationSecondsColumn(df['Duration'])
+    ).astype('int32')
+    df['Duration Seconds'] = seconds
 
-    hr = df['Duration'].str.split(':').str[0].astype(int)
-    min = df['Duration'].str.split(':').str[1].astype(int)
-    sec = df['Duration'].str.split(':').str[2].astype(int)
+    # Summed from hours, minutes and seconds like the duration reads
+    df['Watchtime (hrs)'] = seconds // 3600 + (seconds % 3600 // 60) / 60 + (seconds % 60) / 3600
 
-    df['Watchtime (hrs)'] = hr + min/60 + sec/3600
-        
     return df
 
+
+def compactRecapFrame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store the low-cardinality string columns of a transformed recap frame as
+    categoricals. Categories are the sorted distinct values, so the columns
+    still sort and group in the order of their strings.
+    """
+    for column in CATEGORICAL_RECAP_COLUMNS:
+        if column in df.columns and df[column].dtype == object:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def frameBytesPerRow(df: pd.DataFrame) -> float:
+    return round(df.memory_usage(deep=True).sum() / max(len(df), 1), 1)
+
 # Create new column for more specific Netflix Titles
 def generateShowTitles(df: pd.DataFrame) -> pd.DataFrame:
     df['Title'] = df['Title'].astype(str)
     df['Title'] = df['Title'].str.strip()
-    normalized_titles = df['Title'].str.lower().apply(preprocessTitles)
-    df['New Title'] = normalized_titles.map(K_TITLE_BY_NORMALIZED).fillna(df['Title'])
+    normalized_titles = mapDistinctTitles(
+        df['Title'],
+        lambda title: cachedTitleParse("normalized", title, "", lambda: preprocessTitles(title.lower())),
+    )
+    df['New Title'] = normalized_titles.map(TITLE_CATALOG.title_by_normalized).fillna(df['Title'])
     if 'Is Episode' in df.columns and 'Series Title' in df.columns:
         episode_mask = df['Is Episode'].fillna(False).astype(bool)
         df.loc[episode_mask, 'New Title'] = df.loc[episode_mask, 'Series Title']
@@ -249,12 +662,12 @@ def generateShowTitles(df: pd.DataFrame) -> pd.DataFrame:
 
 # Preprocess Netflix Titles by removing punctuation for better matching
 def preprocessTitles(text: str) -> str:
-    text = text.translate(str.maketrans('', '', string.punctuation))
+    text = text.translate(PUNCTUATION_TABLE)
     return text
 
 # Create new column for Netflix Media Types for content pieces
 def generateMediaType(df: pd.DataFrame) -> pd.DataFrame:
-    df['Type'] = df['New Title'].map(K_TYPE_BY_TITLE).fillna("Unknown")
+    df['Type'] = df['New Title'].map(TITLE_CATALOG.type_by_title).fillna("Unknown")
     if 'Cached Media Type' in df.columns:
         cached_type = df['Cached Media Type'].fillna("").replace({
             "movie": "Movie",
@@ -278,7 +691,7 @@ def generateMediaType(df: pd.DataFrame) -> pd.DataFrame:
 
 # Get Rating Type
 def generateRatings(df: pd.DataFrame) -> pd.DataFrame:
-    df['Rating'] = df['New Title'].map(K_RATING_BY_TITLE).fillna("Unknown")
+    df['Rating'] = df['New Title'].map(TITLE_CATALOG.rating_by_title).fillna("Unknown")
     if 'Metadata Rating' in df.columns:
         cached_rating = df['Metadata Rating'].fillna("")
         df.loc[cached_rating != "", 'Rating'] = cached_rating[cached_rating != ""]
@@ -287,11 +700,41 @@ def generateRatings(df: pd.DataFrame) -> pd.DataFrame:
 
 ### GRAPH CREATION
 
+# Whole-column coercions for emitRecords. Rounding goes through the builtin
+# round so records match the per-row builders they replaced exactly.
+RECORD_COERCIONS = {
+    "raw": lambda values: values.tolist(),
+    "int": lambda values: values.astype("int64").tolist(),
+    "round": lambda values: [round(value, 2) for value in values.astype(float).tolist()],
+    "hrs": lambda values: [
+        0 if value != value else round(value, 2)
+        for value in values.astype(float).tolist()
+    ],
+    "iso": lambda values: [value.isoformat() for value in values.tolist()],
+}
+
+
+def emitRecords(df: pd.DataFrame, fields: dict) -> list:
+    """
+    Build JSON records from whole columns of ``df``, in row order.
+
+    ``fields`` maps each output key to a column name, or to a
+    ``(column, coercion)`` pair naming an entry of ``RECORD_COERCIONS``;
+    ``hrs`` rounds to two decimals and reports missing values as 0.
+    """
+    keys = list(fields)
+    columns = []
+    for spec in fields.values():
+        column, coercion = (spec, "raw") if isinstance(spec, str) else spec
+        columns.append(RECORD_COERCIONS[coercion](df[column]))
+    return [dict(zip(keys, values)) for values in zip(*columns)]
+
+
 # Get Most watched Ratings Categories
 
 def getMostWatchedRatings(df: pd.DataFrame) -> pd.DataFrame:
     filtered_df = df[['Rating', 'Watchtime (hrs)']]
-    sum_watched_ratings = (filtered_df.groupby(by = ["Rating"], as_index=False)
+    sum_watched_ratings = (filtered_df.groupby(by = ["Rating"], as_index=False, observed=True)
                            .sum()
                            .sort_values(by= ['Watchtime (hrs)'], ascending = False))
     
@@ -299,23 +742,14 @@ def getMostWatchedRatings(df: pd.DataFrame) -> pd.DataFrame:
 
 # Get most watched ratings data
 def getMostWatchedRatingsData(df: pd.DataFrame) -> dict:
-    ratings_list = getMostWatchedRatings(df)['Rating'].tolist()
-    watchtime_list = getMostWatchedRatings(df)['Watchtime (hrs)'].tolist()
-
-    data = []
-
-    for i in range(len(ratings_list)):
-        data.append({
-            'rating': ratings_list[i],
-            'hrs': watchtime_list[i]
-        })
-    return data
-    # return {'ratings' : ratings_list,
-    #         'watchtime': watchtime_list}
+    return emitRecords(
+        getMostWatchedRatings(df),
+        {'rating': 'Rating', 'hrs': 'Watchtime (hrs)'},
+    )
 
 def getTitleWatchtime(df: pd.DataFrame) -> pd.DataFrame:
     filtered_title_df = df[['Title', 'Watchtime (hrs)']]
-    sum_title_watchtime_df = (filtered_title_df.groupby(by = ['Title'], as_index=False)
+    sum_title_watchtime_df = (filtered_title_df.groupby(by = ['Title'], as_index=False, observed=True)
                         .sum()
                         .sort_values(by= ['Watchtime (hrs)'], ascending= False)
                         .rename(columns={'Watchtime (hrs)': 'Total Watchtime (hrs)'}))
@@ -323,48 +757,31 @@ def getTitleWatchtime(df: pd.DataFrame) -> pd.DataFrame:
 
 # Get Total Title Watchtime Data
 def getTotalTitleWatchtimeData(df: pd.DataFrame) -> dict:
-    newdf = getTitleWatchtime(df).head(10)
-    titles = newdf['Title'].tolist()
-    watchtime = newdf['Total Watchtime (hrs)'].apply(lambda x: round(x, 2)).tolist()
-
-    data = []
-
-    for i in range(len(titles)):
-        data.append({
-            'title': titles[i],
-            'hrs': watchtime[i]
-        })
-    return data 
-    # return {'titles': titles,
-    #         'watchtime': watchtime}
+    return emitRecords(
+        getTitleWatchtime(df).head(10),
+        {'title': 'Title', 'hrs': ('Total Watchtime (hrs)', 'round')},
+    )
 
 # Get total watchtime per media type
 def getTotalTypeWatchtime(df: pd.DataFrame) -> pd.DataFrame:
     filtered_type_df = df[['Type', 'Watchtime (hrs)']]
 
-    sum_type_watchtime_df = (filtered_type_df.groupby(by=['Type'], as_index=False)
+    sum_type_watchtime_df = (filtered_type_df.groupby(by=['Type'], as_index=False, observed=True)
                             .sum()
                             .sort_values(by= ['Watchtime (hrs)'], ascending = False)
                             .rename(columns = {'Watchtime (hrs)': 'Total Watchtime (hrs)'}))
     return sum_type_watchtime_df
 
 def getTotalTypeWatchtimeData(df: pd.DataFrame) -> dict:
-    types = getTotalTypeWatchtime(df)['Type'].tolist()
-    total_watchtime = getTotalTypeWatchtime(df)['Total Watchtime (hrs)'].sum()
-    watchtime = getTotalTypeWatchtime(df)['Total Watchtime (hrs)'].apply(lambda x: round(x/total_watchtime *100, 2)).tolist()
-
-    data = []
-    for i in range(len(types)):
-        data.append({
-            'type': types[i],
-            'hrs': watchtime[i]
-        })
-    return data
+    type_watchtime = getTotalTypeWatchtime(df)
+    total_watchtime = type_watchtime['Total Watchtime (hrs)'].sum()
+    type_watchtime['Share'] = type_watchtime['Total Watchtime (hrs)'] / total_watchtime * 100
+    return emitRecords(type_watchtime, {'type': 'Type', 'hrs': ('Share', 'round')})
 
 # Get Netflix watchtime per month
 def getMonthlyWatchtime(df: pd.DataFrame) -> pd.DataFrame:
     filtered_df = df[['Month', 'Watchtime (hrs)']]
-    monthly_watchtime = filtered_df.groupby(by=['Month'], as_index = False).sum()
+    monthly_watchtime = filtered_df.groupby(by=['Month'], as_index = False, observed=True).sum()
 
     return monthly_watchtime
 
@@ -373,14 +790,8 @@ def getMonthlyWatchtimeData(df: pd.DataFrame) -> dict:
     months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
     monthly_df = getMonthlyWatchtime(df)  # has columns 'Month', 'Watchtime (hrs)'
 
-    # Create a dict mapping month number to watchtime
-    month_to_watchtime = {row['Month']: row['Watchtime (hrs)'] for _, row in monthly_df.iterrows()}
-
-    data = []
-    for i, month_name in enumerate(months, start=1):  # i from 1 to 12
-        hrs = month_to_watchtime.get(i, 0)  # default 0 if no data for that month
-        data.append({
-            'month': month_name,
-            'hrs': hrs
-        })
-    return data
+    # Every month appears, with 0 for months without viewing
+    monthly_df = monthly_df.set_index('Month').reindex(range(1, 13))
+    monthly_df['month'] = months
+    monthly_df['hrs'] = monthly_df['Watchtime (hrs)'].astype(object).where(monthly_df['Watchtime (hrs)'].notna(), 0)
+    return emitRecords(monthly_df, {'month': 'month', 'hrs': 'hrs'})